@@ -1,5 +1,9 @@
+from typing import Any
+
 from sqladmin import ModelView
+from starlette.requests import Request
 
+from app.core.activity_categories import activity_category_catalog
 from app.models.chat import ChatConversation, ChatMessage
 from app.models.invoice import LessonInvoice
 from app.models.payment import Transaction
@@ -14,6 +18,8 @@ from app.models.user import (
 
 class UserAdmin(ModelView, model=User):
     column_list = "__all__"
+    # The balance is a snapshot of the credit ledger and only changes with it
+    form_excluded_columns = [User.balance]
     can_create = True
     can_edit = True
     can_delete = True
@@ -35,6 +41,14 @@ class ActivityCategoryAdmin(ModelView, model=ActivityCategory):
     can_delete = True
     can_view_details = True
 
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        await activity_category_catalog.invalidate()
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await activity_category_catalog.invalidate()
+
 
 class ActivityCategoryUserAdmin(ModelView, model=ActivityCategoryUser):
     column_list = "__all__"
@@ -2,22 +2,30 @@ from fastapi import Depends
 
 from app.api.dependencies.repository import get_repository
 from app.repository.activity_category import ActivityCategoryRepository
+from app.repository.billing import BillingRepository
 from app.repository.invoice import InvoiceRepository
+from app.repository.ledger import LedgerRepository
+from app.repository.outbox import OutboxRepository
 from app.repository.post import PostRepository
+from app.repository.stats import StatsRepository
 from app.repository.user import UserRepository
 from app.repository.user_verification import UserVerificationRepository
 from app.services.activity_category import ActivityCategoryService
 from app.services.billing import BillingService
 from app.services.invoice import InvoiceService
+from app.services.ledger import LedgerService
 from app.services.post import PostService
+from app.services.stats import StatsService
+from app.services.upload import UploadService
 from app.services.user import UserService
 from app.services.user_verification import UserVerificationService
 
 
 def get_user_service(
     user_repository: UserRepository = Depends(get_repository(UserRepository)),
+    outbox_repository: OutboxRepository = Depends(get_repository(OutboxRepository)),
 ) -> UserService:
-    service = UserService(user_repository)
+    service = UserService(user_repository, outbox_repository)
     return service
 
 
@@ -32,8 +40,10 @@ def get_activity_category_service(
 
 def get_billing_service(
     user_repository: UserRepository = Depends(get_repository(UserRepository)),
+    billing_repository: BillingRepository = Depends(get_repository(BillingRepository)),
+    ledger_repository: LedgerRepository = Depends(get_repository(LedgerRepository)),
 ) -> BillingService:
-    service = BillingService(user_repository)
+    service = BillingService(user_repository, billing_repository, ledger_repository)
     return service
 
 
@@ -42,21 +52,48 @@ def get_verification_service(
         get_repository(UserVerificationRepository)
     ),
     user_repository: UserRepository = Depends(get_repository(UserRepository)),
+    outbox_repository: OutboxRepository = Depends(get_repository(OutboxRepository)),
 ) -> UserVerificationService:
-    service = UserVerificationService(verification_repository, user_repository)
+    service = UserVerificationService(
+        verification_repository, user_repository, outbox_repository
+    )
+    return service
+
+
+def get_ledger_service(
+    ledger_repository: LedgerRepository = Depends(get_repository(LedgerRepository)),
+) -> LedgerService:
+    service = LedgerService(ledger_repository)
     return service
 
 
 def get_post_service(
     post_repository: PostRepository = Depends(get_repository(PostRepository)),
+    outbox_repository: OutboxRepository = Depends(get_repository(OutboxRepository)),
 ) -> PostService:
-    service = PostService(post_repository)
+    service = PostService(post_repository, outbox_repository)
     return service
 
 
 def get_invoice_service(
     invoice_repository: InvoiceRepository = Depends(get_repository(InvoiceRepository)),
     user_repository: UserRepository = Depends(get_repository(UserRepository)),
+    ledger_repository: LedgerRepository = Depends(get_repository(LedgerRepository)),
+    stats_repository: StatsRepository = Depends(get_repository(StatsRepository)),
 ) -> InvoiceService:
-    service = InvoiceService(invoice_repository, user_repository)
+    service = InvoiceService(
+        invoice_repository, user_repository, ledger_repository, stats_repository
+    )
+    return service
+
+
+def get_stats_service(
+    stats_repository: StatsRepository = Depends(get_repository(StatsRepository)),
+) -> StatsService:
+    service = StatsService(stats_repository)
+    return service
+
+
+def get_upload_service() -> UploadService:
+    service = UploadService()
     return service
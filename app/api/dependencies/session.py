@@ -2,9 +2,11 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.logs.logger import logger
 from app.core.database import async_session_maker
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+        logger.debug(f"Request committed {session.info.get('commits', 0)} times")
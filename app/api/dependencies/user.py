@@ -1,4 +1,5 @@
 from typing import Any
+from uuid import UUID
 
 from fastapi import Depends
 
@@ -19,11 +20,11 @@ async def get_current_user(
 async def get_current_user_id(
     auth_data: dict[str, Any] = Depends(auth_wrapper),
     user_repository: UserRepository = Depends(get_repository(UserRepository)),
-) -> int:
-    user_id: int = (
+) -> UUID:
+    user_id: UUID = (
         await user_repository.get_user_id(auth_data.get("email"))
         if not auth_data.get("id")
-        else auth_data.get("id")
+        else UUID(auth_data.get("id"))
     )
 
     return user_id
@@ -4,6 +4,7 @@ from app.api.routes.activity_category import router as activity_category_router
 from app.api.routes.billing import router as billing_router
 from app.api.routes.invoice import router as invoice_router
 from app.api.routes.post import router as post_router
+from app.api.routes.upload import router as upload_router
 from app.api.routes.user import router as user_router
 from app.api.routes.user_verification import router as user_verification_router
 
@@ -15,3 +16,4 @@ router.include_router(billing_router)
 router.include_router(user_verification_router)
 router.include_router(post_router)
 router.include_router(invoice_router)
+router.include_router(upload_router)
@@ -1,14 +1,40 @@
+from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from app.api.dependencies.services import get_invoice_service
-from app.schemas.invoice import InvoiceCreate, InvoiceResponse, InvoiceUpdate
+from app.schemas.invoice import (
+    InvoiceBatchCreate,
+    InvoiceCreate,
+    InvoiceFilter,
+    InvoicePaginatedResponse,
+    InvoiceResponse,
+    InvoiceStatus,
+    InvoiceUpdate,
+)
 from app.services.invoice import InvoiceService
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
 
+def get_invoice_filter(
+    invoice_status: Optional[InvoiceStatus] = Query(
+        None, alias="status", description="Invoice status"
+    ),
+    due_after: Optional[datetime] = Query(
+        None, description="Invoices due at or after this date"
+    ),
+    due_before: Optional[datetime] = Query(
+        None, description="Invoices due before this date"
+    ),
+) -> InvoiceFilter:
+    return InvoiceFilter(
+        status=invoice_status, due_after=due_after, due_before=due_before
+    )
+
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_invoice(
     invoice_data: InvoiceCreate,
@@ -17,12 +43,42 @@ async def create_invoice(
     await invoice_service.create_invoice(invoice_data)
 
 
-@router.get("/mentor/{mentor_id}", response_model=list[InvoiceResponse])
+@router.post(
+    "/batch",
+    response_model=list[InvoiceResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_invoices_batch(
+    batch_data: InvoiceBatchCreate,
+    invoice_service: InvoiceService = Depends(get_invoice_service),
+) -> list[InvoiceResponse]:
+    return await invoice_service.create_invoices_batch(batch_data)
+
+
+@router.get("/mentor/{mentor_id}", response_model=InvoicePaginatedResponse)
 async def get_mentor_invoices(
     mentor_id: UUID,
+    filters: InvoiceFilter = Depends(get_invoice_filter),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
     invoice_service: InvoiceService = Depends(get_invoice_service),
-) -> list[InvoiceResponse]:
-    return await invoice_service.get_invoices_by_mentor_id(mentor_id)
+) -> InvoicePaginatedResponse:
+    return await invoice_service.get_invoices_by_mentor_id(
+        mentor_id, filters, limit, cursor
+    )
+
+
+@router.get("/mentee/{mentee_id}", response_model=InvoicePaginatedResponse)
+async def get_mentee_invoices(
+    mentee_id: UUID,
+    filters: InvoiceFilter = Depends(get_invoice_filter),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
+    invoice_service: InvoiceService = Depends(get_invoice_service),
+) -> InvoicePaginatedResponse:
+    return await invoice_service.get_invoices_by_mentee_id(
+        mentee_id, filters, limit, cursor
+    )
 
 
 @router.patch("/{invoice_id}", response_model=InvoiceResponse)
@@ -0,0 +1,57 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request
+
+from app.api.dependencies.services import get_upload_service
+from app.api.dependencies.user import get_current_user
+from app.models.user import User
+from app.schemas.upload import (
+    PresignedUploadInput,
+    PresignedUploadResponse,
+    UploadConfirmInput,
+    UploadConfirmResponse,
+    UploadField,
+    UploadProgressResponse,
+)
+from app.services.upload import UploadService
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post("/presign")
+async def create_presigned_upload(
+    upload_data: PresignedUploadInput,
+    current_user: User = Depends(get_current_user),
+    upload_service: UploadService = Depends(get_upload_service),
+) -> PresignedUploadResponse:
+    return await upload_service.create_presigned_upload(upload_data, current_user)
+
+
+@router.post("/confirm")
+async def confirm_upload(
+    confirm_data: UploadConfirmInput,
+    current_user: User = Depends(get_current_user),
+    upload_service: UploadService = Depends(get_upload_service),
+) -> UploadConfirmResponse:
+    return await upload_service.confirm_upload(confirm_data, current_user)
+
+
+@router.put("/stream/{field}")
+async def stream_upload(
+    field: UploadField,
+    request: Request,
+    upload_id: Optional[UUID] = None,
+    current_user: User = Depends(get_current_user),
+    upload_service: UploadService = Depends(get_upload_service),
+) -> UploadConfirmResponse:
+    return await upload_service.stream_upload(field, upload_id, request, current_user)
+
+
+@router.get("/progress/{upload_id}")
+async def get_upload_progress(
+    upload_id: UUID,
+    current_user: User = Depends(get_current_user),
+    upload_service: UploadService = Depends(get_upload_service),
+) -> UploadProgressResponse:
+    return await upload_service.get_upload_progress(upload_id, current_user)
@@ -1,11 +1,18 @@
-from typing import Annotated
+from datetime import date
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, Form
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Form, Query
 
-from app.api.dependencies.services import get_user_service
+from app.api.dependencies.services import (
+    get_ledger_service,
+    get_stats_service,
+    get_user_service,
+)
 from app.api.dependencies.user import get_current_user
 from app.models.user import User
+from app.schemas.ledger import LedgerPaginatedResponse
+from app.schemas.stats import EarningsStatsResponse, StatsPeriods
 from app.schemas.user import (
     ForgotPasswordResetInput,
     LoginResponse,
@@ -16,6 +23,8 @@ from app.schemas.user import (
     UserSignUpInput,
     UserUpdateSchema,
 )
+from app.services.ledger import LedgerService
+from app.services.stats import StatsService
 from app.services.user import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -32,9 +41,10 @@ async def credentials_login(
 @router.post("/auth/login/google")
 async def google_login(
     token: TokenData,
+    background_tasks: BackgroundTasks,
     user_service: UserService = Depends(get_user_service),
 ) -> LoginResponse:
-    return await user_service.google_login(token)
+    return await user_service.google_login(token, background_tasks)
 
 
 @router.post("/auth/sign-up")
@@ -47,11 +57,10 @@ async def register_user(
 
 @router.post("/auth/forgot-password/request")
 async def forgot_password(
-    background_tasks: BackgroundTasks,
     email: str = Body(..., embed=True),
     user_service: UserService = Depends(get_user_service),
 ) -> None:
-    return await user_service.forgot_password(email, background_tasks)
+    return await user_service.forgot_password(email)
 
 
 @router.post("/auth/forgot-password/verify-token")
@@ -77,6 +86,29 @@ async def get_user_profile(
     return UserFullSchema.from_model(current_user)
 
 
+@router.get("/me/ledger")
+async def get_my_ledger(
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    current_user: User = Depends(get_current_user),
+    ledger_service: LedgerService = Depends(get_ledger_service),
+) -> LedgerPaginatedResponse:
+    return await ledger_service.get_user_ledger(current_user.id, page, per_page)
+
+
+@router.get("/me/stats/earnings")
+async def get_my_earnings_stats(
+    period: StatsPeriods = Query(StatsPeriods.DAY, description="Bucket size"),
+    date_from: Optional[date] = Query(None, description="First day, inclusive"),
+    date_to: Optional[date] = Query(None, description="Last day, inclusive"),
+    current_user: User = Depends(get_current_user),
+    stats_service: StatsService = Depends(get_stats_service),
+) -> EarningsStatsResponse:
+    return await stats_service.get_user_earnings(
+        current_user.id, period, date_from, date_to
+    )
+
+
 @router.get("/{user_id}")
 async def get_user(
     user_id: UUID,
@@ -89,10 +121,13 @@ async def get_user(
 async def update_user(
     user_id: UUID,
     update_data: Annotated[UserUpdateSchema, Form()],
+    background_tasks: BackgroundTasks,
     user_service: UserService = Depends(get_user_service),
     current_user: User = Depends(get_current_user),
 ) -> UserFullSchema:
-    return await user_service.update_user(user_id, update_data, current_user)
+    return await user_service.update_user(
+        user_id, update_data, current_user, background_tasks
+    )
 
 
 @router.patch("/change-password")
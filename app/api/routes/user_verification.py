@@ -1,14 +1,18 @@
 from typing import Annotated, Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, Form
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Form, Query
 
 from app.api.dependencies.auth import auth_wrapper
 from app.api.dependencies.services import get_verification_service
-from app.api.dependencies.user import get_current_user
-from app.models.user import User
+from app.api.dependencies.user import get_current_user, get_current_user_id
+from app.models.user import User, UserVerificationStatus
 from app.schemas.user_verification import (
+    UserVerificationBulkApprove,
+    UserVerificationBulkDecline,
     UserVerificationCreateSchema,
+    UserVerificationListItemSchema,
+    UserVerificationPaginatedResponse,
     UserVerificationSchema,
 )
 from app.services.user_verification import UserVerificationService
@@ -19,11 +23,55 @@ router = APIRouter(prefix="/user-verification", tags=["user-verification"])
 @router.post("/create")
 async def create_verification(
     verification_data: Annotated[UserVerificationCreateSchema, Form()],
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     verification_service: UserVerificationService = Depends(get_verification_service),
 ) -> None:
     return await verification_service.create_verification(
-        verification_data, current_user
+        verification_data, current_user, background_tasks
+    )
+
+
+@router.get("/queue")
+async def get_verification_queue(
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
+    verification_service: UserVerificationService = Depends(get_verification_service),
+    _: dict[str, Any] = Depends(auth_wrapper),
+) -> UserVerificationPaginatedResponse:
+    return await verification_service.get_all_verifications(
+        UserVerificationStatus.PENDING.value, limit, cursor
+    )
+
+
+@router.post("/queue/claim")
+async def claim_verifications(
+    limit: int = Query(10, ge=1, le=50, description="Verifications to claim"),
+    admin_id: UUID = Depends(get_current_user_id),
+    verification_service: UserVerificationService = Depends(get_verification_service),
+) -> list[UserVerificationListItemSchema]:
+    return await verification_service.claim_verifications(admin_id, limit)
+
+
+@router.post("/bulk/approve")
+async def bulk_approve_verifications(
+    bulk_data: UserVerificationBulkApprove,
+    admin_id: UUID = Depends(get_current_user_id),
+    verification_service: UserVerificationService = Depends(get_verification_service),
+) -> None:
+    return await verification_service.bulk_approve_verifications(
+        bulk_data.verification_ids, admin_id
+    )
+
+
+@router.post("/bulk/decline")
+async def bulk_decline_verifications(
+    bulk_data: UserVerificationBulkDecline,
+    admin_id: UUID = Depends(get_current_user_id),
+    verification_service: UserVerificationService = Depends(get_verification_service),
+) -> None:
+    return await verification_service.bulk_decline_verifications(
+        bulk_data.verification_ids, admin_id, bulk_data.reason
     )
 
 
@@ -39,32 +87,30 @@ async def get_verification(
 @router.get("/")
 async def get_all_verifications(
     status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
     verification_service: UserVerificationService = Depends(get_verification_service),
     _: dict[str, Any] = Depends(auth_wrapper),
-) -> list[UserVerificationSchema]:
-    return await verification_service.get_all_verifications(status)
+) -> UserVerificationPaginatedResponse:
+    return await verification_service.get_all_verifications(status, limit, cursor)
 
 
 @router.post("/{verification_id}/approve")
 async def approve_verification(
     verification_id: UUID,
+    admin_id: UUID = Depends(get_current_user_id),
     verification_service: UserVerificationService = Depends(get_verification_service),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
-    _: dict[str, Any] = Depends(auth_wrapper),
 ) -> None:
-    return await verification_service.approve_verification(
-        verification_id, background_tasks
-    )
+    return await verification_service.approve_verification(verification_id, admin_id)
 
 
 @router.post("/{verification_id}/decline")
 async def decline_verification(
     verification_id: UUID,
     reason: str = Body(..., embed=True),
+    admin_id: UUID = Depends(get_current_user_id),
     verification_service: UserVerificationService = Depends(get_verification_service),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
-    _: dict[str, Any] = Depends(auth_wrapper),
 ) -> None:
     return await verification_service.decline_verification(
-        verification_id, background_tasks, reason
+        verification_id, admin_id, reason
     )
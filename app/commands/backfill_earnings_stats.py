@@ -0,0 +1,41 @@
+"""
+Rebuild the daily earnings rollups from the invoice history.
+
+Usage:
+    python -m app.commands.backfill_earnings_stats                      # all days
+    python -m app.commands.backfill_earnings_stats --since 2026-01-01   # from a day on
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from typing import Optional
+
+from app.config.logs.logger import logger
+from app.core.tasks import task_session
+from app.repository.stats import StatsRepository
+
+
+async def backfill_earnings_stats(since: Optional[date]) -> int:
+    async with task_session() as session:
+        repository = StatsRepository(session)
+        written_rows = await repository.rebuild_stats(since)
+        await session.commit()
+    return written_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="First day to rebuild (YYYY-MM-DD), all days if omitted",
+    )
+    args = parser.parse_args()
+
+    written_rows = asyncio.run(backfill_earnings_stats(args.since))
+    logger.info(f"Rebuilt {written_rows} daily stats rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Put dead-lettered Stripe webhook events back into the processing queue.
+
+Usage:
+    python -m app.commands.replay_stripe_events                 # all failed events
+    python -m app.commands.replay_stripe_events evt_1 evt_2     # selected events
+"""
+
+import argparse
+import asyncio
+
+from app.config.logs.logger import logger
+from app.core.tasks import process_stripe_events, task_session
+from app.repository.billing import BillingRepository
+
+
+async def replay_stripe_events(event_ids: list[str]) -> list[str]:
+    async with task_session() as session:
+        repository = BillingRepository(session)
+        replayed_ids = await repository.replay_webhook_events(event_ids or None)
+        await session.commit()
+    return replayed_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "event_ids", nargs="*", help="Stripe event ids, all failed events if omitted"
+    )
+    args = parser.parse_args()
+
+    replayed_ids = asyncio.run(replay_stripe_events(args.event_ids))
+    logger.info(f"Replayed {len(replayed_ids)} Stripe events: {replayed_ids}")
+
+    if replayed_ids:
+        process_stripe_events.delay()
+
+
+if __name__ == "__main__":
+    main()
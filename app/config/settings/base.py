@@ -1,4 +1,5 @@
 import pathlib
+from urllib.parse import urlsplit, urlunsplit
 
 import decouple
 from pydantic_settings import BaseSettings
@@ -6,6 +7,13 @@ from pydantic_settings import BaseSettings
 ROOT_DIR = pathlib.Path(__file__).parent.parent.parent.parent.resolve()
 
 
+def get_redis_database_url(url: str, database: int) -> str:
+    """
+    Point a Redis URL at another logical database, keeping host and credentials.
+    """
+    return urlunsplit(urlsplit(url)._replace(path=f"/{database}"))
+
+
 class BackendBaseSettings(BaseSettings):
     # Web
     WEB_URL: str = decouple.config("WEB_URL", default="http://localhost:3000")
@@ -29,6 +37,36 @@ class BackendBaseSettings(BaseSettings):
     AWS_REGION: str = decouple.config("AWS_REGION")
     AWS_BUCKET_NAME: str = decouple.config("AWS_BUCKET_NAME")
     AWS_S3_ENDPOINT: str = decouple.config("AWS_S3_ENDPOINT")
+    AWS_S3_MAX_POOL_CONNECTIONS: int = decouple.config(
+        "AWS_S3_MAX_POOL_CONNECTIONS", cast=int, default=10
+    )
+    AWS_S3_NATIVE_ASYNC: bool = decouple.config(
+        "AWS_S3_NATIVE_ASYNC", cast=bool, default=False
+    )
+    AWS_S3_UPLOAD_CONCURRENCY: int = decouple.config(
+        "AWS_S3_UPLOAD_CONCURRENCY", cast=int, default=4
+    )
+    AWS_S3_PRESIGNED_UPLOAD_EXPIRATION: int = decouple.config(
+        "AWS_S3_PRESIGNED_UPLOAD_EXPIRATION", cast=int, default=900
+    )
+    AWS_S3_PRIVATE_MEDIA: bool = decouple.config(
+        "AWS_S3_PRIVATE_MEDIA", cast=bool, default=False
+    )
+    AWS_S3_MEDIA_URL_EXPIRATION: int = decouple.config(
+        "AWS_S3_MEDIA_URL_EXPIRATION", cast=int, default=3600
+    )
+    AWS_S3_MEDIA_URL_REFRESH_MARGIN: int = decouple.config(
+        "AWS_S3_MEDIA_URL_REFRESH_MARGIN", cast=int, default=300
+    )
+    AWS_S3_MEDIA_URL_CACHE_SIZE: int = decouple.config(
+        "AWS_S3_MEDIA_URL_CACHE_SIZE", cast=int, default=10000
+    )
+    AWS_S3_MULTIPART_PART_SIZE: int = decouple.config(
+        "AWS_S3_MULTIPART_PART_SIZE", cast=int, default=8 * 1024 * 1024
+    )
+    AWS_S3_MULTIPART_MAX_IN_FLIGHT: int = decouple.config(
+        "AWS_S3_MULTIPART_MAX_IN_FLIGHT", cast=int, default=2
+    )
 
     # Stripe
     STRIPE_SECRET_KEY: str = decouple.config("STRIPE_SECRET_KEY")
@@ -36,12 +74,90 @@ class BackendBaseSettings(BaseSettings):
     STRIPE_25_CREDITS_PRICE_ID: str = decouple.config("STRIPE_25_CREDITS_PRICE_ID")
     STRIPE_200_CREDITS_PRICE_ID: str = decouple.config("STRIPE_200_CREDITS_PRICE_ID")
     STRIPE_500_CREDITS_PRICE_ID: str = decouple.config("STRIPE_500_CREDITS_PRICE_ID")
+    STRIPE_TIMEOUT: float = decouple.config("STRIPE_TIMEOUT", cast=float, default=10.0)
+    STRIPE_MAX_NETWORK_RETRIES: int = decouple.config(
+        "STRIPE_MAX_NETWORK_RETRIES", cast=int, default=2
+    )
+    STRIPE_MAX_CONCURRENCY: int = decouple.config(
+        "STRIPE_MAX_CONCURRENCY", cast=int, default=10
+    )
+    STRIPE_CHECKOUT_SESSION_TTL: int = decouple.config(
+        "STRIPE_CHECKOUT_SESSION_TTL", cast=int, default=3600
+    )
+    STRIPE_WEBHOOK_POLL_INTERVAL: float = decouple.config(
+        "STRIPE_WEBHOOK_POLL_INTERVAL", cast=float, default=30.0
+    )
+    STRIPE_WEBHOOK_BATCH_SIZE: int = decouple.config(
+        "STRIPE_WEBHOOK_BATCH_SIZE", cast=int, default=50
+    )
+    STRIPE_WEBHOOK_MAX_ATTEMPTS: int = decouple.config(
+        "STRIPE_WEBHOOK_MAX_ATTEMPTS", cast=int, default=8
+    )
 
     # SMTP
     SMTP_HOST: str = decouple.config("SMTP_HOST")
     SMTP_PORT: int = decouple.config("SMTP_PORT", cast=int)
     SMTP_USER: str = decouple.config("SMTP_USER")
     SMTP_PASSWORD: str = decouple.config("SMTP_PASSWORD")
+    SMTP_POOL_SIZE: int = decouple.config("SMTP_POOL_SIZE", cast=int, default=2)
+    SMTP_MAX_IDLE: int = decouple.config("SMTP_MAX_IDLE", cast=int, default=60)
+    SMTP_TIMEOUT: int = decouple.config("SMTP_TIMEOUT", cast=int, default=30)
+    SMTP_RATE_LIMIT: str = decouple.config("SMTP_RATE_LIMIT", default="30/m")
+    SMTP_MAX_RETRIES: int = decouple.config("SMTP_MAX_RETRIES", cast=int, default=5)
+    EMAIL_BULK_BATCH_SIZE: int = decouple.config(
+        "EMAIL_BULK_BATCH_SIZE", cast=int, default=100
+    )
+
+    # Celery
+    CELERY_BROKER_URL: str = decouple.config(
+        "CELERY_BROKER_URL", default=get_redis_database_url(REDIS_URL, 1)
+    )
+    CELERY_TASK_ALWAYS_EAGER: bool = decouple.config(
+        "CELERY_TASK_ALWAYS_EAGER", cast=bool, default=False
+    )
+
+    # Ledger
+    LEDGER_RECONCILE_INTERVAL: float = decouple.config(
+        "LEDGER_RECONCILE_INTERVAL", cast=float, default=24 * 3600
+    )
+    LEDGER_RECONCILE_CHUNK_SIZE: int = decouple.config(
+        "LEDGER_RECONCILE_CHUNK_SIZE", cast=int, default=1000
+    )
+
+    # Invoices
+    INVOICE_SWEEP_INTERVAL: float = decouple.config(
+        "INVOICE_SWEEP_INTERVAL", cast=float, default=300.0
+    )
+    INVOICE_SWEEP_CHUNK_SIZE: int = decouple.config(
+        "INVOICE_SWEEP_CHUNK_SIZE", cast=int, default=100
+    )
+    # Seconds past the due date before a pending invoice is cancelled
+    INVOICE_OVERDUE_GRACE: int = decouple.config(
+        "INVOICE_OVERDUE_GRACE", cast=int, default=24 * 3600
+    )
+
+    # Activity categories
+    ACTIVITY_CATEGORY_CATALOG_CHECK_INTERVAL: float = decouple.config(
+        "ACTIVITY_CATEGORY_CATALOG_CHECK_INTERVAL", cast=float, default=60.0
+    )
+
+    # Verifications
+    # Seconds an admin keeps the verifications claimed from the review queue
+    VERIFICATION_CLAIM_TTL: int = decouple.config(
+        "VERIFICATION_CLAIM_TTL", cast=int, default=15 * 60
+    )
+
+    # Outbox
+    OUTBOX_DISPATCH_INTERVAL: float = decouple.config(
+        "OUTBOX_DISPATCH_INTERVAL", cast=float, default=5.0
+    )
+    OUTBOX_BATCH_SIZE: int = decouple.config("OUTBOX_BATCH_SIZE", cast=int, default=100)
+    OUTBOX_MAX_ATTEMPTS: int = decouple.config(
+        "OUTBOX_MAX_ATTEMPTS", cast=int, default=10
+    )
+    OUTBOX_DEDUP_TTL: int = decouple.config(
+        "OUTBOX_DEDUP_TTL", cast=int, default=7 * 24 * 3600
+    )
 
     # CORS
     ALLOWED_ORIGINS: list[str] = ["*"]
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Iterable, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+from app.core.database import async_session_maker, redis
+from app.repository.activity_category import ActivityCategoryRepository
+
+CATALOG_VERSION_KEY = "activity_categories:version"
+CATALOG_CHANNEL = "activity_categories:invalidated"
+
+
+class ActivityCategoryCatalog:
+    """
+    In-process copy of the activity categories, which change only when an
+    admin edits them.
+
+    The catalog is loaded at startup together with the version stored in
+    Redis. An edit bumps that version and publishes it, and every process
+    reloads when it receives a newer version. The version is also compared
+    every ACTIVITY_CATEGORY_CATALOG_CHECK_INTERVAL seconds, because pub/sub
+    messages are lost while a subscriber is disconnected.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self.version: Optional[int] = None
+        self._titles: dict[UUID, str] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _get_published_version(self) -> int:
+        return int(await redis.get(CATALOG_VERSION_KEY) or 0)
+
+    async def load(self) -> None:
+        # The version is read first, so an edit committed while loading leaves
+        # the catalog behind the published version and is picked up later
+        version = await self._get_published_version()
+        async with async_session_maker() as session:
+            categories = await ActivityCategoryRepository(session).get_all_categories()
+
+        self._titles = {
+            category.id: category.title
+            for category in sorted(categories, key=lambda category: category.title)
+        }
+        self.version = version
+        logger.info(
+            f"Loaded {len(self._titles)} activity categories, version {version}"
+        )
+
+    async def start(self) -> None:
+        if self._listener is not None:
+            return
+
+        await self.load()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CATALOG_CHANNEL)
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True,
+                            timeout=self.check_interval,
+                        )
+                        version = (
+                            int(message["data"])
+                            if message
+                            else await self._get_published_version()
+                        )
+                        if version != self.version:
+                            await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Activity category catalog listener failed: {e}")
+                await asyncio.sleep(self.check_interval)
+
+    async def invalidate(self) -> None:
+        """
+        Make every process reload the catalog after categories were edited.
+        """
+        try:
+            version = await redis.incr(CATALOG_VERSION_KEY)
+            await redis.publish(CATALOG_CHANNEL, version)
+        except RedisError as e:
+            # Processes still catch up on their next periodic version check
+            logger.error(f"Failed to publish activity category changes: {e}")
+            return
+
+        logger.info(f"Published activity category catalog version {version}")
+        await self.load()
+
+    def get_title(self, category_id: UUID) -> Optional[str]:
+        return self._titles.get(category_id)
+
+    def get_all(self) -> list[tuple[UUID, str]]:
+        return list(self._titles.items())
+
+    def validate_ids(self, category_ids: Iterable[UUID | str]) -> list[UUID]:
+        """
+        Check that all ``category_ids`` exist.
+
+        Returns:
+            list[UUID]: The ids as UUIDs, without duplicates
+        """
+        try:
+            ids = list(
+                dict.fromkeys(UUID(str(category_id)) for category_id in category_ids)
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid activity category id",
+            )
+
+        unknown_ids = [str(id) for id in ids if id not in self._titles]
+        if unknown_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown activity categories: {', '.join(unknown_ids)}",
+            )
+        return ids
+
+
+activity_category_catalog = ActivityCategoryCatalog(
+    check_interval=settings.ACTIVITY_CATEGORY_CATALOG_CHECK_INTERVAL
+)
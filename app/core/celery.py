@@ -0,0 +1,128 @@
+import time
+
+from celery import Celery, Task
+from celery.signals import worker_process_shutdown
+from celery.utils.time import rate
+from redis import Redis
+
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+
+worker_redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+class DeduplicatedTask(Task):
+    """
+    Task that runs at most once per task id.
+
+    The outbox dispatcher delivers events at least once and uses the event id
+    as task id, so a redelivered event is recognised here and skipped. Retries
+    of a failed run keep working because the id is only marked as done after
+    the task succeeded.
+    """
+
+    def __call__(self, *args, **kwargs):
+        if self.request.is_eager or not self.request.id:
+            return super().__call__(*args, **kwargs)
+
+        done_key = f"task_done:{self.request.id}"
+        if worker_redis.exists(done_key):
+            logger.info(f'Skipping duplicate delivery of task "{self.request.id}"')
+            return None
+
+        result = super().__call__(*args, **kwargs)
+        worker_redis.set(done_key, 1, ex=settings.OUTBOX_DEDUP_TTL)
+        return result
+
+
+def record_task_metrics(task_name: str, **values: int) -> None:
+    """
+    Publish the latest gauges of a periodic task to the ``task_metrics:<name>``
+    Redis hash, where dashboards and alerts can read them.
+    """
+    worker_redis.hset(
+        f"task_metrics:{task_name}",
+        mapping={**values, "updated_at": int(time.time())},
+    )
+
+
+class SharedRateLimit:
+    """
+    Token bucket in Redis that limits an action across every worker process.
+
+    Each call takes a token even when the bucket is empty and sleeps until that
+    token is due, so concurrent callers are spaced out in arrival order and all
+    workers together stay under ``limit``, given in Celery's ``"30/m"`` format.
+    """
+
+    _TAKE_TOKEN = """
+    local rate = tonumber(ARGV[1])
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(state[1]) or 1
+    local updated_at = tonumber(state[2]) or now
+    tokens = math.min(1, tokens + math.max(0, now - updated_at) * rate) - 1
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil((1 - tokens) / rate) + 1)
+    return tostring(math.max(0, -tokens / rate))
+    """
+
+    def __init__(self, redis: Redis, key: str, limit: str):
+        self.key = key
+        self.rate = rate(limit)
+        self._take_token = redis.register_script(self._TAKE_TOKEN)
+
+    def acquire(self) -> None:
+        if not self.rate:
+            return
+
+        wait = float(self._take_token(keys=[self.key], args=[self.rate]))
+        if wait > 0:
+            time.sleep(wait)
+
+
+celery_app = Celery(
+    "mentorship_app",
+    broker=settings.CELERY_BROKER_URL,
+    include=["app.core.tasks"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    # Acknowledge after the task finished so a crashed worker does not lose it
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    broker_connection_retry_on_startup=True,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+    task_routes={"app.core.tasks.send_*": {"queue": "email"}},
+    beat_schedule={
+        "dispatch-outbox": {
+            "task": "app.core.tasks.dispatch_outbox",
+            "schedule": settings.OUTBOX_DISPATCH_INTERVAL,
+        },
+        "reconcile-ledger": {
+            "task": "app.core.tasks.reconcile_ledger",
+            "schedule": settings.LEDGER_RECONCILE_INTERVAL,
+        },
+        "process-stripe-events": {
+            "task": "app.core.tasks.process_stripe_events",
+            "schedule": settings.STRIPE_WEBHOOK_POLL_INTERVAL,
+        },
+        "sweep-overdue-invoices": {
+            "task": "app.core.tasks.sweep_overdue_invoices",
+            "schedule": settings.INVOICE_SWEEP_INTERVAL,
+        },
+    },
+)
+
+
+@worker_process_shutdown.connect
+def close_smtp_connections(**kwargs) -> None:
+    from app.core.mail import smtp_pool
+
+    smtp_pool.close()
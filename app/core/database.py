@@ -1,6 +1,7 @@
 import redis.asyncio as rd
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from app.config.settings.base import settings
 
@@ -15,3 +16,11 @@ class Base(AsyncAttrs, DeclarativeBase):
 
 engine = create_async_engine(DATABASE_URL, echo=True)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+
+@event.listens_for(Session, "after_commit")
+def count_commits(session: Session) -> None:
+    # Commits per unit of work, checked by request logging and tests; released
+    # savepoints are not commits
+    if not session.in_nested_transaction():
+        session.info["commits"] = session.info.get("commits", 0) + 1
@@ -0,0 +1,169 @@
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Callable, Iterable, Iterator, Optional
+
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+from app.core.celery import SharedRateLimit, worker_redis
+
+
+class SMTPConnectionPool:
+    """
+    Small pool of authenticated, long-lived SMTP connections.
+
+    Idle connections are checked with NOOP before reuse and replaced when they
+    were idle for too long or the server dropped them, so a message only pays
+    the TLS handshake and login when no healthy connection is available.
+    ``throttle`` is called before every message, e.g. to wait for a rate limit.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        size: int,
+        max_idle: int,
+        timeout: int,
+        throttle: Optional[Callable[[], None]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.throttle = throttle
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: queue.LifoQueue[tuple[smtplib.SMTP_SSL, float]] = queue.LifoQueue()
+
+    def _connect(self) -> smtplib.SMTP_SSL:
+        connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        connection.login(self.user, self.password)
+        logger.debug(f"Opened SMTP connection to {self.host}:{self.port}")
+        return connection
+
+    def _close(self, connection: smtplib.SMTP_SSL) -> None:
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def _is_healthy(self, connection: smtplib.SMTP_SSL, last_used: float) -> bool:
+        if time.monotonic() - last_used > self.max_idle:
+            return False
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _acquire(self) -> smtplib.SMTP_SSL:
+        while True:
+            try:
+                connection, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            if self._is_healthy(connection, last_used):
+                return connection
+            self._close(connection)
+
+    def _send_message(self, connection: smtplib.SMTP_SSL, email: EmailMessage) -> None:
+        if self.throttle:
+            self.throttle()
+        connection.send_message(email)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP_SSL]:
+        self._slots.acquire()
+        try:
+            connection = self._acquire()
+            reusable = True
+            try:
+                yield connection
+            except (smtplib.SMTPServerDisconnected, OSError):
+                reusable = False
+                raise
+            finally:
+                if reusable:
+                    self._idle.put((connection, time.monotonic()))
+                else:
+                    self._close(connection)
+        finally:
+            self._slots.release()
+
+    def send(self, email: EmailMessage) -> None:
+        """
+        Send one email, raising the SMTP error if it could not be delivered.
+        """
+        with self.connection() as connection:
+            self._send_message(connection, email)
+
+    def send_many(self, emails: Iterable[EmailMessage]) -> list[EmailMessage]:
+        """
+        Send several emails over one pooled connection.
+
+        A dropped connection is replaced once per email; emails that still could
+        not be sent are logged and returned.
+
+        Returns:
+            list[EmailMessage]: Emails that could not be delivered
+        """
+        failed = []
+        pending = list(emails)
+
+        while pending:
+            try:
+                with self.connection() as connection:
+                    while pending:
+                        email = pending[0]
+                        try:
+                            self._send_message(connection, email)
+                        except (
+                            smtplib.SMTPRecipientsRefused,
+                            smtplib.SMTPResponseException,
+                        ) as e:
+                            logger.error(f'Email to "{email["To"]}" was refused: {e}')
+                            failed.append(email)
+                        pending.pop(0)
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                # Retry the current email once on a fresh connection
+                email = pending.pop(0)
+                logger.warning(f"SMTP connection failed, reconnecting: {e}")
+                try:
+                    with self.connection() as connection:
+                        self._send_message(connection, email)
+                except (smtplib.SMTPException, OSError) as e:
+                    logger.error(f'Failed to send email to "{email["To"]}": {e}')
+                    failed.append(email)
+
+        return failed
+
+    def close(self) -> None:
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(connection)
+
+
+smtp_pool = SMTPConnectionPool(
+    host=settings.SMTP_HOST,
+    port=settings.SMTP_PORT,
+    user=settings.SMTP_USER,
+    password=settings.SMTP_PASSWORD,
+    size=settings.SMTP_POOL_SIZE,
+    max_idle=settings.SMTP_MAX_IDLE,
+    timeout=settings.SMTP_TIMEOUT,
+    # The SMTP provider limits the whole account, not each worker
+    throttle=SharedRateLimit(
+        worker_redis, "rate_limit:smtp", settings.SMTP_RATE_LIMIT
+    ).acquire,
+)
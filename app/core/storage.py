@@ -0,0 +1,161 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+import boto3
+from botocore.config import Config
+
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+
+try:
+    from aiobotocore.session import get_session as get_aiobotocore_session
+except ImportError:  # pragma: no cover - native async transport is optional
+    get_aiobotocore_session = None
+
+
+class StorageClient:
+    """
+    S3 client shared by the whole process.
+
+    Blocking boto3 calls run on a dedicated executor whose size matches the
+    connection pool, and a semaphore caps the number of in-flight requests so
+    callers wait for a free connection instead of queueing unbounded work.
+    When AWS_S3_NATIVE_ASYNC is enabled and aiobotocore is installed, API
+    calls go through a native async client instead of the executor.
+    """
+
+    def __init__(self, max_pool_connections: int, native_async: bool = False):
+        self.max_pool_connections = max_pool_connections
+        self.native_async = native_async
+        self.client: Any = None
+        self.metrics: dict[str, dict[str, float]] = {}
+
+        self._started = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._async_client_context: Any = None
+        self._async_client: Any = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    def _client_kwargs(self) -> dict[str, Any]:
+        return {
+            "service_name": "s3",
+            "aws_access_key_id": settings.AWS_ACCESS_KEY_ID,
+            "aws_secret_access_key": settings.AWS_SECRET_KEY,
+            "region_name": settings.AWS_REGION,
+            "config": Config(
+                max_pool_connections=self.max_pool_connections,
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        }
+
+    def get_client(self) -> Any:
+        """
+        Return the boto3 client for local-only work such as signing URLs.
+        """
+        if self.client is None:
+            self.client = boto3.client(**self._client_kwargs())
+        return self.client
+
+    async def start(self) -> None:
+        if self.is_started:
+            return
+
+        self._started = True
+        self.get_client()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_pool_connections, thread_name_prefix="storage"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_pool_connections)
+
+        if self.native_async:
+            if get_aiobotocore_session is None:
+                logger.warning(
+                    "AWS_S3_NATIVE_ASYNC is enabled but aiobotocore is not installed, "
+                    "falling back to the thread pool transport"
+                )
+            else:
+                self._async_client_context = get_aiobotocore_session().create_client(
+                    **self._client_kwargs()
+                )
+                self._async_client = await self._async_client_context.__aenter__()
+
+        logger.info(
+            f"Storage client started with {self.max_pool_connections} connections"
+        )
+
+    async def stop(self) -> None:
+        if not self.is_started:
+            return
+
+        if self._async_client_context is not None:
+            await self._async_client_context.__aexit__(None, None, None)
+            self._async_client_context = self._async_client = None
+
+        self._executor.shutdown(wait=True)
+        self.client.close()
+        self.client = self._executor = self._semaphore = None
+        self._started = False
+        logger.info("Storage client stopped")
+
+    def _record(self, operation: str, elapsed: float, failed: bool) -> None:
+        stats = self.metrics.setdefault(
+            operation, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        elapsed_ms = elapsed * 1000
+        stats["count"] += 1
+        stats["errors"] += int(failed)
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        logger.debug(f'Storage operation "{operation}" took {elapsed_ms:.1f} ms')
+
+    async def run(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking storage function on the storage executor.
+        """
+        await self.start()
+
+        started_at = time.perf_counter()
+        failed = False
+        try:
+            async with self._semaphore:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, partial(func, *args, **kwargs)
+                )
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._record(operation, time.perf_counter() - started_at, failed)
+
+    async def call(self, operation: str, **kwargs) -> Any:
+        """
+        Call an S3 API operation, e.g. ``await storage.call("head_object", ...)``.
+        """
+        await self.start()
+
+        if self._async_client is None:
+            return await self.run(operation, getattr(self.client, operation), **kwargs)
+
+        started_at = time.perf_counter()
+        failed = False
+        try:
+            async with self._semaphore:
+                return await getattr(self._async_client, operation)(**kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._record(operation, time.perf_counter() - started_at, failed)
+
+
+storage = StorageClient(
+    max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+    native_async=settings.AWS_S3_NATIVE_ASYNC,
+)
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+import stripe
+
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+
+
+class AsyncStripeClient:
+    """
+    Stripe API client that never blocks the event loop.
+
+    Requests go through one shared httpx connection pool with explicit
+    timeouts, and a semaphore caps the number of concurrent Stripe calls.
+    Network failures are retried by the Stripe library, which sends an
+    idempotency key with retried POST requests so they are safe to repeat.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float,
+        max_network_retries: int,
+        max_concurrency: int,
+    ):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_network_retries = max_network_retries
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http_client: Optional[stripe.HTTPXClient] = None
+        self._client: Optional[stripe.StripeClient] = None
+
+    def get_client(self) -> stripe.StripeClient:
+        if self._client is None:
+            self._http_client = stripe.HTTPXClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0))
+            )
+            self._client = stripe.StripeClient(
+                self.api_key,
+                http_client=self._http_client,
+                max_network_retries=self.max_network_retries,
+            )
+        return self._client
+
+    @property
+    def services(self) -> Any:
+        # Newer library versions move the API services under the v1 namespace
+        client = self.get_client()
+        return getattr(client, "v1", client)
+
+    async def call(
+        self, operation: str, method: Callable[..., Awaitable[Any]], **kwargs
+    ) -> Any:
+        started_at = time.perf_counter()
+        try:
+            async with self._semaphore:
+                return await method(**kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            logger.debug(f'Stripe operation "{operation}" took {elapsed_ms:.1f} ms')
+
+    async def create_checkout_session(
+        self, params: dict[str, Any]
+    ) -> stripe.checkout.Session:
+        return await self.call(
+            "checkout.sessions.create",
+            self.services.checkout.sessions.create_async,
+            params=params,
+        )
+
+    async def close(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.close_async()
+            self._http_client = self._client = None
+
+
+stripe_client = AsyncStripeClient(
+    api_key=settings.STRIPE_SECRET_KEY,
+    timeout=settings.STRIPE_TIMEOUT,
+    max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES,
+    max_concurrency=settings.STRIPE_MAX_CONCURRENCY,
+)
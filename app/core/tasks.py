@@ -1,114 +1,523 @@
+import asyncio
 import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from email.message import EmailMessage
+from typing import Any, AsyncIterator, Coroutine
+from uuid import UUID
 
+from celery import Task
+from celery.utils.time import get_exponential_backoff_interval
 from pydantic import EmailStr
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 
+from app.config.logs.logger import logger
 from app.config.settings.base import settings
+from app.core.celery import (
+    DeduplicatedTask,
+    celery_app,
+    record_task_metrics,
+    worker_redis,
+)
+from app.core.database import DATABASE_URL, async_session_maker
+from app.core.mail import smtp_pool
+from app.core.templates import email_templates
+from app.repository.billing import BillingRepository
+from app.repository.invoice import InvoiceRepository
+from app.repository.ledger import LedgerRepository
+from app.repository.media import ImageVariantRepository
+from app.repository.outbox import OutboxRepository
+from app.repository.post import PostRepository
+from app.repository.stats import StatsRepository
+from app.repository.user import UserRepository
+from app.utilities.images import get_image_variant_key, render_image_variants
+from app.utilities.s3 import download_file_from_s3_async, put_file_to_s3_async
 
 
-def _get_email_template(
-    user_email: EmailStr, subject: str, email_content: str
-) -> EmailMessage:
-    email = EmailMessage()
-    email["Subject"] = subject
-    email["From"] = settings.SMTP_USER
-    email["To"] = user_email
-
-    email.set_content(email_content, subtype="html")
-
-    return email
-
-
-def get_email_template_dashboard(
-    user_email: EmailStr, user_full_name: str, reset_link: str
-) -> EmailMessage:
-    email_content = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; background-color: #f9f9f9; padding: 20px;">
-            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 30px; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                <h2 style="color: #333;">Hello, {user_full_name}</h2>
-                <p style="font-size: 16px; color: #555;">
-                    You have requested to reset your password. To proceed, please click the button below:
-                </p>
-                <p style="text-align: center;">
-                    <a href="{reset_link}"
-                       style="display: inline-block; padding: 12px 24px; font-size: 16px; color: #fff;
-                              background-color: #1a73e8; text-decoration: none; border-radius: 6px;">
-                        Reset Password
-                    </a>
-                </p>
-                <p style="font-size: 14px; color: #777;">
-                    If you did not request this, simply ignore this email.
-                </p>
-                <hr style="margin: 30px 0; border: none; border-top: 1px solid #eee;">
-                <p style="font-size: 14px; color: #555;">Best regards,</p>
-                <p style="font-size: 14px; color: #555;">Illia Dronov</p>
-            </div>
-        </body>
-        </html>
-        """
-
-    return _get_email_template(user_email, "Password reset request", email_content)
-
-
-def get_email_template_approve_verification(
-    user_email: EmailStr, user_full_name: str
-) -> EmailMessage:
-    email_content = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; background-color: #f9f9f9; padding: 20px;">
-            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 30px; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                <h2 style="color: #333;">Hello, {user_full_name}</h2>
-                <p style="font-size: 16px; color: #555;">
-                    Your mentor verification has been approved.
-                </p>
-            </div>
-        </body>
-    """
-
-    return _get_email_template(user_email, "Verification approved", email_content)
-
-
-def get_email_template_decline_verification(
-    user_email: EmailStr,
-    user_full_name: str,
-    decline_reason: str,
-) -> EmailMessage:
-    email_content = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; background-color: #f9f9f9; padding: 20px;">
-            <div style="max-width: 600px; margin: 0 auto; background: #ffffff; padding: 30px; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                <h2 style="color: #333;">Hello, {user_full_name}</h2>
-                <p style="font-size: 16px; color: #555;">
-                    Your mentor verification has been declined. Reason: {decline_reason}
-                </p>
-            </div>
-        </body>
-    """
-
-    return _get_email_template(user_email, "Verification declined", email_content)
+def send_email(email: EmailMessage) -> None:
+    smtp_pool.send(email)
 
 
-def send_email(email: EmailMessage) -> None:
-    with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-        server.send_message(email)
+def send_emails(emails: list[EmailMessage]) -> list[EmailMessage]:
+    return smtp_pool.send_many(emails)
+
+
+# Delivery problems are retried with exponential backoff. The SMTP provider's rate
+# limit is enforced per message by the SMTP pool, across all workers
+EMAIL_TASK_OPTIONS = {
+    "base": DeduplicatedTask,
+    "autoretry_for": (smtplib.SMTPException, OSError),
+    "retry_backoff": True,
+    "retry_backoff_max": 600,
+    "retry_jitter": True,
+    "max_retries": settings.SMTP_MAX_RETRIES,
+}
+email_task = celery_app.task(**EMAIL_TASK_OPTIONS)
+# Bulk tasks are bound so they can retry only the recipients that failed
+bulk_email_task = celery_app.task(bind=True, **EMAIL_TASK_OPTIONS)
 
 
+@email_task
 def send_email_report_dashboard(user_email: EmailStr, user_name: str, reset_link: str):
-    email = get_email_template_dashboard(user_email, user_name, reset_link)
+    email = email_templates.render(
+        "password_reset",
+        user_email,
+        user_full_name=user_name,
+        reset_link=reset_link,
+    )
     send_email(email)
 
 
+@email_task
 def send_email_approve_verification(user_email: EmailStr, user_full_name: str):
-    email = get_email_template_approve_verification(user_email, user_full_name)
+    email = email_templates.render(
+        "verification_approved", user_email, user_full_name=user_full_name
+    )
     send_email(email)
 
 
+@email_task
 def send_email_decline_verification(
     user_email: EmailStr, user_full_name: str, decline_reason: str
 ):
-    email = get_email_template_decline_verification(
-        user_email, user_full_name, decline_reason
+    email = email_templates.render(
+        "verification_declined",
+        user_email,
+        user_full_name=user_full_name,
+        decline_reason=decline_reason,
     )
     send_email(email)
+
+
+def retry_failed_recipients(
+    task: Task,
+    recipients: list[list[str]],
+    emails: list[EmailMessage],
+    failed: list[EmailMessage],
+    **kwargs: Any,
+) -> None:
+    """
+    Retry a bulk email task with only the recipients whose email failed, so
+    the others are not emailed twice.
+    """
+    if not failed:
+        return
+
+    failed_recipients = [
+        recipient for recipient, email in zip(recipients, emails) if email in failed
+    ]
+    raise task.retry(
+        kwargs={**kwargs, "recipients": failed_recipients},
+        exc=smtplib.SMTPException(f"{len(failed)} of {len(emails)} emails failed"),
+        countdown=get_exponential_backoff_interval(
+            factor=1, retries=task.request.retries, maximum=600, full_jitter=True
+        ),
+    )
+
+
+@bulk_email_task
+def send_emails_approve_verification(self: Task, recipients: list[list[str]]) -> None:
+    """
+    Tell several users their verification was approved; ``recipients`` holds
+    ``[email, full name]`` pairs.
+    """
+    emails = [
+        email_templates.render(
+            "verification_approved", user_email, user_full_name=user_full_name
+        )
+        for user_email, user_full_name in recipients
+    ]
+    retry_failed_recipients(self, recipients, emails, send_emails(emails))
+
+
+@bulk_email_task
+def send_emails_decline_verification(
+    self: Task, recipients: list[list[str]], decline_reason: str
+) -> None:
+    emails = [
+        email_templates.render(
+            "verification_declined",
+            user_email,
+            user_full_name=user_full_name,
+            decline_reason=decline_reason,
+        )
+        for user_email, user_full_name in recipients
+    ]
+    retry_failed_recipients(
+        self,
+        recipients,
+        emails,
+        send_emails(emails),
+        decline_reason=decline_reason,
+    )
+
+
+@bulk_email_task
+def send_emails_new_post(
+    self: Task,
+    recipients: list[list[str]],
+    post_title: str,
+    post_description: str,
+    post_link: str,
+) -> None:
+    """
+    Tell one batch of mentees about a new mentor post; ``recipients`` holds
+    ``[email, full name]`` pairs.
+    """
+    post_context = {
+        "post_title": post_title,
+        "post_description": post_description,
+        "post_link": post_link,
+    }
+    emails = [
+        email_templates.render(
+            "new_posts", user_email, user_full_name=user_full_name, **post_context
+        )
+        for user_email, user_full_name in recipients
+    ]
+    retry_failed_recipients(
+        self, recipients, emails, send_emails(emails), **post_context
+    )
+
+
+@celery_app.task(base=DeduplicatedTask)
+def send_email_new_posts(post_id: str) -> None:
+    run_async(_send_email_new_posts(UUID(post_id)))
+
+
+async def _send_email_new_posts(post_id: UUID) -> None:
+    """
+    Fan the notifications of a new mentor post out to every mentee of the
+    post's categories.
+
+    Recipients are read EMAIL_BULK_BATCH_SIZE at a time, each page in its own
+    short transaction, and every page is sent by its own bulk email task. No
+    transaction stays open while emails go out, and every task is short enough
+    not to be redelivered while it still runs.
+    """
+    async with task_session() as session:
+        post = await PostRepository(session).get_post_by_id(post_id)
+        if not post or not post.categories:
+            return
+
+        # The post expires with the first page's transaction
+        author_id = post.user_id
+        category_ids = [category.category_id for category in post.categories]
+        post_context = {
+            "post_title": post.title,
+            "post_description": post.description,
+            "post_link": f"{settings.WEB_URL}/en/posts/{post.id}",
+        }
+        repository = UserRepository(session)
+        after_user_id = None
+        batches = recipients = 0
+        while True:
+            members, next_user_id = await repository.get_category_members(
+                category_ids,
+                after_user_id,
+                settings.EMAIL_BULK_BATCH_SIZE,
+                exclude_user_id=author_id,
+            )
+            await session.rollback()
+
+            if members:
+                # The id makes a repeated fan-out skip batches already sent
+                send_emails_new_post.apply_async(
+                    kwargs={
+                        "recipients": [
+                            [email, name or "User"] for email, name in members
+                        ],
+                        **post_context,
+                    },
+                    task_id=f"new_post:{post_id}:{after_user_id or 'start'}",
+                )
+                batches += 1
+                recipients += len(members)
+
+            if next_user_id is None:
+                break
+            after_user_id = next_user_id
+
+    logger.info(
+        f'Queued new post "{post_id}" notifications for {recipients} users in '
+        f"{batches} batches"
+    )
+
+
+@celery_app.task
+def dispatch_outbox() -> None:
+    run_async(_dispatch_outbox())
+
+
+async def _dispatch_outbox() -> None:
+    """
+    Hand due outbox events over to their Celery tasks.
+
+    Each batch is locked with ``FOR UPDATE SKIP LOCKED`` and marked as
+    dispatched in the same transaction, so concurrent dispatchers never pick up
+    the same event. Events that could not be enqueued are retried later with
+    exponential backoff.
+    """
+    dispatched = failed = 0
+    async with task_session() as session:
+        repository = OutboxRepository(session)
+        while True:
+            events = await repository.claim_pending_events(
+                settings.OUTBOX_BATCH_SIZE, settings.OUTBOX_MAX_ATTEMPTS
+            )
+
+            dispatched_ids = []
+            for event in events:
+                try:
+                    celery_app.tasks[event.event_type].apply_async(
+                        kwargs=event.payload, task_id=str(event.id)
+                    )
+                    dispatched_ids.append(event.id)
+                except Exception as e:
+                    logger.error(
+                        f'Failed to dispatch outbox event "{event.dedup_key}": {e}'
+                    )
+                    await repository.mark_failed(
+                        event.id,
+                        repr(e),
+                        timedelta(seconds=min(2**event.attempts, 3600)),
+                    )
+                    failed += 1
+
+            await repository.mark_dispatched(dispatched_ids)
+            await session.commit()
+            dispatched += len(dispatched_ids)
+
+            if len(events) < settings.OUTBOX_BATCH_SIZE:
+                break
+
+    if dispatched or failed:
+        logger.info(f"Dispatched {dispatched} outbox events, {failed} failed")
+
+
+@celery_app.task
+def process_stripe_events() -> None:
+    run_async(_process_stripe_events())
+
+
+async def _process_stripe_events() -> None:
+    """
+    Apply queued Stripe webhook events in batches.
+
+    Every event runs in its own savepoint, so one failing event neither rolls
+    back the rest of the batch nor blocks other customers. Failed events are
+    retried with exponential backoff and dead-lettered after
+    STRIPE_WEBHOOK_MAX_ATTEMPTS attempts.
+    """
+    # Services import this module for their tasks
+    from app.services.billing import BillingService
+
+    processed = failed = 0
+    async with task_session() as session:
+        billing_repository = BillingRepository(session)
+        billing_service = BillingService(
+            UserRepository(session), billing_repository, LedgerRepository(session)
+        )
+        while True:
+            events = await billing_repository.claim_webhook_events(
+                settings.STRIPE_WEBHOOK_BATCH_SIZE
+            )
+
+            processed_ids, stale_cache_keys = [], []
+            for event in events:
+                event_id, attempts = event.id, event.attempts
+                try:
+                    async with billing_repository.savepoint():
+                        cache_keys = await billing_service.process_webhook_event(event)
+                    processed_ids.append(event_id)
+                    stale_cache_keys += cache_keys
+                except Exception as e:
+                    dead_lettered = await billing_repository.mark_webhook_event_failed(
+                        event_id,
+                        repr(e),
+                        timedelta(seconds=min(10 * 2**attempts, 3600)),
+                        settings.STRIPE_WEBHOOK_MAX_ATTEMPTS,
+                    )
+                    if dead_lettered:
+                        logger.critical(
+                            f'Stripe event "{event_id}" was dead-lettered: {e}'
+                        )
+                    else:
+                        logger.error(
+                            f'Failed to process Stripe event "{event_id}": {e}'
+                        )
+                    failed += 1
+
+            await billing_repository.mark_webhook_events_processed(processed_ids)
+            await session.commit()
+            processed += len(processed_ids)
+            delete_cached_keys(stale_cache_keys)
+
+            if len(events) < settings.STRIPE_WEBHOOK_BATCH_SIZE:
+                break
+
+    if processed or failed:
+        logger.info(f"Processed {processed} Stripe events, {failed} failed")
+
+
+@celery_app.task
+def reconcile_ledger() -> None:
+    run_async(_reconcile_ledger())
+
+
+async def _reconcile_ledger() -> None:
+    """
+    Verify every balance snapshot against the sum of the user's ledger entries.
+
+    Users are checked LEDGER_RECONCILE_CHUNK_SIZE at a time, each chunk in its
+    own short transaction, and mismatches are reported but not corrected.
+    """
+    checked_after = None
+    mismatched = 0
+    async with task_session() as session:
+        repository = LedgerRepository(session)
+        while True:
+            mismatches, checked_after = await repository.get_balance_mismatches(
+                checked_after, settings.LEDGER_RECONCILE_CHUNK_SIZE
+            )
+            await session.rollback()
+
+            for user_id, balance, ledger_balance in mismatches:
+                logger.critical(
+                    f'Balance of user "{user_id}" is {balance}, '
+                    f"but its ledger entries sum up to {ledger_balance}"
+                )
+            mismatched += len(mismatches)
+
+            if checked_after is None:
+                break
+
+    logger.info(f"Ledger reconciliation finished, {mismatched} balances mismatch")
+
+
+@celery_app.task
+def sweep_overdue_invoices() -> None:
+    run_async(_sweep_overdue_invoices())
+
+
+async def _sweep_overdue_invoices() -> None:
+    """
+    Cancel pending invoices overdue by more than INVOICE_OVERDUE_GRACE and
+    refund the credits their mentees paid into escrow.
+
+    Invoices are claimed INVOICE_SWEEP_CHUNK_SIZE at a time with SKIP LOCKED and
+    every chunk is committed on its own, so several workers can share the
+    backlog and an invoice that is being updated right now is left for the
+    next run.
+    """
+    from app.services.invoice import InvoiceService
+
+    now = datetime.now(timezone.utc)
+    due_before = now - timedelta(seconds=settings.INVOICE_OVERDUE_GRACE)
+    cancelled = 0
+
+    async with task_session() as session:
+        invoice_repository = InvoiceRepository(session)
+        service = InvoiceService(
+            invoice_repository,
+            UserRepository(session),
+            LedgerRepository(session),
+            StatsRepository(session),
+        )
+
+        overdue = await invoice_repository.count_overdue_invoices(now)
+        backlog = await invoice_repository.count_overdue_invoices(due_before)
+        await session.rollback()
+
+        while True:
+            swept = await service.cancel_overdue_invoices(
+                due_before, settings.INVOICE_SWEEP_CHUNK_SIZE
+            )
+            cancelled += swept
+            if swept < settings.INVOICE_SWEEP_CHUNK_SIZE:
+                break
+
+    record_task_metrics(
+        "sweep_overdue_invoices",
+        overdue=overdue,
+        backlog=backlog,
+        cancelled=cancelled,
+    )
+    logger.info(
+        f"Invoice sweep finished: {overdue} overdue, {backlog} past the grace "
+        f"period, {cancelled} cancelled"
+    )
+
+
+def delete_cached_keys(keys: list[str]) -> None:
+    """
+    Drop stale cache entries after a commit. The synchronous worker client is
+    used because the async one is bound to the event loop of the first task.
+    """
+    if not keys:
+        return
+
+    try:
+        worker_redis.delete(*keys)
+    except RedisError as e:
+        # The entries still expire on their own
+        logger.warning(f"Failed to delete {len(keys)} stale cache keys: {e}")
+
+
+@asynccontextmanager
+async def task_session() -> AsyncIterator[AsyncSession]:
+    # The worker runs every task in a new event loop, which pooled asyncpg
+    # connections can not be shared with
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+    finally:
+        await engine.dispose()
+
+
+def run_async(coroutine: Coroutine) -> Any:
+    """
+    Run a coroutine from a synchronous task, also when the task runs eagerly
+    inside the web process's event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+async def create_image_variants(key: str) -> None:
+    """
+    Store resized variants of the image under ``key`` and record them, so
+    responses start linking to the variants once all of them exist.
+    """
+    try:
+        content = await download_file_from_s3_async(key)
+        variants = await asyncio.to_thread(render_image_variants, content)
+        await asyncio.gather(
+            *(
+                put_file_to_s3_async(
+                    get_image_variant_key(key, variant, extension),
+                    variant_content,
+                    content_type,
+                )
+                for (variant, extension), (
+                    variant_content,
+                    content_type,
+                ) in variants.items()
+            )
+        )
+        async with async_session_maker() as session:
+            variant_repository = ImageVariantRepository(session)
+            await variant_repository.add_variant_set(key)
+            await variant_repository.commit()
+        logger.info(f'Generated {len(variants)} image variants of "{key}"')
+    except Exception as e:
+        logger.error(f'Failed to generate image variants of "{key}": {e}')
@@ -0,0 +1,73 @@
+import pathlib
+from email.message import EmailMessage
+from typing import Any, NamedTuple
+
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    select_autoescape,
+)
+
+from app.config.settings.base import settings
+
+TEMPLATES_DIR = pathlib.Path(__file__).parent.parent / "templates" / "email"
+
+
+class EmailTemplate(NamedTuple):
+    subject: Template
+    html: Template
+    text: Template
+
+
+class EmailTemplateRegistry:
+    """
+    Email templates compiled once at import time.
+
+    Every template consists of ``<name>.html`` and ``<name>.txt`` files and a
+    subject, and is rendered into a multipart email with a plain-text body and
+    an HTML alternative. Values are escaped in the HTML part only.
+    """
+
+    def __init__(self, directory: pathlib.Path):
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(["html"], default_for_string=False),
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        self._templates: dict[str, EmailTemplate] = {}
+
+    def register(self, name: str, subject: str) -> None:
+        self._templates[name] = EmailTemplate(
+            subject=self.environment.from_string(subject),
+            html=self.environment.get_template(f"{name}.html"),
+            text=self.environment.get_template(f"{name}.txt"),
+        )
+
+    def get(self, name: str) -> EmailTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise LookupError(f'Email template "{name}" is not registered')
+
+    def render(self, name: str, recipient: str, **context: Any) -> EmailMessage:
+        template = self.get(name)
+
+        email = EmailMessage()
+        email["Subject"] = template.subject.render(context)
+        email["From"] = settings.SMTP_USER
+        email["To"] = recipient
+        email.set_content(template.text.render(context))
+        email.add_alternative(template.html.render(context), subtype="html")
+
+        return email
+
+
+email_templates = EmailTemplateRegistry(TEMPLATES_DIR)
+email_templates.register("password_reset", "Password reset request")
+email_templates.register("verification_approved", "Verification approved")
+email_templates.register("verification_declined", "Verification declined")
+email_templates.register("new_posts", "New post in your categories: {{ post_title }}")
@@ -1,5 +1,6 @@
 import logging
 import logging.config
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,12 +22,28 @@ from app.admin import (
 from app.api.endpoints import router
 from app.config.logs.log_config import LOGGING_CONFIG
 from app.config.settings.base import settings
+from app.core.activity_categories import activity_category_catalog
 from app.core.database import engine
+from app.core.mail import smtp_pool
+from app.core.storage import storage
+from app.core.stripe_client import stripe_client
 
 # Set up logging configuration
 logging.config.dictConfig(LOGGING_CONFIG)
 
-app = FastAPI(title="Mentorship App")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await storage.start()
+    await activity_category_catalog.start()
+    yield
+    await activity_category_catalog.stop()
+    await storage.stop()
+    await stripe_client.close()
+    smtp_pool.close()
+
+
+app = FastAPI(title="Mentorship App", lifespan=lifespan)
 
 # Admin
 admin = Admin(app=app, engine=engine)
@@ -1,7 +1,17 @@
 from app.models.chat import ChatConversation, ChatMessage, MessageTypes
 from app.models.invoice import LessonInvoice
-from app.models.payment import PaymentTypes, Transaction, TransactionStatuses
+from app.models.ledger import LedgerAccounts, LedgerEntry, LedgerReasons
+from app.models.media import ImageVariantSet
+from app.models.outbox import OutboxEvent
+from app.models.payment import (
+    PaymentTypes,
+    StripeWebhookEvent,
+    Transaction,
+    TransactionStatuses,
+    WebhookEventStatuses,
+)
 from app.models.post import ActivityCategoryPost, Post
+from app.models.stats import UserDailyStats
 from app.models.user import (
     ActivityCategory,
     ActivityCategoryUser,
@@ -26,5 +36,13 @@ __all__ = [
     "Transaction",
     "PaymentTypes",
     "TransactionStatuses",
+    "StripeWebhookEvent",
+    "WebhookEventStatuses",
     "LessonInvoice",
+    "LedgerAccounts",
+    "LedgerEntry",
+    "LedgerReasons",
+    "OutboxEvent",
+    "UserDailyStats",
+    "ImageVariantSet",
 ]
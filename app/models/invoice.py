@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import DateTime, Index, Integer, String
 from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -39,3 +39,13 @@ class LessonInvoice(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+
+    __table_args__ = (
+        Index("ix_lesson_invoices_mentor_id_due_date", "mentor_id", "due_date", "id"),
+        Index("ix_lesson_invoices_mentee_id_due_date", "mentee_id", "due_date", "id"),
+        Index(
+            "ix_lesson_invoices_pending_due_date",
+            "due_date",
+            postgresql_where=status == InvoiceStatus.PENDING.value,
+        ),
+    )
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class LedgerAccounts(str, Enum):
+    USER = "user"
+    # Credits bought through Stripe
+    STRIPE = "stripe"
+    # Credits held between invoice creation and payment
+    ESCROW = "escrow"
+    # Balances that existed before the ledger was introduced
+    OPENING = "opening"
+
+
+class LedgerReasons(str, Enum):
+    OPENING_BALANCE = "OB"
+    TOP_UP = "TU"
+    INVOICE_DEBIT = "ID"
+    INVOICE_PAYOUT = "IP"
+    INVOICE_REFUND = "IR"
+
+
+class LedgerEntry(Base):
+    """
+    Append-only double-entry record of a credit movement.
+
+    Every movement is a journal of entries whose amounts sum up to zero; the
+    entries on the user account add up to ``users.balance``.
+    """
+
+    __tablename__ = "ledger_entries"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    journal_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    account: Mapped[LedgerAccounts] = mapped_column(String(10), nullable=False)
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    balance_after: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    reason: Mapped[LedgerReasons] = mapped_column(String(2), nullable=False)
+    invoice_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    transaction_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index("ix_ledger_entries_user_id_created_at", "user_id", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<LedgerEntry {self.account} {self.amount}>"
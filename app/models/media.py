@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ImageVariantSet(Base):
+    """
+    S3 key of an original image whose resized variants have all been stored.
+
+    Keys are content-addressed, so a row stays valid for every user and
+    verification that references the same key.
+    """
+
+    __tablename__ = "image_variant_sets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    def __repr__(self) -> str:
+        return f"<ImageVariantSet {self.key}>"
@@ -1,10 +1,10 @@
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy import ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -22,6 +22,12 @@ class TransactionStatuses(str, Enum):
     CANCELED = "CD"
 
 
+class WebhookEventStatuses(str, Enum):
+    PENDING = "P"
+    PROCESSED = "D"
+    FAILED = "F"
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
 
@@ -34,6 +40,10 @@ class Transaction(Base):
     credits_amount: Mapped[int] = mapped_column(nullable=False)
     payment_type: Mapped[PaymentTypes] = mapped_column(String(2), nullable=False)
     status: Mapped[TransactionStatuses] = mapped_column(String(2), nullable=False)
+    stripe_event_id: Mapped[Optional[str]] = mapped_column(
+        String(255), unique=True, nullable=True
+    )
+    stripe_session_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -48,3 +58,50 @@ class Transaction(Base):
 
     def __repr__(self) -> str:
         return f"<Transaction {self.id}>"
+
+
+class StripeWebhookEvent(Base):
+    """
+    Raw Stripe webhook event waiting to be processed by the worker.
+
+    Events of one customer are processed in the order Stripe created them;
+    events that keep failing end up with the FAILED status until replayed.
+    """
+
+    __tablename__ = "stripe_webhook_events"
+
+    id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(255), nullable=False)
+    customer_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    status: Mapped[WebhookEventStatuses] = mapped_column(
+        String(1),
+        default=WebhookEventStatuses.PENDING.value,
+        server_default=WebhookEventStatuses.PENDING.value,
+    )
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    stripe_created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+    available_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_stripe_webhook_events_pending",
+            "customer_key",
+            "stripe_created_at",
+            postgresql_where=status == WebhookEventStatuses.PENDING.value,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<StripeWebhookEvent {self.id}>"
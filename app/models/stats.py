@@ -0,0 +1,44 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+# Counters kept for every user and day
+STATS_COUNTERS = (
+    "earned",
+    "lessons_given",
+    "spent",
+    "lessons_taken",
+    "cancelled_lessons",
+)
+
+
+class UserDailyStats(Base):
+    """
+    Invoice totals of a user for one UTC day, counted on the day an invoice was
+    paid or cancelled.
+
+    Rows are incremented in the transaction that changes the invoice, so
+    dashboards read these rollups instead of aggregating ``lesson_invoices``.
+    """
+
+    __tablename__ = "user_daily_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Credits received for paid invoices as a mentor
+    earned: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    lessons_given: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Credits paid for invoices as a mentee
+    spent: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    lessons_taken: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    cancelled_lessons: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserDailyStats {self.user_id} {self.day}>"
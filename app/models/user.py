@@ -3,11 +3,21 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Boolean, Float, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+    exists,
+)
 from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.core.database import Base
+from app.models.media import ImageVariantSet
 
 
 class MentorVerificationStatus(str, Enum):
@@ -47,6 +57,13 @@ class User(Base):
     name: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     profile_picture: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     id_card_photo: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Whether resized variants of the current images have been generated
+    profile_picture_has_variants: Mapped[bool] = column_property(
+        exists().where(ImageVariantSet.key == profile_picture)
+    )
+    id_card_photo_has_variants: Mapped[bool] = column_property(
+        exists().where(ImageVariantSet.key == id_card_photo)
+    )
     verification_status: Mapped[MentorVerificationStatus] = mapped_column(
         String(2),
         default=MentorVerificationStatus.UNVERIFIED.value,
@@ -111,6 +128,10 @@ class UserVerification(Base):
     cv_link: Mapped[Optional[str]] = mapped_column(String(255), nullable=False)
 
     admin_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    # End of the lease of the admin who claimed the pending verification
+    claim_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -123,6 +144,15 @@ class UserVerification(Base):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="verifications")
 
+    __table_args__ = (
+        Index(
+            "ix_user_verifications_pending_created_at",
+            "created_at",
+            "id",
+            postgresql_where=status == UserVerificationStatus.PENDING.value,
+        ),
+    )
+
     class Statuses(str, Enum):
         PENDING = "PD"
         APPROVED = "AP"
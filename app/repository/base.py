@@ -1,15 +1,27 @@
+from contextlib import asynccontextmanager
 from itertools import chain
-from typing import Any, Iterable, Type
+from typing import Any, AsyncIterator, Iterable, Type
 
 from pydantic import BaseModel
 from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import Select
 
 from app.core.database import Base
 
 
 class BaseRepository:
+    """
+    Data access for one model over the session shared by a request.
+
+    The session is the unit of work: write methods only flush, so changes made
+    through any repository of the request become visible to later queries, and
+    the service commits them all at once with ``commit``. Work that may fail on
+    its own without discarding the rest runs inside ``savepoint``.
+    """
+
     model: Any = None
 
     def __init__(self, async_session: AsyncSession):
@@ -22,7 +34,7 @@ class BaseRepository:
         new_instance = self.model(**model_data.model_dump())
         self.async_session.add(new_instance)
 
-        await self.async_session.commit()
+        await self.async_session.flush()
         return new_instance
 
     async def does_entity_exist(self, query: Select) -> bool:
@@ -60,7 +72,6 @@ class BaseRepository:
             .returning(self.model)
         )
         res = await self.async_session.execute(query)
-        await self.async_session.commit()
         return res.unique().scalar_one()
 
     async def delete(self, instance_id: int) -> int:
@@ -71,18 +82,99 @@ class BaseRepository:
         )
 
         result = (await self.async_session.execute(query)).scalar_one()
-        await self.async_session.commit()
         return result
 
     async def save(self, obj: Any):
         self.async_session.add(obj)
-        await self.async_session.commit()
+        await self.async_session.flush()
 
     async def save_many(self, objects: list[Any], with_expire: bool = False):
         self.async_session.add_all(objects)
-        await self.async_session.commit()
+        await self.async_session.flush()
         if with_expire:
             self.async_session.expire_all()
 
+    async def commit(self) -> None:
+        """
+        Commit everything the request's repositories have written so far.
+        """
+        await self.async_session.commit()
+
+    async def rollback(self) -> None:
+        await self.async_session.rollback()
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[None]:
+        """
+        Run a block in a nested transaction that is rolled back on its own if
+        the block raises, keeping earlier work of the unit intact.
+        """
+        async with self.async_session.begin_nested():
+            yield
+
     async def refresh(self, obj: Any, attribute_names: list[str] | None = None):
         await self.async_session.refresh(obj, attribute_names)
+
+    async def sync_associations(
+        self,
+        association_model: Any,
+        owner_column: InstrumentedAttribute,
+        owner_id: Any,
+        target_column: InstrumentedAttribute,
+        target_ids: Iterable[Any],
+        **fixed_values: Any,
+    ) -> bool:
+        """
+        Make the association rows of ``owner_id`` match ``target_ids``.
+
+        Rows that are no longer wanted are removed with a single DELETE and the
+        missing ones are added with a single multi-row
+        ``INSERT ... ON CONFLICT DO NOTHING``. Nothing is written when the sets
+        already match. The caller owns the transaction, so no commit is issued.
+
+        Returns:
+            bool: True if any association row was deleted or inserted
+        """
+        desired_ids = set(target_ids)
+        fixed_columns = [getattr(association_model, name) for name in fixed_values]
+        query = select(association_model.id, target_column, *fixed_columns).where(
+            owner_column == owner_id
+        )
+        rows = (await self.async_session.execute(query)).all()
+
+        kept_ids = set()
+        stale_row_ids = []
+        for row_id, target_id, *row_fixed_values in rows:
+            if (
+                target_id in desired_ids
+                and target_id not in kept_ids
+                and tuple(row_fixed_values) == tuple(fixed_values.values())
+            ):
+                kept_ids.add(target_id)
+            else:
+                stale_row_ids.append(row_id)
+
+        missing_ids = desired_ids - kept_ids
+
+        if stale_row_ids:
+            await self.async_session.execute(
+                delete(association_model).where(association_model.id.in_(stale_row_ids))
+            )
+
+        if missing_ids:
+            await self.async_session.execute(
+                insert(association_model)
+                .values(
+                    [
+                        {
+                            owner_column.key: owner_id,
+                            target_column.key: target_id,
+                            **fixed_values,
+                        }
+                        for target_id in missing_ids
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+
+        return bool(stale_row_ids or missing_ids)
@@ -1,5 +1,182 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import case, exists, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from app.config.logs.logger import logger
+from app.models.payment import (
+    PaymentTypes,
+    StripeWebhookEvent,
+    Transaction,
+    TransactionStatuses,
+    WebhookEventStatuses,
+)
 from app.repository.base import BaseRepository
 
 
 class BillingRepository(BaseRepository):
-    pass
+    model = Transaction
+
+    async def record_stripe_transaction(
+        self,
+        stripe_event_id: str,
+        stripe_session_id: str,
+        user_id: UUID,
+        credits_amount: int,
+    ) -> Optional[UUID]:
+        """
+        Record a successful Stripe payment without committing.
+
+        The unique ``stripe_event_id`` makes a redelivered event a no-op.
+
+        Returns:
+            Optional[UUID]: Id of the new transaction, or None if the event was
+            already recorded
+        """
+        query = (
+            insert(Transaction)
+            .values(
+                user_id=user_id,
+                credits_amount=credits_amount,
+                payment_type=PaymentTypes.CREDIT_CARD.value,
+                status=TransactionStatuses.SUCCESS.value,
+                stripe_event_id=stripe_event_id,
+                stripe_session_id=stripe_session_id,
+            )
+            .on_conflict_do_nothing(index_elements=[Transaction.stripe_event_id])
+            .returning(Transaction.id)
+        )
+        transaction_id = (await self.async_session.execute(query)).scalar_one_or_none()
+        if transaction_id is None:
+            logger.info(f'Stripe event "{stripe_event_id}" was already recorded')
+        return transaction_id
+
+    async def add_webhook_event(
+        self,
+        event_id: str,
+        event_type: str,
+        customer_key: str,
+        payload: dict[str, Any],
+        stripe_created_at: datetime,
+    ) -> bool:
+        """
+        Queue a raw Stripe event without committing.
+
+        Returns:
+            bool: False if the event was already queued
+        """
+        query = (
+            insert(StripeWebhookEvent)
+            .values(
+                id=event_id,
+                event_type=event_type,
+                customer_key=customer_key,
+                payload=payload,
+                stripe_created_at=stripe_created_at,
+            )
+            .on_conflict_do_nothing(index_elements=[StripeWebhookEvent.id])
+            .returning(StripeWebhookEvent.id)
+        )
+        return (
+            await self.async_session.execute(query)
+        ).scalar_one_or_none() is not None
+
+    async def claim_webhook_events(self, limit: int) -> list[StripeWebhookEvent]:
+        """
+        Lock a batch of due events, at most one per customer.
+
+        Only the oldest pending event of a customer can be claimed, so while it
+        is being processed or waits for a retry, newer events of the same
+        customer stay queued and per-customer order is preserved.
+        """
+        earlier = aliased(StripeWebhookEvent)
+        has_earlier_pending = exists().where(
+            earlier.customer_key == StripeWebhookEvent.customer_key,
+            earlier.status == WebhookEventStatuses.PENDING.value,
+            # Stripe timestamps have second precision, the id breaks ties
+            tuple_(earlier.stripe_created_at, earlier.id)
+            < tuple_(StripeWebhookEvent.stripe_created_at, StripeWebhookEvent.id),
+        )
+        query = (
+            select(StripeWebhookEvent)
+            .where(
+                StripeWebhookEvent.status == WebhookEventStatuses.PENDING.value,
+                StripeWebhookEvent.available_at <= func.now(),
+                ~has_earlier_pending,
+            )
+            .order_by(StripeWebhookEvent.stripe_created_at, StripeWebhookEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.async_session.execute(query)
+        return list(result.scalars().all())
+
+    async def mark_webhook_events_processed(self, event_ids: Iterable[str]) -> None:
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+
+        await self.async_session.execute(
+            update(StripeWebhookEvent)
+            .where(StripeWebhookEvent.id.in_(event_ids))
+            .values(
+                status=WebhookEventStatuses.PROCESSED.value,
+                processed_at=func.now(),
+            )
+        )
+
+    async def mark_webhook_event_failed(
+        self, event_id: str, error: str, retry_in: timedelta, max_attempts: int
+    ) -> bool:
+        """
+        Schedule a retry of a failed event, or dead-letter it once it ran out of
+        attempts.
+
+        Returns:
+            bool: True if the event was dead-lettered
+        """
+        query = (
+            update(StripeWebhookEvent)
+            .where(StripeWebhookEvent.id == event_id)
+            .values(
+                attempts=StripeWebhookEvent.attempts + 1,
+                last_error=error,
+                available_at=func.now() + retry_in,
+                status=case(
+                    (
+                        StripeWebhookEvent.attempts + 1 >= max_attempts,
+                        WebhookEventStatuses.FAILED.value,
+                    ),
+                    else_=WebhookEventStatuses.PENDING.value,
+                ),
+            )
+            .returning(StripeWebhookEvent.status)
+        )
+        status = (await self.async_session.execute(query)).scalar_one()
+        return status == WebhookEventStatuses.FAILED.value
+
+    async def replay_webhook_events(
+        self, event_ids: Optional[Iterable[str]] = None
+    ) -> list[str]:
+        """
+        Put dead-lettered events back into the queue without committing.
+
+        Replays all failed events when ``event_ids`` is not given.
+        """
+        query = (
+            update(StripeWebhookEvent)
+            .where(StripeWebhookEvent.status == WebhookEventStatuses.FAILED.value)
+            .values(
+                status=WebhookEventStatuses.PENDING.value,
+                attempts=0,
+                available_at=func.now(),
+            )
+            .returning(StripeWebhookEvent.id)
+        )
+        if event_ids is not None:
+            query = query.where(StripeWebhookEvent.id.in_(list(event_ids)))
+
+        return list((await self.async_session.execute(query)).scalars().all())
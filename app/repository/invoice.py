@@ -1,34 +1,117 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, func, insert, select, tuple_
 
 from app.models.invoice import InvoiceStatus, LessonInvoice
 from app.repository.base import BaseRepository
+from app.schemas.invoice import InvoiceFilter
 
 
 class InvoiceRepository(BaseRepository):
     model = LessonInvoice
 
-    async def get_invoice_by_id(self, invoice_id: UUID) -> Optional[LessonInvoice]:
+    async def get_invoice_by_id(
+        self, invoice_id: UUID, for_update: bool = False
+    ) -> Optional[LessonInvoice]:
         query = select(LessonInvoice).where(LessonInvoice.id == invoice_id)
+        if for_update:
+            query = query.with_for_update()
         return await self.get_instance(query)
 
-    async def get_invoices_by_mentor_id(self, mentor_id: UUID) -> list[LessonInvoice]:
+    async def get_invoices_by_mentor_id(
+        self,
+        mentor_id: UUID,
+        filters: InvoiceFilter,
+        limit: int,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[LessonInvoice]:
+        return await self._get_invoices_page(
+            LessonInvoice.mentor_id == mentor_id, filters, limit, after
+        )
+
+    async def get_invoices_by_mentee_id(
+        self,
+        mentee_id: UUID,
+        filters: InvoiceFilter,
+        limit: int,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[LessonInvoice]:
+        return await self._get_invoices_page(
+            LessonInvoice.mentee_id == mentee_id, filters, limit, after
+        )
+
+    async def _get_invoices_page(
+        self,
+        owner_clause: ColumnElement[bool],
+        filters: InvoiceFilter,
+        limit: int,
+        after: Optional[tuple[datetime, UUID]],
+    ) -> list[LessonInvoice]:
+        """
+        Get invoices ordered by ``(due_date, id)`` descending, starting after the
+        ``after`` key, so every page is a range scan of the owner's index.
+        """
+        query = select(LessonInvoice).where(owner_clause)
+
+        if filters.status:
+            query = query.where(LessonInvoice.status == filters.status.value)
+        if filters.due_after:
+            query = query.where(LessonInvoice.due_date >= filters.due_after)
+        if filters.due_before:
+            query = query.where(LessonInvoice.due_date < filters.due_before)
+        if after:
+            query = query.where(
+                tuple_(LessonInvoice.due_date, LessonInvoice.id) < tuple_(*after)
+            )
+
+        query = query.order_by(
+            LessonInvoice.due_date.desc(), LessonInvoice.id.desc()
+        ).limit(limit)
+        return await self.get_many(query)
+
+    async def claim_overdue_invoices(
+        self, due_before: datetime, limit: int
+    ) -> list[LessonInvoice]:
+        """
+        Lock up to ``limit`` pending invoices that were due before ``due_before``.
+
+        Invoices locked by a running update or another sweeper are skipped
+        instead of waited for.
+        """
         query = (
             select(LessonInvoice)
-            .where(LessonInvoice.mentor_id == mentor_id)
-            .order_by(LessonInvoice.due_date.desc())
+            .where(
+                LessonInvoice.status == InvoiceStatus.PENDING.value,
+                LessonInvoice.due_date < due_before,
+            )
+            .order_by(LessonInvoice.due_date)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
         )
         return await self.get_many(query)
 
-    async def get_invoices_by_mentee_id(self, mentee_id: UUID) -> list[LessonInvoice]:
-        query = select(LessonInvoice).where(LessonInvoice.mentee_id == mentee_id)
-        return await self.get_many(query)
+    async def count_overdue_invoices(self, due_before: datetime) -> int:
+        query = select(func.count()).where(
+            LessonInvoice.status == InvoiceStatus.PENDING.value,
+            LessonInvoice.due_date < due_before,
+        )
+        return (await self.async_session.execute(query)).scalar_one()
 
     async def create_invoice(self, invoice_data: dict) -> LessonInvoice:
         return await self.create(invoice_data)
 
+    async def add_invoices(self, invoices_data: list[dict]) -> list[LessonInvoice]:
+        """
+        Insert several invoices with one multi-row ``INSERT ... RETURNING``
+        without committing.
+        """
+        result = await self.async_session.scalars(
+            insert(LessonInvoice).returning(LessonInvoice), invoices_data
+        )
+        return list(result.all())
+
     async def update_invoice_status(
         self, invoice_id: UUID, status: InvoiceStatus
     ) -> Optional[LessonInvoice]:
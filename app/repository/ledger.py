@@ -0,0 +1,200 @@
+import uuid
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.logs.logger import logger
+from app.models.ledger import LedgerAccounts, LedgerEntry, LedgerReasons
+from app.models.user import User
+from app.repository.base import BaseRepository
+
+
+class LedgerRepository(BaseRepository):
+    model = LedgerEntry
+
+    async def transfer(
+        self,
+        user_id: UUID,
+        amount: int,
+        counter_account: LedgerAccounts,
+        reason: LedgerReasons,
+        invoice_id: Optional[UUID] = None,
+        transaction_id: Optional[UUID] = None,
+    ) -> Optional[int]:
+        """
+        Move ``amount`` credits from ``counter_account`` to the user, or back
+        for a negative amount, without committing.
+
+        The balance snapshot is changed with a single
+        ``UPDATE ... RETURNING balance`` and the matching pair of ledger entries
+        is written in the same transaction. A debit only applies when the
+        balance covers it, so concurrent transfers can neither lose updates nor
+        overdraw the balance.
+
+        Returns:
+            Optional[int]: The new balance, or None if the user does not exist
+            or has insufficient funds
+        """
+        query = (
+            update(User)
+            .where(User.id == user_id)
+            .values(balance=User.balance + amount)
+            .returning(User.balance)
+        )
+        if amount < 0:
+            query = query.where(User.balance >= -amount)
+
+        new_balance = (await self.async_session.execute(query)).scalar_one_or_none()
+        if new_balance is None:
+            return None
+
+        journal_id = uuid.uuid4()
+        references = {"invoice_id": invoice_id, "transaction_id": transaction_id}
+        await self.async_session.execute(
+            insert(LedgerEntry).values(
+                [
+                    {
+                        "journal_id": journal_id,
+                        "account": LedgerAccounts.USER.value,
+                        "user_id": user_id,
+                        "amount": amount,
+                        "balance_after": new_balance,
+                        "reason": reason.value,
+                        **references,
+                    },
+                    {
+                        "journal_id": journal_id,
+                        "account": counter_account.value,
+                        "user_id": None,
+                        "amount": -amount,
+                        "balance_after": None,
+                        "reason": reason.value,
+                        **references,
+                    },
+                ]
+            )
+        )
+
+        logger.debug(
+            f'Changed balance of user "{user_id}" by {amount} to {new_balance} '
+            f"({reason.name})"
+        )
+        return new_balance
+
+    async def transfer_many(
+        self,
+        user_ids: list[UUID],
+        amount: int,
+        counter_account: LedgerAccounts,
+        reason: LedgerReasons,
+        invoice_ids: Optional[dict[UUID, UUID]] = None,
+    ) -> dict[UUID, int]:
+        """
+        Apply ``transfer`` of the same ``amount`` to several users without
+        committing: one set-based ``UPDATE ... RETURNING`` changes every balance
+        and one multi-row ``INSERT`` writes a journal per user.
+
+        Debits are guarded like in ``transfer``, so users that do not exist or
+        can not cover the debit are left out of the result and get no entries.
+
+        Returns:
+            dict[UUID, int]: New balances of the users that were changed
+        """
+        query = (
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(balance=User.balance + amount)
+            .returning(User.id, User.balance)
+        )
+        if amount < 0:
+            query = query.where(User.balance >= -amount)
+
+        result = await self.async_session.execute(query)
+        new_balances = {user_id: balance for user_id, balance in result.all()}
+        if not new_balances:
+            return new_balances
+
+        invoice_ids = invoice_ids or {}
+        entries = []
+        for user_id, new_balance in new_balances.items():
+            journal_id = uuid.uuid4()
+            references = {"invoice_id": invoice_ids.get(user_id)}
+            entries += [
+                {
+                    "journal_id": journal_id,
+                    "account": LedgerAccounts.USER.value,
+                    "user_id": user_id,
+                    "amount": amount,
+                    "balance_after": new_balance,
+                    "reason": reason.value,
+                    **references,
+                },
+                {
+                    "journal_id": journal_id,
+                    "account": counter_account.value,
+                    "user_id": None,
+                    "amount": -amount,
+                    "balance_after": None,
+                    "reason": reason.value,
+                    **references,
+                },
+            ]
+        await self.async_session.execute(insert(LedgerEntry).values(entries))
+
+        logger.debug(
+            f"Changed balances of {len(new_balances)} users by {amount} "
+            f"({reason.name})"
+        )
+        return new_balances
+
+    async def get_user_entries(
+        self, user_id: UUID, offset: int, limit: int
+    ) -> tuple[list[LedgerEntry], int]:
+        user_entries = select(LedgerEntry).where(
+            LedgerEntry.user_id == user_id,
+            LedgerEntry.account == LedgerAccounts.USER.value,
+        )
+        total = await self.async_session.scalar(
+            user_entries.with_only_columns(func.count())
+        )
+        result = await self.async_session.execute(
+            user_entries.order_by(LedgerEntry.created_at.desc(), LedgerEntry.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    async def get_balance_mismatches(
+        self, after_user_id: Optional[UUID], limit: int
+    ) -> tuple[list[Row], Optional[UUID]]:
+        """
+        Compare the balance snapshots of the next ``limit`` users, ordered by
+        id, with the sums of their ledger entries.
+
+        Returns:
+            tuple: ``(user_id, balance, ledger_balance)`` rows that do not match
+            and the id to continue after, or None when all users were checked
+        """
+        chunk = select(User.id, User.balance).order_by(User.id).limit(limit)
+        if after_user_id:
+            chunk = chunk.where(User.id > after_user_id)
+        chunk = chunk.subquery()
+
+        ledger_balance = func.coalesce(func.sum(LedgerEntry.amount), 0)
+        query = (
+            select(chunk.c.id, chunk.c.balance, ledger_balance)
+            .outerjoin(
+                LedgerEntry,
+                (LedgerEntry.user_id == chunk.c.id)
+                & (LedgerEntry.account == LedgerAccounts.USER.value),
+            )
+            .group_by(chunk.c.id, chunk.c.balance)
+            .order_by(chunk.c.id)
+        )
+        rows = (await self.async_session.execute(query)).all()
+
+        mismatches = [row for row in rows if row[1] != row[2]]
+        last_user_id = rows[-1][0] if len(rows) == limit else None
+        return mismatches, last_user_id
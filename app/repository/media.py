@@ -0,0 +1,20 @@
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.logs.logger import logger
+from app.models.media import ImageVariantSet
+from app.repository.base import BaseRepository
+
+
+class ImageVariantRepository(BaseRepository):
+    model = ImageVariantSet
+
+    async def add_variant_set(self, key: str) -> None:
+        """
+        Record that all variants of the image stored under ``key`` exist.
+        """
+        await self.async_session.execute(
+            insert(ImageVariantSet)
+            .values(key=key)
+            .on_conflict_do_nothing(index_elements=[ImageVariantSet.key])
+        )
+        logger.debug(f'Recorded image variants of "{key}"')
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from typing import Any, Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.logs.logger import logger
+from app.models.outbox import OutboxEvent
+from app.repository.base import BaseRepository
+
+
+class OutboxRepository(BaseRepository):
+    model = OutboxEvent
+
+    async def add_event(
+        self, event_type: str, payload: dict[str, Any], dedup_key: str
+    ) -> None:
+        """
+        Record an event in the current transaction without committing it.
+
+        An event whose ``dedup_key`` is already stored is silently ignored.
+        """
+        await self.async_session.execute(
+            insert(OutboxEvent)
+            .values(event_type=event_type, payload=payload, dedup_key=dedup_key)
+            .on_conflict_do_nothing(index_elements=[OutboxEvent.dedup_key])
+        )
+        logger.debug(f'Added outbox event "{event_type}" with key "{dedup_key}"')
+
+    async def claim_pending_events(
+        self, limit: int, max_attempts: int
+    ) -> list[OutboxEvent]:
+        """
+        Lock a batch of due events for the current transaction.
+
+        Rows locked by another dispatcher are skipped, so any number of
+        dispatchers can drain the outbox concurrently.
+        """
+        query = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.dispatched_at.is_(None),
+                OutboxEvent.available_at <= func.now(),
+                OutboxEvent.attempts < max_attempts,
+            )
+            .order_by(OutboxEvent.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.async_session.execute(query)
+        return list(result.scalars().all())
+
+    async def mark_dispatched(self, event_ids: Iterable[UUID]) -> None:
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+
+        await self.async_session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(dispatched_at=func.now())
+        )
+
+    async def mark_failed(
+        self, event_id: UUID, error: str, retry_in: timedelta
+    ) -> None:
+        await self.async_session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(
+                attempts=OutboxEvent.attempts + 1,
+                last_error=error,
+                available_at=func.now() + retry_in,
+            )
+        )
@@ -1,7 +1,7 @@
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import Select, asc, delete, desc, func, select
+from sqlalchemy import Select, asc, desc, func, select
 from sqlalchemy.orm import joinedload
 
 from app.models.post import ActivityCategoryPost, Post
@@ -74,7 +74,7 @@ class PostRepository(BaseRepository):
         """
         # Base query with relationships
         query = select(Post).options(
-            joinedload(Post.categories).joinedload(ActivityCategoryPost.category),
+            joinedload(Post.categories),
             joinedload(Post.user),
         )
 
@@ -100,13 +100,11 @@ class PostRepository(BaseRepository):
         self, post_id: UUID, with_user: bool = False, increment_views: bool = False
     ) -> Optional[Post]:
         query = select(Post).where(Post.id == post_id)
-        query = query.options(
-            joinedload(Post.categories).joinedload(ActivityCategoryPost.category)
-        )
+        query = query.options(joinedload(Post.categories))
         if with_user:
             query = query.options(joinedload(Post.user))
         post: Post = await self.get_instance(query)
-        if increment_views:
+        if post and increment_views:
             post.number_of_views += 1
             await self.save(post)
 
@@ -120,7 +118,7 @@ class PostRepository(BaseRepository):
             select(Post)
             .where(Post.user_id == user_id)
             .options(
-                joinedload(Post.categories).joinedload(ActivityCategoryPost.category),
+                joinedload(Post.categories),
                 joinedload(Post.user),
             )
         )
@@ -134,9 +132,16 @@ class PostRepository(BaseRepository):
     async def delete_post(self, post_id: UUID) -> bool:
         return await self.delete(post_id)
 
-    async def clean_activity_categories(self, post_id: UUID) -> None:
-        await self.async_session.execute(
-            delete(ActivityCategoryPost).where(ActivityCategoryPost.post_id == post_id)
+    async def sync_activity_categories(
+        self, post: Post, category_ids: Iterable[UUID | str]
+    ) -> bool:
+        changed = await self.sync_associations(
+            ActivityCategoryPost,
+            ActivityCategoryPost.post_id,
+            post.id,
+            ActivityCategoryPost.category_id,
+            {UUID(str(category_id)) for category_id in category_ids},
         )
-        await self.async_session.commit()
-        self.async_session.expire_all()
+        if changed:
+            self.async_session.expire(post, ["categories"])
+        return changed
@@ -0,0 +1,169 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Row,
+    case,
+    cast,
+    delete,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.logs.logger import logger
+from app.models.invoice import InvoiceStatus, LessonInvoice
+from app.models.stats import STATS_COUNTERS, UserDailyStats
+from app.repository.base import BaseRepository
+
+
+class StatsRepository(BaseRepository):
+    model = UserDailyStats
+
+    async def add_invoice_stats(
+        self, invoices: Iterable[LessonInvoice], status: InvoiceStatus, day: date
+    ) -> None:
+        """
+        Count invoices that changed to ``status`` on ``day`` into the rollups of
+        their mentors and mentees, without committing.
+
+        Increments are summed per user first, because one upsert may not
+        update the same row twice.
+        """
+        increments: dict[UUID, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(STATS_COUNTERS, 0)
+        )
+        for invoice in invoices:
+            if status == InvoiceStatus.PAID:
+                increments[invoice.mentor_id]["earned"] += invoice.amount
+                increments[invoice.mentor_id]["lessons_given"] += 1
+                increments[invoice.mentee_id]["spent"] += invoice.amount
+                increments[invoice.mentee_id]["lessons_taken"] += 1
+            elif status == InvoiceStatus.CANCELLED:
+                increments[invoice.mentor_id]["cancelled_lessons"] += 1
+                increments[invoice.mentee_id]["cancelled_lessons"] += 1
+
+        if not increments:
+            return
+
+        query = insert(UserDailyStats).values(
+            [
+                {"user_id": user_id, "day": day, **counters}
+                for user_id, counters in increments.items()
+            ]
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[UserDailyStats.user_id, UserDailyStats.day],
+            set_={
+                counter: getattr(UserDailyStats, counter)
+                + getattr(query.excluded, counter)
+                for counter in STATS_COUNTERS
+            },
+        )
+        await self.async_session.execute(query)
+
+    async def get_user_stats(
+        self, user_id: UUID, period: str, date_from: date, date_to: date
+    ) -> list[Row]:
+        """
+        Sum the user's daily rollups between ``date_from`` and ``date_to``
+        (inclusive) into ``day``, ``week`` or ``month`` buckets.
+        """
+        period_start = cast(
+            func.date_trunc(period, cast(UserDailyStats.day, DateTime)), Date
+        ).label("period_start")
+        query = (
+            select(
+                period_start,
+                *(
+                    func.sum(getattr(UserDailyStats, counter)).label(counter)
+                    for counter in STATS_COUNTERS
+                ),
+            )
+            .where(
+                UserDailyStats.user_id == user_id,
+                UserDailyStats.day.between(date_from, date_to),
+            )
+            # Grouped by the output name, the bound period would differ otherwise
+            .group_by(literal_column("period_start"))
+            .order_by(literal_column("period_start"))
+        )
+        return (await self.async_session.execute(query)).all()
+
+    async def rebuild_stats(self, since: Optional[date] = None) -> int:
+        """
+        Recompute the rollups of every day from ``since`` on, or of all days,
+        from ``lesson_invoices`` without committing.
+
+        The table is locked against concurrent increments until the caller
+        commits, so invoices changing meanwhile are counted exactly once.
+        Invoices are counted on the UTC day of their last update, which is when
+        they were paid or cancelled.
+
+        Returns:
+            int: Number of rollup rows written
+        """
+        await self.async_session.execute(
+            text("LOCK TABLE user_daily_stats IN EXCLUSIVE MODE")
+        )
+
+        day = cast(func.timezone("UTC", LessonInvoice.updated_at), Date)
+        paid = LessonInvoice.status == InvoiceStatus.PAID.value
+        cancelled = LessonInvoice.status == InvoiceStatus.CANCELLED.value
+        amount_if_paid = case((paid, LessonInvoice.amount), else_=0)
+        one_if_paid = case((paid, 1), else_=0)
+        one_if_cancelled = case((cancelled, 1), else_=0)
+
+        mentor_stats = select(
+            LessonInvoice.mentor_id.label("user_id"),
+            day.label("day"),
+            amount_if_paid.label("earned"),
+            one_if_paid.label("lessons_given"),
+            literal(0).label("spent"),
+            literal(0).label("lessons_taken"),
+            one_if_cancelled.label("cancelled_lessons"),
+        )
+        mentee_stats = select(
+            LessonInvoice.mentee_id.label("user_id"),
+            day.label("day"),
+            literal(0).label("earned"),
+            literal(0).label("lessons_given"),
+            amount_if_paid.label("spent"),
+            one_if_paid.label("lessons_taken"),
+            one_if_cancelled.label("cancelled_lessons"),
+        )
+
+        changed_invoices = LessonInvoice.status.in_(
+            [InvoiceStatus.PAID.value, InvoiceStatus.CANCELLED.value]
+        )
+        clear_query = delete(UserDailyStats)
+        if since:
+            changed_invoices = changed_invoices & (day >= since)
+            clear_query = clear_query.where(UserDailyStats.day >= since)
+
+        invoice_stats = union_all(
+            mentor_stats.where(changed_invoices), mentee_stats.where(changed_invoices)
+        ).subquery()
+        rollups = select(
+            invoice_stats.c.user_id,
+            invoice_stats.c.day,
+            *(func.sum(invoice_stats.c[counter]) for counter in STATS_COUNTERS),
+        ).group_by(invoice_stats.c.user_id, invoice_stats.c.day)
+
+        await self.async_session.execute(clear_query)
+        result = await self.async_session.execute(
+            insert(UserDailyStats).from_select(
+                ["user_id", "day", *STATS_COUNTERS], rollups
+            )
+        )
+
+        logger.debug(f"Rebuilt {result.rowcount} daily stats rows since {since}")
+        return result.rowcount
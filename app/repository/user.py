@@ -1,11 +1,19 @@
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
+from uuid import UUID
 
 from pydantic import EmailStr
-from sqlalchemy import delete, select
+from sqlalchemy import Row, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import joinedload
 
 from app.config.logs.logger import logger
-from app.models.user import ActivityCategoryUser, User
+from app.models.user import (
+    ActivityCategoryUser,
+    MentorVerificationStatus,
+    ServiceTypes,
+    User,
+    UserVerification,
+)
 from app.repository.base import BaseRepository
 
 
@@ -26,11 +34,7 @@ class UserRepository(BaseRepository):
         query = (
             select(User)
             .where(User.id == user_id)
-            .options(
-                joinedload(User.activity_categories).joinedload(
-                    ActivityCategoryUser.category
-                )
-            )
+            .options(joinedload(User.activity_categories))
         )
         result: Optional[User] = await self.get_instance(query)
         if result:
@@ -41,11 +45,7 @@ class UserRepository(BaseRepository):
         query = (
             select(User)
             .where(User.email == email)
-            .options(
-                joinedload(User.activity_categories).joinedload(
-                    ActivityCategoryUser.category
-                )
-            )
+            .options(joinedload(User.activity_categories))
         )
         result: Optional[User] = await self.get_instance(query)
         if result:
@@ -59,10 +59,138 @@ class UserRepository(BaseRepository):
             logger.debug(f'Retrieved user id by email "{email}": "{result}"')
         return result
 
+    async def get_balances(
+        self, user_ids: Iterable[UUID], for_update: bool = False
+    ) -> dict[UUID, int]:
+        """
+        Get the balances of several users with one query, optionally locking
+        them in id order so concurrent batches can not deadlock.
+        """
+        query = (
+            select(User.id, User.balance)
+            .where(User.id.in_(list(user_ids)))
+            .order_by(User.id)
+        )
+        if for_update:
+            query = query.with_for_update()
+        result = await self.async_session.execute(query)
+        return {user_id: balance for user_id, balance in result.all()}
+
+    async def get_contacts(self, user_ids: Iterable[UUID]) -> dict[UUID, Row]:
+        """
+        Get ``(id, email, name)`` of several users with one query.
+        """
+        query = select(User.id, User.email, User.name).where(
+            User.id.in_(list(user_ids))
+        )
+        result = await self.async_session.execute(query)
+        return {row.id: row for row in result.all()}
+
+    async def apply_verifications(self, verification_ids: Iterable[UUID]) -> None:
+        """
+        Copy the profile fields of approved verifications to their users and
+        mark them verified with one ``UPDATE ... FROM``.
+        """
+        await self.async_session.execute(
+            update(User)
+            .where(
+                User.id == UserVerification.user_id,
+                UserVerification.id.in_(list(verification_ids)),
+            )
+            .values(
+                verification_status=MentorVerificationStatus.VERIFIED.value,
+                id_card_photo=UserVerification.id_card_photo,
+                about_me_text=UserVerification.about_me_text,
+                about_me_video_link=UserVerification.about_me_video_link,
+                cv_link=UserVerification.cv_link,
+                service_price=UserVerification.service_price,
+                service_price_type=UserVerification.service_price_type,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def set_verification_status(
+        self, user_ids: Iterable[UUID], verification_status: MentorVerificationStatus
+    ) -> None:
+        await self.async_session.execute(
+            update(User)
+            .where(User.id.in_(list(user_ids)))
+            .values(verification_status=verification_status.value)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def replace_activity_categories(
+        self,
+        category_ids_by_user: dict[UUID, Iterable[UUID | str]],
+        category_type: ServiceTypes,
+    ) -> None:
+        """
+        Replace the activity categories of several users with one DELETE and one
+        multi-row INSERT, leaving each user with the given categories of
+        ``category_type`` only.
+        """
+        await self.async_session.execute(
+            delete(ActivityCategoryUser).where(
+                ActivityCategoryUser.user_id.in_(list(category_ids_by_user))
+            )
+        )
+
+        rows = [
+            {
+                "user_id": user_id,
+                "category_id": category_id,
+                "type": category_type.value,
+            }
+            for user_id, category_ids in category_ids_by_user.items()
+            for category_id in {UUID(str(category_id)) for category_id in category_ids}
+        ]
+        if rows:
+            await self.async_session.execute(
+                insert(ActivityCategoryUser).values(rows).on_conflict_do_nothing()
+            )
+        logger.debug(
+            f"Replaced activity categories of {len(category_ids_by_user)} users"
+        )
+
     async def exists_by_email(self, email: EmailStr) -> bool:
         query = select(User).where(User.email == email)
         return await self.exists(query)
 
+    async def get_category_members(
+        self,
+        category_ids: Iterable[UUID],
+        after_user_id: Optional[UUID],
+        limit: int,
+        category_type: ServiceTypes = ServiceTypes.SEEKING,
+        exclude_user_id: Optional[UUID] = None,
+    ) -> tuple[list[Row], Optional[UUID]]:
+        """
+        Read ``(email, name)`` of the next ``limit`` users, ordered by id, who
+        are linked to any of the categories.
+
+        Returns:
+            tuple: The rows and the id to continue after, or None when there
+            are no more members
+        """
+        members = select(ActivityCategoryUser.user_id).where(
+            ActivityCategoryUser.category_id.in_(list(category_ids)),
+            ActivityCategoryUser.type == category_type.value,
+        )
+        query = (
+            select(User.id, User.email, User.name)
+            .where(User.id.in_(members))
+            .order_by(User.id)
+            .limit(limit)
+        )
+        if after_user_id:
+            query = query.where(User.id > after_user_id)
+        if exclude_user_id:
+            query = query.where(User.id != exclude_user_id)
+
+        rows = (await self.async_session.execute(query)).all()
+        last_user_id = rows[-1].id if len(rows) == limit else None
+        return [(row.email, row.name) for row in rows], last_user_id
+
     async def update_user(self, user_id: int, user_data) -> User:
         updated_user = await self.update(user_id, user_data)
 
@@ -75,8 +203,22 @@ class UserRepository(BaseRepository):
         logger.debug(f'Successfully deleted user "{result}" from the database')
         return result
 
-    async def clean_activity_categories(self, user_id: int) -> None:
-        await self.async_session.execute(
-            delete(ActivityCategoryUser).where(ActivityCategoryUser.user_id == user_id)
+    async def sync_activity_categories(
+        self,
+        user: User,
+        category_ids: Iterable[UUID | str],
+        category_type: ServiceTypes = ServiceTypes.SEEKING,
+    ) -> bool:
+        changed = await self.sync_associations(
+            ActivityCategoryUser,
+            ActivityCategoryUser.user_id,
+            user.id,
+            ActivityCategoryUser.category_id,
+            {UUID(str(category_id)) for category_id in category_ids},
+            type=category_type.value,
         )
-        await self.async_session.commit()
+        if changed:
+            # Reloaded by the next joinedload query instead of serving stale rows
+            self.async_session.expire(user, ["activity_categories"])
+            logger.debug(f'Synchronized activity categories of user "{user.id}"')
+        return changed
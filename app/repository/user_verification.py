@@ -1,26 +1,89 @@
-from typing import Optional
+from datetime import datetime
+from typing import Iterable, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, or_, select, tuple_, update
 
-from app.models.user import User, UserVerification
+from app.models.user import User, UserVerification, UserVerificationStatus
 from app.repository.base import BaseRepository
 from app.schemas.user_verification import (
     UserVerificationCreateSchema,
     UserVerificationUpdate,
 )
 
+# Columns of list responses, without the JSONB categories and media fields
+VERIFICATION_LIST_COLUMNS = (
+    UserVerification.id,
+    UserVerification.user_id,
+    UserVerification.status,
+    UserVerification.service_price,
+    UserVerification.service_price_type,
+    UserVerification.admin_id,
+    UserVerification.claim_expires_at,
+    UserVerification.created_at,
+)
+
 
 class UserVerificationRepository(BaseRepository):
     model = UserVerification
 
     async def get_verifications(
-        self, status: Optional[str] = None
-    ) -> list[UserVerification]:
-        query = select(UserVerification)
+        self,
+        status: Optional[str],
+        limit: int,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[Row]:
+        """
+        Get a page of verifications ordered by ``(created_at, id)``, oldest
+        first, starting after the ``after`` key.
+        """
+        query = select(*VERIFICATION_LIST_COLUMNS)
         if status:
             query = query.where(UserVerification.status == status)
-        return await self.get_many(query)
+        if after:
+            query = query.where(
+                tuple_(UserVerification.created_at, UserVerification.id)
+                > tuple_(*after)
+            )
+
+        query = query.order_by(UserVerification.created_at, UserVerification.id).limit(
+            limit
+        )
+        return (await self.async_session.execute(query)).all()
+
+    async def claim_pending_verifications(
+        self, admin_id: UUID, limit: int, now: datetime, lease_until: datetime
+    ) -> list[Row]:
+        """
+        Claim the oldest ``limit`` pending verifications that are not leased
+        to another admin until ``lease_until``, without committing.
+
+        Verifications the admin already holds are renewed and returned again.
+        Rows another admin is claiming at the same moment are skipped rather
+        than waited for, so concurrent admins always get disjoint batches.
+        """
+        claimable = (
+            select(UserVerification.id)
+            .where(
+                UserVerification.status == UserVerificationStatus.PENDING.value,
+                or_(
+                    UserVerification.claim_expires_at.is_(None),
+                    UserVerification.claim_expires_at <= now,
+                    UserVerification.admin_id == admin_id,
+                ),
+            )
+            .order_by(UserVerification.created_at, UserVerification.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(UserVerification)
+            .where(UserVerification.id.in_(claimable.scalar_subquery()))
+            .values(admin_id=admin_id, claim_expires_at=lease_until)
+            .returning(*VERIFICATION_LIST_COLUMNS)
+        )
+        rows = (await self.async_session.execute(query)).all()
+        return sorted(rows, key=lambda row: (row.created_at, row.id))
 
     async def create_verification(
         self, verification_data: UserVerificationCreateSchema
@@ -29,13 +92,40 @@ class UserVerificationRepository(BaseRepository):
         return user_verification
 
     async def get_verification_by_id(
-        self, verification_id: UUID
+        self, verification_id: UUID, for_update: bool = False
     ) -> Optional[UserVerification]:
         query = select(UserVerification).where(UserVerification.id == verification_id)
+        if for_update:
+            query = query.with_for_update()
         result: Optional[User] = await self.get_instance(query)
 
         return result
 
+    async def get_verifications_by_ids(
+        self, verification_ids: Iterable[UUID], for_update: bool = False
+    ) -> list[UserVerification]:
+        query = (
+            select(UserVerification)
+            .where(UserVerification.id.in_(list(verification_ids)))
+            .order_by(UserVerification.id)
+        )
+        if for_update:
+            query = query.with_for_update()
+        return await self.get_many(query)
+
+    async def set_review_status(
+        self, verification_ids: Iterable[UUID], status: str, admin_id: UUID
+    ) -> None:
+        """
+        Mark verifications as reviewed by ``admin_id`` with one UPDATE, releasing
+        their claims.
+        """
+        await self.async_session.execute(
+            update(UserVerification)
+            .where(UserVerification.id.in_(list(verification_ids)))
+            .values(status=status, admin_id=admin_id, claim_expires_at=None)
+        )
+
     async def get_by_user_id(self, user_id: UUID) -> list[UserVerification]:
         result = await self.get_many(
             select(UserVerification).where(UserVerification.user_id == user_id)
@@ -45,22 +135,21 @@ class UserVerificationRepository(BaseRepository):
     async def update_verification(
         self, verification_id: UUID, verification: UserVerificationUpdate
     ) -> Optional[UserVerification]:
-        db_verification = await self.get_by_id(verification_id)
+        db_verification = await self.get_verification_by_id(verification_id)
         if not db_verification:
             return None
 
         for field, value in verification.model_dump(exclude_unset=True).items():
             setattr(db_verification, field, value)
 
-        await self.session.commit()
-        await self.session.refresh(db_verification)
+        await self.save(db_verification)
         return db_verification
 
     async def delete(self, verification_id: UUID) -> bool:
-        db_verification = await self.get_by_id(verification_id)
+        db_verification = await self.get_verification_by_id(verification_id)
         if not db_verification:
             return False
 
-        await self.session.delete(db_verification)
-        await self.session.commit()
+        await self.async_session.delete(db_verification)
+        await self.async_session.flush()
         return True
@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -21,10 +22,10 @@ class ActivityCategoryFullSchema(ActivityCategoryBase):
 
 class ActivityCategoryUserSchema(BaseModel):
     id: UUID
-    title: str
+    title: Optional[str] = None
     type: str
 
 
 class ActivityCategoryPostSchema(BaseModel):
     id: UUID
-    title: str
+    title: Optional[str] = None
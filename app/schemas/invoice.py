@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 
 
 class InvoiceStatus(str, Enum):
@@ -21,7 +21,24 @@ class InvoiceBase(BaseModel):
 
 
 class InvoiceCreate(InvoiceBase):
-    pass
+    amount: int = Field(..., gt=0)
+
+
+class InvoiceBatchCreate(BaseModel):
+    """One group lesson billed to every mentee taking part in it."""
+
+    mentor_id: UUID
+    mentee_ids: list[UUID] = Field(..., min_length=1, max_length=100)
+    amount: int = Field(..., gt=0)
+    description: Optional[str] = None
+    due_date: datetime
+
+    @field_validator("mentee_ids")
+    @classmethod
+    def validate_unique_mentee_ids(cls, value):
+        if len(set(value)) != len(value):
+            raise ValueError("Mentee ids must be unique")
+        return value
 
 
 class InvoiceUpdate(BaseModel):
@@ -29,6 +46,14 @@ class InvoiceUpdate(BaseModel):
     cancellation_reason: Optional[str] = None
 
 
+class InvoiceFilter(BaseModel):
+    """Filter options for invoice listings."""
+
+    status: Optional[InvoiceStatus] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+
+
 class InvoiceResponse(InvoiceBase):
     id: UUID
     status: InvoiceStatus
@@ -38,3 +63,8 @@ class InvoiceResponse(InvoiceBase):
 
     class Config:
         from_attributes = True
+
+
+class InvoicePaginatedResponse(BaseModel):
+    items: list[InvoiceResponse]
+    next_cursor: Optional[str] = None
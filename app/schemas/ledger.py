@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.ledger import LedgerReasons
+
+
+class LedgerEntrySchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    amount: int
+    balance_after: int
+    reason: LedgerReasons
+    invoice_id: Optional[UUID] = None
+    transaction_id: Optional[UUID] = None
+    created_at: datetime
+
+
+class LedgerPaginatedResponse(BaseModel):
+    items: list[LedgerEntrySchema]
+    total: int
+    page: int
+    per_page: int
+    total_pages: int
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.core.activity_categories import activity_category_catalog
 from app.models.post import Post
 from app.models.user import ServiceTypes
 from app.schemas.activity_category import ActivityCategoryPostSchema
@@ -53,7 +54,9 @@ class PostSchema(PostBase):
                 [
                     ActivityCategoryPostSchema(
                         id=category_post.category_id,
-                        title=category_post.category.title,
+                        title=activity_category_catalog.get_title(
+                            category_post.category_id
+                        ),
                     )
                     for category_post in obj.categories
                 ]
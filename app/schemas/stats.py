@@ -0,0 +1,32 @@
+from datetime import date
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
+
+
+class StatsPeriods(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class EarningsStats(BaseModel):
+    earned: int = 0
+    lessons_given: int = 0
+    spent: int = 0
+    lessons_taken: int = 0
+    cancelled_lessons: int = 0
+
+
+class EarningsStatsBucket(EarningsStats):
+    model_config = ConfigDict(from_attributes=True)
+
+    period_start: date
+
+
+class EarningsStatsResponse(BaseModel):
+    period: StatsPeriods
+    date_from: date
+    date_to: date
+    items: list[EarningsStatsBucket]
+    totals: EarningsStats
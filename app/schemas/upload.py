@@ -0,0 +1,38 @@
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+UploadField = Literal[
+    "profile_picture", "id_card_photo", "about_me_video_link", "cv_link"
+]
+
+
+class PresignedUploadInput(BaseModel):
+    field: UploadField
+    content_type: str
+
+
+class PresignedUploadResponse(BaseModel):
+    key: str
+    url: str
+    fields: dict[str, str]
+    expires_in: int
+
+
+class UploadConfirmInput(BaseModel):
+    field: UploadField
+    key: str
+
+
+class UploadConfirmResponse(BaseModel):
+    key: str
+    field: UploadField
+    content_type: str
+    size: int
+
+
+class UploadProgressResponse(BaseModel):
+    upload_id: UUID
+    uploaded: int
+    total: Optional[int] = None
@@ -3,11 +3,19 @@ from typing import Literal, Optional, Self
 from uuid import UUID
 
 from fastapi import UploadFile
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import (
+    BaseModel,
+    EmailStr,
+    Field,
+    computed_field,
+    field_serializer,
+    field_validator,
+)
 
-from app.config.settings.base import settings
+from app.core.activity_categories import activity_category_catalog
 from app.models.user import ServicePriceTypes, User
 from app.schemas.activity_category import ActivityCategoryUserSchema
+from app.utilities.media_urls import get_image_variant_urls, media_url_signer
 from app.utilities.validation import (
     validate_name,
     validate_password,
@@ -16,18 +24,16 @@ from app.utilities.validation import (
 
 
 class S3UrlMixin(BaseModel):
-    @field_validator(
+    @field_serializer(
         "profile_picture",
         "id_card_photo",
         "about_me_video_link",
         "cv_link",
-        mode="before",
         check_fields=False,
     )
-    @classmethod
-    def adjust_file_url(cls, value):
-        if value is not None:
-            return f"{settings.AWS_S3_ENDPOINT}/{value}"
+    def serialize_file_url(self, value):
+        if isinstance(value, str):
+            return media_url_signer.get_url(value)
 
 
 class UserBaseSchema(S3UrlMixin):
@@ -37,6 +43,9 @@ class UserBaseSchema(S3UrlMixin):
     name: str
     profile_picture: Optional[str] = None
     id_card_photo: Optional[str] = None
+    # Variants are linked only once they have all been generated
+    profile_picture_has_variants: bool = Field(default=False, exclude=True)
+    id_card_photo_has_variants: bool = Field(default=False, exclude=True)
     verification_status: Literal["PD", "UV", "VR"]
     balance: int
     cv_link: Optional[str] = None
@@ -50,6 +59,20 @@ class UserBaseSchema(S3UrlMixin):
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
+    @property
+    def profile_picture_variants(self) -> Optional[dict[str, dict[str, str]]]:
+        return get_image_variant_urls(
+            self.profile_picture, self.profile_picture_has_variants
+        )
+
+    @computed_field
+    @property
+    def id_card_photo_variants(self) -> Optional[dict[str, dict[str, str]]]:
+        return get_image_variant_urls(
+            self.id_card_photo, self.id_card_photo_has_variants
+        )
+
 
 class UserFullSchema(UserBaseSchema):
     activity_categories: list[ActivityCategoryUserSchema]
@@ -66,7 +89,9 @@ class UserFullSchema(UserBaseSchema):
                     ActivityCategoryUserSchema(
                         id=category_user.category_id,
                         type=category_user.type,
-                        title=category_user.category.title,
+                        title=activity_category_catalog.get_title(
+                            category_user.category_id
+                        ),
                     )
                     for category_user in obj.activity_categories
                 ]
@@ -86,7 +111,6 @@ class UserUpdateSchema(BaseModel):
     latitude: Optional[str] = None
     id_card_photo: Optional[UploadFile | str] = None
     is_verified: Optional[bool] = None
-    balance: Optional[int] = None
     cv_file: Optional[UploadFile | str] = None
     about_me_text: Optional[str] = None
     about_me_video_file: Optional[UploadFile | str] = None
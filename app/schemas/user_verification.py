@@ -4,7 +4,7 @@ from typing import Literal, Optional
 from uuid import UUID
 
 from fastapi import UploadFile
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.schemas.user import S3UrlMixin
 
@@ -34,6 +34,42 @@ class UserVerificationSchema(UserVerificationCreateSchema, S3UrlMixin):
         from_attributes = True
 
 
+class UserVerificationListItemSchema(BaseModel):
+    """Verification as shown in lists, without categories and media."""
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    status: Literal["PD", "AP", "DC"]
+    service_price: Optional[float] = None
+    service_price_type: Optional[Literal["PH", "PL"]] = None
+    admin_id: Optional[uuid.UUID] = None
+    claim_expires_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class UserVerificationPaginatedResponse(BaseModel):
+    items: list[UserVerificationListItemSchema]
+    next_cursor: Optional[str] = None
+
+
+class UserVerificationBulkApprove(BaseModel):
+    verification_ids: list[uuid.UUID] = Field(..., min_length=1, max_length=100)
+
+    @field_validator("verification_ids")
+    @classmethod
+    def validate_unique_verification_ids(cls, value):
+        if len(set(value)) != len(value):
+            raise ValueError("Verification ids must be unique")
+        return value
+
+
+class UserVerificationBulkDecline(UserVerificationBulkApprove):
+    reason: str
+
+
 class UserVerificationUpdate(BaseModel):
     status: Optional[str] = Field(None, max_length=2)
     admin_id: Optional[UUID] = None
@@ -1,11 +1,25 @@
-from typing import Optional
+import asyncio
+import os
+from itertools import chain
+from typing import Any, Iterable, Optional
 from uuid import UUID
 
-from fastapi import HTTPException, UploadFile, status
+from fastapi import BackgroundTasks, HTTPException, UploadFile, status
 from pydantic import BaseModel
 
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+from app.core.tasks import create_image_variants
 from app.repository.base import BaseRepository
-from app.utilities.s3 import upload_file_to_s3_async
+from app.utilities.formatters import error_wrapper
+from app.utilities.images import IMAGE_VARIANT_FIELDS
+from app.utilities.media_urls import get_media_keys, media_url_signer
+from app.utilities.s3 import (
+    UPLOAD_FIELD_RULES,
+    delete_file_from_s3_async,
+    head_file_in_s3_async,
+    upload_content_addressed_file_async,
+)
 
 
 class BaseService:
@@ -18,19 +32,130 @@ class BaseService:
                 detail=f"{repository.model.__name__} is not found",
             )
 
+    async def _prefetch_media_urls(self, instances: Iterable[Any]) -> None:
+        """
+        Sign the media URLs of a whole list at once before it is serialized.
+        """
+        await media_url_signer.prefetch(
+            chain.from_iterable(get_media_keys(instance) for instance in instances)
+        )
+
+    async def _verify_uploaded_file(
+        self, user_id: UUID, field_name: str, key: str
+    ) -> dict[str, Any]:
+        rule = UPLOAD_FIELD_RULES.get(field_name)
+        if not rule or not key.startswith(f"{user_id}/{field_name}/"):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                detail=f"File key is not valid for the {field_name} field",
+            )
+
+        metadata = await head_file_in_s3_async(key)
+        if not metadata:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST, detail="File has not been uploaded"
+            )
+
+        content_type = metadata.get("ContentType", "")
+        if not any(content_type.startswith(t) for t in rule.content_types):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type for the {field_name} field: {content_type}",
+            )
+        if metadata["ContentLength"] > rule.max_size:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                detail=f"File is too large for the {field_name} field",
+            )
+
+        return metadata
+
     async def _upload_files_to_s3(
         self,
         data: BaseModel,
         upload_tasks: tuple[str, ...],
+        user_id: Optional[UUID] = None,
+        background_tasks: Optional[BackgroundTasks] = None,
     ) -> None:
-        user_id: UUID = getattr(data, "user_id", None) or getattr(data, "id", None)
+        """
+        Upload the files attached to ``data`` and replace them with their S3 keys.
+
+        Files are stored under ``{user_id}/{field}/{sha256}.{ext}``, so content
+        that is already stored is not uploaded again. String values are keys of
+        files the client has already uploaded with a presigned request; they are
+        only verified. When ``background_tasks`` is given, resized variants of
+        newly uploaded images are generated after the response is sent.
+        """
+        user_id = user_id or getattr(data, "user_id", None) or getattr(data, "id", None)
+        semaphore = asyncio.Semaphore(settings.AWS_S3_UPLOAD_CONCURRENCY)
+
+        async def upload(
+            field_name: str, filename: str, file_obj: UploadFile | str
+        ) -> tuple[str, bool]:
+            if isinstance(file_obj, str):
+                await self._verify_uploaded_file(user_id, field_name, file_obj)
+                return file_obj, False
 
+            async with semaphore:
+                return await upload_content_addressed_file_async(
+                    file_obj,
+                    f"{user_id}/{field_name}",
+                    os.path.splitext(filename)[1],
+                    file_obj.content_type,
+                )
+
+        files_to_upload: list[tuple[str, str, UploadFile | str]] = []
         for field_name, filename in upload_tasks:
             file_obj: Optional[UploadFile | str] = getattr(data, field_name, None)
             if file_obj:
-                uploaded_url = await upload_file_to_s3_async(
-                    file_obj,
-                    f"{user_id}/{filename}",
-                    file_obj.content_type,
+                files_to_upload.append((field_name, filename, file_obj))
+
+        results = await asyncio.gather(
+            *(upload(*file_to_upload) for file_to_upload in files_to_upload),
+            return_exceptions=True,
+        )
+
+        uploaded_urls: dict[str, str] = {}
+        created_urls: dict[str, str] = {}
+        errors: list[dict] = []
+        for (field_name, _, _), result in zip(files_to_upload, results):
+            if isinstance(result, BaseException):
+                message = (
+                    result.detail if isinstance(result, HTTPException) else str(result)
                 )
-                setattr(data, field_name, uploaded_url)
+                errors.append(error_wrapper(message, field_name))
+                continue
+
+            uploaded_url, created = result
+            uploaded_urls[field_name] = uploaded_url
+            if created:
+                created_urls[field_name] = uploaded_url
+
+        if errors:
+            # Only roll back objects created by this call; existing content and
+            # presigned uploads may already be referenced elsewhere
+            uploaded_in_batch = list(created_urls.values())
+            logger.warning(
+                f"Failed to upload {len(errors)} file(s) to S3, rolling back "
+                f"{len(uploaded_in_batch)} uploaded file(s)"
+            )
+            await asyncio.gather(
+                *(delete_file_from_s3_async(url) for url in uploaded_in_batch),
+                return_exceptions=True,
+            )
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=errors)
+
+        presigned_fields = {
+            field_name
+            for field_name, _, file_obj in files_to_upload
+            if isinstance(file_obj, str)
+        }
+        for field_name, uploaded_url in uploaded_urls.items():
+            setattr(data, field_name, uploaded_url)
+
+            if (
+                background_tasks
+                and field_name in IMAGE_VARIANT_FIELDS
+                and (field_name in created_urls or field_name in presigned_fields)
+            ):
+                background_tasks.add_task(create_image_variants, uploaded_url)
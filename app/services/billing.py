@@ -1,47 +1,109 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
 import stripe
 from fastapi import HTTPException, Request
 
 from app.config.logs.logger import logger
 from app.config.settings.base import settings
+from app.core.database import redis
+from app.core.stripe_client import stripe_client
+from app.core.tasks import process_stripe_events
+from app.models.ledger import LedgerAccounts, LedgerReasons
+from app.models.payment import StripeWebhookEvent
 from app.models.user import User
+from app.repository.billing import BillingRepository
+from app.repository.ledger import LedgerRepository
 from app.repository.user import UserRepository
 from app.services.base import BaseService
 
+# How long processed Stripe event ids are remembered in Redis, Stripe stops
+# retrying a webhook after three days
+STRIPE_EVENT_TTL = 7 * 24 * 3600
+
+# Stripe event types the webhook queues, every other event is acknowledged and
+# dropped
+STRIPE_HANDLED_EVENTS = {"checkout.session.completed"}
+
+# A cached checkout session is dropped this long before Stripe expires it
+CHECKOUT_EXPIRY_MARGIN = 300
+CHECKOUT_LOCK_TTL = 30
+
+stripe.api_key = settings.STRIPE_SECRET_KEY
+
+
+def get_checkout_session_cache_key(user_id: UUID, credits_amount: int) -> str:
+    return f"checkout_session:{user_id}:{credits_amount}"
+
 
 class BillingService(BaseService):
-    def __init__(self, user_repository: UserRepository) -> None:
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        billing_repository: BillingRepository,
+        ledger_repository: LedgerRepository,
+    ) -> None:
         self.user_repository = user_repository
+        self.billing_repository = billing_repository
+        self.ledger_repository = ledger_repository
         self.stripe_price_ids = {
             25: settings.STRIPE_25_CREDITS_PRICE_ID,
             200: settings.STRIPE_200_CREDITS_PRICE_ID,
             500: settings.STRIPE_500_CREDITS_PRICE_ID,
         }
 
-    stripe.api_key = settings.STRIPE_SECRET_KEY
-
     async def create_checkout_session(
         self, credits_amount: int, current_user: User
     ) -> dict[str, str]:
+        price_id = self.stripe_price_ids.get(credits_amount)
+        if not price_id:
+            raise HTTPException(status_code=400, detail="Unknown credits pack")
+
+        # Reuse the open session of the same pack, e.g. on double clicks
+        cache_key = get_checkout_session_cache_key(current_user.id, credits_amount)
+        if session_id := await redis.get(cache_key):
+            return {"session_id": session_id}
+
+        lock_key = f"{cache_key}:lock"
+        if not await redis.set(lock_key, 1, nx=True, ex=CHECKOUT_LOCK_TTL):
+            # A concurrent request for the same pack is creating the session
+            for _ in range(CHECKOUT_LOCK_TTL * 5):
+                await asyncio.sleep(0.2)
+                if session_id := await redis.get(cache_key):
+                    return {"session_id": session_id}
+            raise HTTPException(
+                status_code=409, detail="Checkout session is already being created"
+            )
+
         try:
-            checkout_session = stripe.checkout.Session.create(
-                payment_method_types=["card"],
-                mode="payment",
-                line_items=[
-                    {
-                        "price": self.stripe_price_ids[credits_amount],
-                        "quantity": 1,
-                    }
-                ],
-                success_url=f"{settings.WEB_URL}/en/profile",
-                cancel_url=f"{settings.WEB_URL}/en/profile",
-                metadata={
-                    "app_email": current_user.email,
-                    "credits_amount": credits_amount,
-                },
+            checkout_session = await stripe_client.create_checkout_session(
+                {
+                    "payment_method_types": ["card"],
+                    "mode": "payment",
+                    "line_items": [{"price": price_id, "quantity": 1}],
+                    "success_url": f"{settings.WEB_URL}/en/profile",
+                    "cancel_url": f"{settings.WEB_URL}/en/profile",
+                    "expires_at": int(time.time())
+                    + settings.STRIPE_CHECKOUT_SESSION_TTL,
+                    "metadata": {
+                        "app_email": current_user.email,
+                        "credits_amount": str(credits_amount),
+                    },
+                }
             )
-            return {"session_id": checkout_session["id"]}
-        except Exception as e:
+            await redis.set(
+                cache_key,
+                checkout_session.id,
+                ex=settings.STRIPE_CHECKOUT_SESSION_TTL - CHECKOUT_EXPIRY_MARGIN,
+            )
+            return {"session_id": checkout_session.id}
+        except stripe.StripeError as e:
             raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            await redis.delete(lock_key)
 
     async def handle_stripe_webhook(self, request: Request) -> None:
         payload = await request.body()
@@ -55,19 +117,82 @@ class BillingService(BaseService):
         except stripe.error.SignatureVerificationError:
             raise HTTPException(status_code=400, detail="Invalid signature")
 
-        if event["type"] == "checkout.session.completed":
-            session = event["data"]["object"]
+        if event["type"] not in STRIPE_HANDLED_EVENTS:
+            return
+
+        # Fast path for Stripe retries, the primary key of the queued event and
+        # the unique constraint on the transaction are what actually guarantee a
+        # single credit
+        event_key = f"stripe_event:{event['id']}"
+        if not await redis.set(event_key, 1, nx=True, ex=STRIPE_EVENT_TTL):
+            logger.info(f'Skipping already received Stripe event "{event["id"]}"')
+            return
+
+        try:
+            event_object = event["data"]["object"]
+            await self.billing_repository.add_webhook_event(
+                event["id"],
+                event["type"],
+                customer_key=(
+                    (event_object.get("metadata") or {}).get("app_email")
+                    or event_object.get("customer")
+                    or event["id"]
+                ),
+                payload=json.loads(payload),
+                stripe_created_at=datetime.fromtimestamp(
+                    event["created"], tz=timezone.utc
+                ),
+            )
+            await self.billing_repository.commit()
+        except BaseException:
+            # Let Stripe's retry deliver the event again
+            await redis.delete(event_key)
+            raise
 
-            # Extract relevant data
-            customer_email = session["metadata"]["app_email"]
-            credits_amount = session["metadata"]["credits_amount"]
+        try:
+            process_stripe_events.delay()
+        except Exception as e:
+            # The event is stored, the periodic run will pick it up
+            logger.warning(f"Failed to enqueue Stripe event processing: {e}")
 
-            user = await self.user_repository.get_user_by_email(customer_email)
-            logger.debug(user.balance)
+    async def process_webhook_event(self, event: StripeWebhookEvent) -> list[str]:
+        """
+        Apply a queued Stripe event. The caller commits the transaction.
 
-            user.balance += int(credits_amount)
-            await self.user_repository.save(user)
-            logger.debug(user.balance)
-            logger.info(
-                f"User {user.id} has been credited with {credits_amount} credits"
+        Returns:
+            list[str]: Redis cache keys the event made stale, which the caller
+            deletes once the transaction is committed
+        """
+        if event.event_type == "checkout.session.completed":
+            return await self._credit_checkout_session(
+                event.id, event.payload["data"]["object"]
             )
+        return []
+
+    async def _credit_checkout_session(self, event_id: str, session: dict) -> list[str]:
+        customer_email = session["metadata"]["app_email"]
+        credits_amount = int(session["metadata"]["credits_amount"])
+
+        user_id = await self.user_repository.get_user_id(customer_email)
+        if not user_id:
+            raise LookupError(f'User "{customer_email}" not found')
+
+        transaction_id = await self.billing_repository.record_stripe_transaction(
+            event_id, session["id"], user_id, credits_amount
+        )
+        if transaction_id is None:
+            return []
+
+        new_balance = await self.ledger_repository.transfer(
+            user_id,
+            credits_amount,
+            LedgerAccounts.STRIPE,
+            LedgerReasons.TOP_UP,
+            transaction_id=transaction_id,
+        )
+        logger.info(
+            f"User {user_id} has been credited with {credits_amount} credits, "
+            f'new balance is {new_balance} (transaction "{transaction_id}")'
+        )
+        # The paid checkout session must not be handed out again
+        return [get_checkout_session_cache_key(user_id, credits_amount)]
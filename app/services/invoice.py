@@ -1,12 +1,29 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException
 
+from app.config.logs.logger import logger
 from app.models.invoice import InvoiceStatus, LessonInvoice
+from app.models.ledger import LedgerAccounts, LedgerReasons
 from app.repository.invoice import InvoiceRepository
+from app.repository.ledger import LedgerRepository
+from app.repository.stats import StatsRepository
 from app.repository.user import UserRepository
-from app.schemas.invoice import InvoiceCreate, InvoiceUpdate
+from app.schemas.invoice import (
+    InvoiceBatchCreate,
+    InvoiceCreate,
+    InvoiceFilter,
+    InvoicePaginatedResponse,
+    InvoiceResponse,
+    InvoiceUpdate,
+)
 from app.services.base import BaseService
+from app.utilities.pagination import decode_keyset_cursor, encode_keyset_cursor
+
+OVERDUE_CANCELLATION_REASON = "Cancelled automatically: the invoice is overdue"
 
 
 class InvoiceService(BaseService):
@@ -14,41 +31,159 @@ class InvoiceService(BaseService):
         self,
         invoice_repository: InvoiceRepository,
         user_repository: UserRepository,
+        ledger_repository: LedgerRepository,
+        stats_repository: StatsRepository,
     ):
         self.invoice_repository = invoice_repository
         self.user_repository = user_repository
+        self.ledger_repository = ledger_repository
+        self.stats_repository = stats_repository
 
-    async def get_invoices_by_mentor_id(self, mentor_id: UUID) -> list[LessonInvoice]:
-        return await self.invoice_repository.get_invoices_by_mentor_id(mentor_id)
+    async def get_invoices_by_mentor_id(
+        self,
+        mentor_id: UUID,
+        filters: InvoiceFilter,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> InvoicePaginatedResponse:
+        invoices = await self.invoice_repository.get_invoices_by_mentor_id(
+            mentor_id,
+            filters,
+            limit + 1,
+            decode_keyset_cursor(cursor) if cursor else None,
+        )
+        return self._build_invoices_page(invoices, limit)
+
+    async def get_invoices_by_mentee_id(
+        self,
+        mentee_id: UUID,
+        filters: InvoiceFilter,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> InvoicePaginatedResponse:
+        invoices = await self.invoice_repository.get_invoices_by_mentee_id(
+            mentee_id,
+            filters,
+            limit + 1,
+            decode_keyset_cursor(cursor) if cursor else None,
+        )
+        return self._build_invoices_page(invoices, limit)
+
+    def _build_invoices_page(
+        self, invoices: list[LessonInvoice], limit: int
+    ) -> InvoicePaginatedResponse:
+        # One extra invoice is fetched to know whether another page exists
+        next_cursor = None
+        if len(invoices) > limit:
+            invoices = invoices[:limit]
+            next_cursor = encode_keyset_cursor(invoices[-1].due_date, invoices[-1].id)
+
+        return InvoicePaginatedResponse(
+            items=[InvoiceResponse.model_validate(invoice) for invoice in invoices],
+            next_cursor=next_cursor,
+        )
 
     async def create_invoice(self, invoice_data: InvoiceCreate) -> LessonInvoice:
-        mentor_user = await self.user_repository.get_user_by_id(invoice_data.mentor_id)
-        if not mentor_user:
+        if not await self.user_repository.exists_by_id(invoice_data.mentor_id):
             raise HTTPException(status_code=404, detail="Mentor not found")
 
-        mentee_user = await self.user_repository.get_user_by_id(invoice_data.mentee_id)
-        if not mentee_user:
-            raise HTTPException(status_code=404, detail="Mentee not found")
-
-        if mentee_user.balance < invoice_data.amount:
+        invoice = LessonInvoice(id=uuid.uuid4(), **invoice_data.model_dump())
+
+        # The debit is held in escrow until the invoice is paid and committed
+        # together with the invoice
+        new_balance = await self.ledger_repository.transfer(
+            invoice.mentee_id,
+            -invoice.amount,
+            LedgerAccounts.ESCROW,
+            LedgerReasons.INVOICE_DEBIT,
+            invoice_id=invoice.id,
+        )
+        if new_balance is None:
+            if not await self.user_repository.exists_by_id(invoice_data.mentee_id):
+                raise HTTPException(status_code=404, detail="Mentee not found")
             raise HTTPException(
                 status_code=400, detail="Mentee does not have enough balance"
             )
 
-        mentee_user.balance -= invoice_data.amount
-        await self.user_repository.save(mentee_user)
+        await self.invoice_repository.save(invoice)
+        await self.invoice_repository.commit()
+        return invoice
+
+    async def create_invoices_batch(
+        self, batch_data: InvoiceBatchCreate
+    ) -> list[LessonInvoice]:
+        """
+        Bill one group lesson to every listed mentee, all or nothing.
+
+        The mentees are locked and their balances checked with one query, then
+        debited with one UPDATE, and the invoices are inserted with one INSERT
+        in the same transaction.
+        """
+        if not await self.user_repository.exists_by_id(batch_data.mentor_id):
+            raise HTTPException(status_code=404, detail="Mentor not found")
 
-        await self.invoice_repository.create_invoice(invoice_data)
+        mentee_ids = batch_data.mentee_ids
+        balances = await self.user_repository.get_balances(mentee_ids, for_update=True)
+
+        missing_ids = [str(id) for id in mentee_ids if id not in balances]
+        if missing_ids:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Mentees not found: {', '.join(missing_ids)}",
+            )
+        insufficient_ids = [
+            str(id) for id in mentee_ids if balances[id] < batch_data.amount
+        ]
+        if insufficient_ids:
+            raise HTTPException(
+                status_code=400,
+                detail="Mentees do not have enough balance: "
+                f"{', '.join(insufficient_ids)}",
+            )
+
+        invoice_ids = {mentee_id: uuid.uuid4() for mentee_id in mentee_ids}
+        new_balances = await self.ledger_repository.transfer_many(
+            mentee_ids,
+            -batch_data.amount,
+            LedgerAccounts.ESCROW,
+            LedgerReasons.INVOICE_DEBIT,
+            invoice_ids=invoice_ids,
+        )
+        # The mentees are locked, so every debit must have been applied
+        if len(new_balances) != len(mentee_ids):
+            raise HTTPException(
+                status_code=409, detail="Mentee balances changed, try again"
+            )
+
+        invoice_data = batch_data.model_dump(exclude={"mentee_ids"})
+        invoices = await self.invoice_repository.add_invoices(
+            [
+                {
+                    **invoice_data,
+                    "id": invoice_id,
+                    "mentee_id": mentee_id,
+                    "status": InvoiceStatus.PENDING.value,
+                }
+                for mentee_id, invoice_id in invoice_ids.items()
+            ]
+        )
+        await self.invoice_repository.commit()
+        return invoices
 
     async def update_invoice(
         self, invoice_id: UUID, update_data: InvoiceUpdate
     ) -> LessonInvoice | None:
-        invoice = await self.invoice_repository.get_invoice_by_id(invoice_id)
+        # Lock the invoice so concurrent updates can not both pay it out
+        invoice = await self.invoice_repository.get_invoice_by_id(
+            invoice_id, for_update=True
+        )
         if not invoice:
             raise HTTPException(status_code=404, detail="Invoice not found")
 
         if invoice.status == InvoiceStatus.PAID:
             raise HTTPException(status_code=400, detail="Invoice already paid")
+        if invoice.status == InvoiceStatus.CANCELLED:
+            raise HTTPException(status_code=400, detail="Invoice already cancelled")
 
         if (
             update_data.status == InvoiceStatus.CANCELLED
@@ -56,15 +191,61 @@ class InvoiceService(BaseService):
         ):
             invoice.cancellation_reason = update_data.cancellation_reason
 
+        if update_data.status == InvoiceStatus.CANCELLED:
+            await self._refund_invoice(invoice)
+
         if update_data.status == InvoiceStatus.PAID:
-            mentor_user = await self.user_repository.get_user_by_id(invoice.mentor_id)
-            if not mentor_user:
+            new_balance = await self.ledger_repository.transfer(
+                invoice.mentor_id,
+                invoice.amount,
+                LedgerAccounts.ESCROW,
+                LedgerReasons.INVOICE_PAYOUT,
+                invoice_id=invoice.id,
+            )
+            if new_balance is None:
                 raise HTTPException(status_code=404, detail="Mentor not found")
 
-            mentor_user.balance += invoice.amount
-            await self.user_repository.save(mentor_user)
-
         invoice.status = update_data.status
+        await self.stats_repository.add_invoice_stats(
+            [invoice], invoice.status, datetime.now(timezone.utc).date()
+        )
 
-        await self.invoice_repository.save(invoice)
+        await self.invoice_repository.commit()
         return invoice
+
+    async def cancel_overdue_invoices(self, due_before: datetime, limit: int) -> int:
+        """
+        Cancel up to ``limit`` pending invoices due before ``due_before`` and
+        refund their mentees, committing them as one transaction.
+
+        Returns:
+            int: Number of cancelled invoices
+        """
+        invoices = await self.invoice_repository.claim_overdue_invoices(
+            due_before, limit
+        )
+        for invoice in invoices:
+            await self._refund_invoice(invoice)
+            invoice.status = InvoiceStatus.CANCELLED
+            invoice.cancellation_reason = OVERDUE_CANCELLATION_REASON
+        await self.stats_repository.add_invoice_stats(
+            invoices, InvoiceStatus.CANCELLED, datetime.now(timezone.utc).date()
+        )
+
+        await self.invoice_repository.commit()
+        return len(invoices)
+
+    async def _refund_invoice(self, invoice: LessonInvoice) -> None:
+        # Return the credits held in escrow since the invoice was created
+        new_balance = await self.ledger_repository.transfer(
+            invoice.mentee_id,
+            invoice.amount,
+            LedgerAccounts.ESCROW,
+            LedgerReasons.INVOICE_REFUND,
+            invoice_id=invoice.id,
+        )
+        if new_balance is None:
+            logger.warning(
+                f'Mentee of invoice "{invoice.id}" no longer exists, '
+                "its credits were not refunded"
+            )
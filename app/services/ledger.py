@@ -0,0 +1,27 @@
+from uuid import UUID
+
+from app.repository.ledger import LedgerRepository
+from app.schemas.ledger import LedgerEntrySchema, LedgerPaginatedResponse
+from app.services.base import BaseService
+
+
+class LedgerService(BaseService):
+    def __init__(self, ledger_repository: LedgerRepository):
+        self.ledger_repository = ledger_repository
+
+    async def get_user_ledger(
+        self, user_id: UUID, page: int, per_page: int
+    ) -> LedgerPaginatedResponse:
+        """
+        Get the balance history of a user, newest entries first.
+        """
+        entries, total = await self.ledger_repository.get_user_entries(
+            user_id, offset=(page - 1) * per_page, limit=per_page
+        )
+        return LedgerPaginatedResponse(
+            items=[LedgerEntrySchema.model_validate(entry) for entry in entries],
+            total=total,
+            page=page,
+            per_page=per_page,
+            total_pages=(total + per_page - 1) // per_page,
+        )
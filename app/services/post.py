@@ -3,7 +3,11 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.core.activity_categories import activity_category_catalog
+from app.core.tasks import send_email_new_posts
 from app.models.post import ActivityCategoryPost, Post
+from app.models.user import ServiceTypes
+from app.repository.outbox import OutboxRepository
 from app.repository.post import PostRepository
 from app.schemas.post import (
     PostCreate,
@@ -13,11 +17,13 @@ from app.schemas.post import (
     PostSort,
     PostUpdate,
 )
+from app.services.base import BaseService
 
 
-class PostService:
-    def __init__(self, repository: PostRepository):
+class PostService(BaseService):
+    def __init__(self, repository: PostRepository, outbox_repository: OutboxRepository):
         self.repository = repository
+        self.outbox_repository = outbox_repository
 
     async def get_posts(
         self,
@@ -30,6 +36,7 @@ class PostService:
         Returns a tuple of (posts, total_count).
         """
         posts, total_count = await self.repository.get_posts(filters, sort, pagination)
+        await self._prefetch_media_urls(post.user for post in posts)
         return [PostSchema.from_model(post) for post in posts], total_count
 
     async def get_post(
@@ -44,6 +51,8 @@ class PostService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Post not found",
             )
+        if increment_views:
+            await self.repository.commit()
         return PostSchema.from_model(post)
 
     async def get_user_posts(self, user_id: UUID) -> list[Post]:
@@ -51,6 +60,7 @@ class PostService:
         Get all posts for a specific user.
         """
         posts = await self.repository.get_user_posts(user_id)
+        await self._prefetch_media_urls(post.user for post in posts)
         return [PostSchema.from_model(post) for post in posts]
 
     async def create_post(self, post_data: PostCreate, user_id: UUID) -> Post:
@@ -58,7 +68,9 @@ class PostService:
         Create a new post.
         """
 
-        post_activity_categories_ids = post_data.category_ids
+        post_activity_categories_ids = activity_category_catalog.validate_ids(
+            post_data.category_ids or []
+        )
         post_data.category_ids = None
 
         post_data.user_id = user_id
@@ -80,7 +92,15 @@ class PostService:
         ]
 
         new_post_refreshed = await self.repository.get_post_by_id(new_post.id)
+        if post_data.service_type == ServiceTypes.PROVIDING.value:
+            await self.outbox_repository.add_event(
+                send_email_new_posts.name,
+                {"post_id": str(new_post.id)},
+                dedup_key=f"new_post:{new_post.id}",
+            )
         await self.repository.save_many(post_activity_categories)
+        await self.repository.commit()
+
         return new_post_refreshed
 
     async def update_post(
@@ -97,17 +117,13 @@ class PostService:
             )
 
         if post_data.category_ids:
-            await self.repository.clean_activity_categories(post_id)
-
-            new_activity_categories = [
-                ActivityCategoryPost(post_id=post_id, category_id=category_id)
-                for category_id in post_data.category_ids
-            ]
-
-            await self.repository.save_many(new_activity_categories)
+            await self.repository.sync_activity_categories(
+                post, activity_category_catalog.validate_ids(post_data.category_ids)
+            )
             post_data.category_ids = None
 
         await self.repository.update(post_id, post_data)
+        await self.repository.commit()
         updated_post = await self.repository.get_post_by_id(post_id)
         return PostSchema.from_model(updated_post)
 
@@ -122,4 +138,6 @@ class PostService:
                 detail="Not authorized to delete this post",
             )
 
-        return await self.repository.delete_post(post_id)
+        deleted = await self.repository.delete_post(post_id)
+        await self.repository.commit()
+        return deleted
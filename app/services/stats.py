@@ -0,0 +1,63 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+
+from app.models.stats import STATS_COUNTERS
+from app.repository.stats import StatsRepository
+from app.schemas.stats import (
+    EarningsStats,
+    EarningsStatsBucket,
+    EarningsStatsResponse,
+    StatsPeriods,
+)
+from app.services.base import BaseService
+
+# Range shown when the client does not pass ``date_from``
+DEFAULT_STATS_RANGES = {
+    StatsPeriods.DAY: timedelta(days=30),
+    StatsPeriods.WEEK: timedelta(weeks=12),
+    StatsPeriods.MONTH: timedelta(days=365),
+}
+
+
+class StatsService(BaseService):
+    def __init__(self, stats_repository: StatsRepository):
+        self.stats_repository = stats_repository
+
+    async def get_user_earnings(
+        self,
+        user_id: UUID,
+        period: StatsPeriods,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> EarningsStatsResponse:
+        """
+        Get the user's earnings and spendings per day, week or month, read from
+        the daily rollups only.
+        """
+        date_to = date_to or datetime.now(timezone.utc).date()
+        date_from = date_from or date_to - DEFAULT_STATS_RANGES[period]
+        if date_from > date_to:
+            raise HTTPException(
+                status_code=400, detail="date_from must not be after date_to"
+            )
+
+        rows = await self.stats_repository.get_user_stats(
+            user_id, period.value, date_from, date_to
+        )
+        items = [EarningsStatsBucket.model_validate(row) for row in rows]
+        totals = EarningsStats(
+            **{
+                counter: sum(getattr(item, counter) for item in items)
+                for counter in STATS_COUNTERS
+            }
+        )
+        return EarningsStatsResponse(
+            period=period,
+            date_from=date_from,
+            date_to=date_to,
+            items=items,
+            totals=totals,
+        )
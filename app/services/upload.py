@@ -0,0 +1,151 @@
+import json
+import mimetypes
+import uuid
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+from app.core.database import redis
+from app.models.user import User
+from app.schemas.upload import (
+    PresignedUploadInput,
+    PresignedUploadResponse,
+    UploadConfirmInput,
+    UploadConfirmResponse,
+    UploadField,
+    UploadProgressResponse,
+)
+from app.services.base import BaseService
+from app.utilities.s3 import (
+    UPLOAD_FIELD_RULES,
+    generate_presigned_upload,
+    move_file_to_content_address_async,
+    stream_file_to_s3,
+)
+
+UPLOAD_PROGRESS_TTL = 3600
+
+
+class UploadService(BaseService):
+    def _get_upload_extension(self, field: UploadField, content_type: str) -> str:
+        rule = UPLOAD_FIELD_RULES[field]
+        if not any(content_type.startswith(t) for t in rule.content_types):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type for the {field} field: {content_type}",
+            )
+
+        return mimetypes.guess_extension(content_type) or ""
+
+    async def create_presigned_upload(
+        self, upload_data: PresignedUploadInput, current_user: User
+    ) -> PresignedUploadResponse:
+        """
+        Issue a presigned POST request the client uses to upload a file directly to S3.
+        """
+        rule = UPLOAD_FIELD_RULES[upload_data.field]
+        extension = self._get_upload_extension(
+            upload_data.field, upload_data.content_type
+        )
+        key = f"{current_user.id}/{upload_data.field}/{uuid.uuid4().hex}{extension}"
+        expires_in = settings.AWS_S3_PRESIGNED_UPLOAD_EXPIRATION
+
+        presigned_upload = await generate_presigned_upload(
+            key, upload_data.content_type, rule.max_size, expires_in
+        )
+        logger.info(f'Issued presigned upload "{key}" for user "{current_user.id}"')
+
+        return PresignedUploadResponse(
+            key=key,
+            url=presigned_upload["url"],
+            fields=presigned_upload["fields"],
+            expires_in=expires_in,
+        )
+
+    async def confirm_upload(
+        self, confirm_data: UploadConfirmInput, current_user: User
+    ) -> UploadConfirmResponse:
+        """
+        Check that a presigned upload has landed in S3 and matches its field rules.
+        """
+        metadata = await self._verify_uploaded_file(
+            current_user.id, confirm_data.field, confirm_data.key
+        )
+
+        return UploadConfirmResponse(
+            key=confirm_data.key,
+            field=confirm_data.field,
+            content_type=metadata["ContentType"],
+            size=metadata["ContentLength"],
+        )
+
+    async def stream_upload(
+        self,
+        field: UploadField,
+        upload_id: Optional[uuid.UUID],
+        request: Request,
+        current_user: User,
+    ) -> UploadConfirmResponse:
+        """
+        Stream the raw request body to S3 and store it under its content hash.
+
+        Clients that want to poll the progress pass their own ``upload_id``.
+        """
+        upload_id = upload_id or uuid.uuid4()
+        content_type = request.headers.get("content-type", "")
+        extension = self._get_upload_extension(field, content_type)
+        incoming_key = f"{current_user.id}/{field}/incoming/{upload_id}{extension}"
+        rule = UPLOAD_FIELD_RULES[field]
+
+        content_length: Optional[int] = (
+            int(request.headers["content-length"])
+            if request.headers.get("content-length", "").isdigit()
+            else None
+        )
+        if content_length and content_length > rule.max_size:
+            raise HTTPException(
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File is too large"
+            )
+
+        async def report_progress(uploaded: int) -> None:
+            await redis.set(
+                f"upload_progress:{current_user.id}:{upload_id}",
+                json.dumps({"uploaded": uploaded, "total": content_length}),
+                ex=UPLOAD_PROGRESS_TTL,
+            )
+
+        logger.info(f'Streaming upload "{incoming_key}" for user "{current_user.id}"')
+        await report_progress(0)
+        size, digest = await stream_file_to_s3(
+            request.stream(),
+            incoming_key,
+            content_type,
+            rule.max_size,
+            report_progress,
+        )
+
+        key = f"{current_user.id}/{field}/{digest}{extension}"
+        created = await move_file_to_content_address_async(
+            incoming_key, key, content_type
+        )
+        logger.info(
+            f'Streamed upload "{key}" completed ({size} bytes, '
+            f'{"stored" if created else "already stored"})'
+        )
+
+        return UploadConfirmResponse(
+            key=key, field=field, content_type=content_type, size=size
+        )
+
+    async def get_upload_progress(
+        self, upload_id: uuid.UUID, current_user: User
+    ) -> UploadProgressResponse:
+        progress = await redis.get(f"upload_progress:{current_user.id}:{upload_id}")
+        if not progress:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND, detail="Upload progress is not found"
+            )
+
+        return UploadProgressResponse(upload_id=upload_id, **json.loads(progress))
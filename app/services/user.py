@@ -11,9 +11,11 @@ from sqlalchemy.exc import IntegrityError
 
 from app.config.logs.logger import logger
 from app.config.settings.base import settings
+from app.core.activity_categories import activity_category_catalog
 from app.core.database import redis
-from app.core.tasks import send_email_report_dashboard
-from app.models.user import ActivityCategoryUser, User
+from app.core.tasks import create_image_variants, send_email_report_dashboard
+from app.models.user import User
+from app.repository.outbox import OutboxRepository
 from app.repository.user import UserRepository
 from app.schemas.user import (
     ForgotPasswordResetInput,
@@ -28,12 +30,13 @@ from app.schemas.user import (
 from app.securities.auth_handler import auth_handler
 from app.services.base import BaseService
 from app.utilities.images import download_image
-from app.utilities.s3 import upload_file_to_s3_async
+from app.utilities.s3 import upload_content_addressed_file_async
 
 
 class UserService(BaseService):
-    def __init__(self, user_repository) -> None:
+    def __init__(self, user_repository, outbox_repository) -> None:
         self.user_repository: UserRepository = user_repository
+        self.outbox_repository: OutboxRepository = outbox_repository
 
     async def register_user(self, user_data: UserSignUpInput) -> LoginResponse:
         logger.info("Creating new User instance")
@@ -47,6 +50,7 @@ class UserService(BaseService):
 
             # Load relationships
             await self.user_repository.refresh(result, ["activity_categories"])
+            await self.user_repository.commit()
         except IntegrityError:
             raise HTTPException(
                 status.HTTP_409_CONFLICT,
@@ -90,7 +94,9 @@ class UserService(BaseService):
             user=UserFullSchema.from_model(user_existing_object),
         )
 
-    async def google_login(self, google_data: TokenData) -> LoginResponse:
+    async def google_login(
+        self, google_data: TokenData, background_tasks: BackgroundTasks
+    ) -> LoginResponse:
         logger.info("Google login attempt")
 
         try:
@@ -119,7 +125,7 @@ class UserService(BaseService):
         if existing_user:
             if not existing_user.google_id:
                 existing_user.google_id = user_google_id
-                await self.user_repository.save(existing_user)
+                await self.user_repository.commit()
             elif existing_user.google_id != user_google_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -146,12 +152,13 @@ class UserService(BaseService):
         await self.user_repository.refresh(new_user, ["activity_categories"])
 
         profile_picture_file = await download_image(google_picture_url)
-        profile_picture_filename = await upload_file_to_s3_async(
-            profile_picture_file, f"{new_user.id}/profile_picture.jpg"
+        profile_picture_filename, _ = await upload_content_addressed_file_async(
+            profile_picture_file, f"{new_user.id}/profile_picture", ".jpg"
         )
 
         new_user.profile_picture = profile_picture_filename
-        await self.user_repository.save(new_user)
+        await self.user_repository.commit()
+        background_tasks.add_task(create_image_variants, profile_picture_filename)
         auth_token = auth_handler.encode_token(new_user.id, email)
         return LoginResponse(token=auth_token, user=UserFullSchema.from_model(new_user))
 
@@ -162,9 +169,7 @@ class UserService(BaseService):
                 detail="Invalid forgot password token",
             )
 
-    async def forgot_password(
-        self, user_email: str, background_tasks: BackgroundTasks
-    ) -> None:
+    async def forgot_password(self, user_email: str) -> None:
         user: Optional[User] = await self.user_repository.get_user_by_email(user_email)
 
         if not user:
@@ -180,9 +185,16 @@ class UserService(BaseService):
 
         await redis.set(reset_code, user_email, ex=3600)
 
-        background_tasks.add_task(
-            send_email_report_dashboard, user_email, user_full_name, reset_link
+        await self.outbox_repository.add_event(
+            send_email_report_dashboard.name,
+            {
+                "user_email": user_email,
+                "user_name": user_full_name,
+                "reset_link": reset_link,
+            },
+            dedup_key=f"password_reset:{reset_code}",
         )
+        await self.outbox_repository.commit()
 
     async def forgot_password_reset(self, reset_data: ForgotPasswordResetInput) -> None:
         await self.verify_forgot_password_token(reset_data.token)
@@ -193,7 +205,7 @@ class UserService(BaseService):
 
         user_to_update.password = auth_handler.get_password_hash(reset_data.password)
 
-        await self.user_repository.save(user_to_update)
+        await self.user_repository.commit()
         logger.info("The password was successfully updated")
 
     async def update_user(
@@ -201,6 +213,7 @@ class UserService(BaseService):
         user_id: uuid.UUID,
         data: UserUpdateSchema,
         current_user: User,
+        background_tasks: BackgroundTasks,
     ) -> UserFullSchema:
         try:
             logger.info(f'Updating user profile of the user "{current_user}"')
@@ -209,17 +222,12 @@ class UserService(BaseService):
                 raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
             if data.activity_categories:
-                activity_categories_ids = json.loads(data.activity_categories[0])
-                await self.user_repository.clean_activity_categories(current_user.id)
-
-                new_activity_categories = [
-                    ActivityCategoryUser(
-                        user_id=current_user.id, category_id=category_id
-                    )
-                    for category_id in activity_categories_ids
-                ]
-
-                await self.user_repository.save_many(new_activity_categories)
+                activity_categories_ids = activity_category_catalog.validate_ids(
+                    json.loads(data.activity_categories[0])
+                )
+                await self.user_repository.sync_activity_categories(
+                    current_user, activity_categories_ids
+                )
                 data.activity_categories = None
 
             # Upload files to S3
@@ -230,10 +238,19 @@ class UserService(BaseService):
                 ("cv_link", "cv_link.pdf"),
             ]
 
-            await self._upload_files_to_s3(data, upload_tasks)
+            await self._upload_files_to_s3(
+                data, upload_tasks, current_user.id, background_tasks
+            )
 
             await self.user_repository.update_user(current_user.id, data)
+            await self.user_repository.commit()
             updated_user = await self.user_repository.get_user_by_id(current_user.id)
+            if data.profile_picture or data.id_card_photo:
+                # The variant flags are derived from the image keys that changed
+                await self.user_repository.refresh(
+                    updated_user,
+                    ["profile_picture_has_variants", "id_card_photo_has_variants"],
+                )
 
             logger.info(f'"{current_user}" profile was successfully updated')
             return UserFullSchema.from_model(updated_user)
@@ -258,7 +275,7 @@ class UserService(BaseService):
 
         current_user.password = auth_handler.get_password_hash(data.new_password)
 
-        await self.user_repository.save(current_user)
+        await self.user_repository.commit()
         logger.info("The password was successfully updated")
 
     async def get_user_by_id(self, user_id: uuid.UUID) -> UserFullSchema:
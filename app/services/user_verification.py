@@ -1,27 +1,37 @@
+import hashlib
 import json
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
 from uuid import UUID
 
 from fastapi import BackgroundTasks, HTTPException, status
 
+from app.config.settings.base import settings
+from app.core.activity_categories import activity_category_catalog
 from app.core.tasks import (
     send_email_approve_verification,
     send_email_decline_verification,
+    send_emails_approve_verification,
+    send_emails_decline_verification,
 )
 from app.models.user import (
-    ActivityCategoryUser,
     MentorVerificationStatus,
     ServiceTypes,
     User,
+    UserVerification,
     UserVerificationStatus,
 )
+from app.repository.outbox import OutboxRepository
 from app.repository.user import UserRepository
 from app.repository.user_verification import UserVerificationRepository
 from app.schemas.user_verification import (
     UserVerificationCreateSchema,
+    UserVerificationListItemSchema,
+    UserVerificationPaginatedResponse,
     UserVerificationSchema,
 )
 from app.services.base import BaseService
+from app.utilities.pagination import decode_keyset_cursor, encode_keyset_cursor
 
 
 class UserVerificationService(BaseService):
@@ -29,21 +39,29 @@ class UserVerificationService(BaseService):
         self,
         verification_repository: UserVerificationRepository,
         user_repository: UserRepository,
+        outbox_repository: OutboxRepository,
     ):
         self.verification_repository = verification_repository
         self.user_repository = user_repository
+        self.outbox_repository = outbox_repository
 
     async def create_verification(
-        self, verification_data: UserVerificationCreateSchema, current_user: User
+        self,
+        verification_data: UserVerificationCreateSchema,
+        current_user: User,
+        background_tasks: BackgroundTasks,
     ) -> None:
         """
         Create a new user verification.
         """
 
         if verification_data.activity_categories:
-            verification_data.activity_categories = json.loads(
-                verification_data.activity_categories[0]
-            )
+            verification_data.activity_categories = [
+                str(category_id)
+                for category_id in activity_category_catalog.validate_ids(
+                    json.loads(verification_data.activity_categories[0])
+                )
+            ]
 
         upload_tasks = [
             ("id_card_photo", "id_card_photo.jpg"),
@@ -52,12 +70,14 @@ class UserVerificationService(BaseService):
         ]
 
         # Upload files to S3
-        await self._upload_files_to_s3(verification_data, upload_tasks)
+        await self._upload_files_to_s3(
+            verification_data, upload_tasks, background_tasks=background_tasks
+        )
 
         await self.verification_repository.create_verification(verification_data)
 
         current_user.verification_status = UserVerificationStatus.PENDING.value
-        await self.user_repository.save(current_user)
+        await self.user_repository.commit()
 
     async def get_verification(
         self, verification_id: UUID
@@ -75,32 +95,128 @@ class UserVerificationService(BaseService):
         """
         Get all verification requests for a specific user.
         """
-        return await self.verification_repository.get_by_user_id(user_id)
+        verifications = await self.verification_repository.get_by_user_id(user_id)
+        await self._prefetch_media_urls(verifications)
+        return verifications
 
     async def get_all_verifications(
-        self, status: Optional[str] = None
-    ) -> list[UserVerificationSchema]:
+        self,
+        status: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> UserVerificationPaginatedResponse:
         """
-        Get all verification requests in the system.
+        Get a page of verification requests, oldest first.
         """
-        return await self.verification_repository.get_verifications(status)
+        # One extra verification is fetched to know whether another page exists
+        rows = await self.verification_repository.get_verifications(
+            status, limit + 1, decode_keyset_cursor(cursor) if cursor else None
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_keyset_cursor(rows[-1].created_at, rows[-1].id)
 
-    async def approve_verification(
-        self, verification_id: UUID, background_tasks: BackgroundTasks
-    ) -> None:
+        return UserVerificationPaginatedResponse(
+            items=[UserVerificationListItemSchema.model_validate(row) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    async def claim_verifications(
+        self, admin_id: UUID, limit: int
+    ) -> list[UserVerificationListItemSchema]:
         """
-        Approve a verification request.
+        Lease the oldest pending verifications to an admin for
+        VERIFICATION_CLAIM_TTL seconds, so other admins get different ones.
         """
+        now = datetime.now(timezone.utc)
+        rows = await self.verification_repository.claim_pending_verifications(
+            admin_id,
+            limit,
+            now=now,
+            lease_until=now + timedelta(seconds=settings.VERIFICATION_CLAIM_TTL),
+        )
+        await self.verification_repository.commit()
+        return [UserVerificationListItemSchema.model_validate(row) for row in rows]
+
+    async def _get_reviewable_verification(
+        self, verification_id: UUID, admin_id: UUID
+    ) -> UserVerification:
+        # The row stays locked until the review is committed, so two admins
+        # can not review the same verification at once
         verification = await self.verification_repository.get_verification_by_id(
-            verification_id
+            verification_id, for_update=True
         )
         if not verification:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Verification not found"
             )
+        self._check_reviewable(verification, admin_id)
+
+        verification.admin_id = admin_id
+        verification.claim_expires_at = None
+        return verification
+
+    async def _get_reviewable_verifications(
+        self, verification_ids: list[UUID], admin_id: UUID
+    ) -> list[UserVerification]:
+        # Locked in id order, so overlapping bulk reviews can not deadlock
+        verifications = await self.verification_repository.get_verifications_by_ids(
+            verification_ids, for_update=True
+        )
+
+        found_ids = {verification.id for verification in verifications}
+        missing_ids = [str(id) for id in verification_ids if id not in found_ids]
+        if missing_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Verifications not found: {', '.join(missing_ids)}",
+            )
+
+        user_ids = set()
+        for verification in verifications:
+            try:
+                self._check_reviewable(verification, admin_id)
+            except HTTPException as e:
+                raise HTTPException(
+                    status_code=e.status_code,
+                    detail=f'{e.detail}: "{verification.id}"',
+                )
+            if verification.user_id in user_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Several verifications of one user can not be reviewed "
+                    f'together: "{verification.user_id}"',
+                )
+            user_ids.add(verification.user_id)
+
+        return verifications
+
+    def _check_reviewable(self, verification: UserVerification, admin_id: UUID) -> None:
+        if verification.status != UserVerificationStatus.PENDING.value:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Verification was already reviewed",
+            )
+        if (
+            verification.admin_id not in (None, admin_id)
+            and verification.claim_expires_at
+            and verification.claim_expires_at > datetime.now(timezone.utc)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Verification is claimed by another admin",
+            )
+
+    async def approve_verification(self, verification_id: UUID, admin_id: UUID) -> None:
+        """
+        Approve a verification request.
+        """
+        verification = await self._get_reviewable_verification(
+            verification_id, admin_id
+        )
 
         verification.status = UserVerificationStatus.APPROVED.value
-        await self.verification_repository.save(verification)
 
         verification_user: User = await self.user_repository.get_user_by_id(
             verification.user_id
@@ -114,40 +230,32 @@ class UserVerificationService(BaseService):
         verification_user.service_price = verification.service_price
         verification_user.service_price_type = verification.service_price_type
 
-        await self.user_repository.clean_activity_categories(verification_user.id)
-
-        new_activity_categories = [
-            ActivityCategoryUser(
-                user_id=verification_user.id,
-                category_id=category_id,
-                type=ServiceTypes.PROVIDING.value,
-            )
-            for category_id in verification.activity_categories
-        ]
-
-        await self.user_repository.save_many(new_activity_categories)
-
-        await self.user_repository.save(verification_user)
+        await self.user_repository.sync_activity_categories(
+            verification_user,
+            verification.activity_categories,
+            ServiceTypes.PROVIDING,
+        )
 
-        background_tasks.add_task(
-            send_email_approve_verification,
-            verification_user.email,
-            verification_user.name,
+        await self.outbox_repository.add_event(
+            send_email_approve_verification.name,
+            {
+                "user_email": verification_user.email,
+                "user_full_name": verification_user.name or "User",
+            },
+            dedup_key=f"verification_approved:{verification_id}",
         )
+        await self.verification_repository.commit()
 
     async def decline_verification(
-        self, verification_id: UUID, background_tasks: BackgroundTasks, reason: str
+        self, verification_id: UUID, admin_id: UUID, reason: str
     ) -> None:
         """
         Decline a verification request.
         """
-        verification = await self.verification_repository.get_verification_by_id(
-            verification_id
+        verification = await self._get_reviewable_verification(
+            verification_id, admin_id
         )
-        if not verification:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Verification not found"
-            )
+        verification.status = UserVerificationStatus.DECLINED.value
 
         verification_user: User = await self.user_repository.get_user_by_id(
             verification.user_id
@@ -155,14 +263,89 @@ class UserVerificationService(BaseService):
         verification_user.verification_status = (
             MentorVerificationStatus.UNVERIFIED.value
         )
-        await self.user_repository.save(verification_user)
 
-        verification.status = UserVerificationStatus.DECLINED.value
-        await self.verification_repository.save(verification)
+        await self.outbox_repository.add_event(
+            send_email_decline_verification.name,
+            {
+                "user_email": verification_user.email,
+                "user_full_name": verification_user.name or "User",
+                "decline_reason": reason,
+            },
+            dedup_key=f"verification_declined:{verification_id}",
+        )
+        await self.verification_repository.commit()
+
+    async def bulk_approve_verifications(
+        self, verification_ids: list[UUID], admin_id: UUID
+    ) -> None:
+        """
+        Approve several verification requests in one transaction.
+
+        Verifications and their users are loaded with two queries, profile
+        fields and categories are copied with set-based statements, and all
+        notification emails are sent as one batch.
+        """
+        verifications = await self._get_reviewable_verifications(
+            verification_ids, admin_id
+        )
+        contacts = await self.user_repository.get_contacts(
+            verification.user_id for verification in verifications
+        )
 
-        background_tasks.add_task(
-            send_email_decline_verification,
-            verification.user.email,
-            verification.user.name,
-            reason,
+        await self.verification_repository.set_review_status(
+            verification_ids, UserVerificationStatus.APPROVED.value, admin_id
+        )
+        await self.user_repository.apply_verifications(verification_ids)
+        await self.user_repository.replace_activity_categories(
+            {
+                verification.user_id: verification.activity_categories
+                for verification in verifications
+            },
+            ServiceTypes.PROVIDING,
+        )
+
+        await self.outbox_repository.add_event(
+            send_emails_approve_verification.name,
+            {"recipients": self._get_recipients(contacts.values())},
+            dedup_key=f"verifications_approved:{self._hash_ids(verification_ids)}",
+        )
+        await self.verification_repository.commit()
+
+    async def bulk_decline_verifications(
+        self, verification_ids: list[UUID], admin_id: UUID, reason: str
+    ) -> None:
+        """
+        Decline several verification requests with the same reason in one
+        transaction.
+        """
+        verifications = await self._get_reviewable_verifications(
+            verification_ids, admin_id
         )
+        contacts = await self.user_repository.get_contacts(
+            verification.user_id for verification in verifications
+        )
+
+        await self.verification_repository.set_review_status(
+            verification_ids, UserVerificationStatus.DECLINED.value, admin_id
+        )
+        await self.user_repository.set_verification_status(
+            contacts, MentorVerificationStatus.UNVERIFIED
+        )
+
+        await self.outbox_repository.add_event(
+            send_emails_decline_verification.name,
+            {
+                "recipients": self._get_recipients(contacts.values()),
+                "decline_reason": reason,
+            },
+            dedup_key=f"verifications_declined:{self._hash_ids(verification_ids)}",
+        )
+        await self.verification_repository.commit()
+
+    def _get_recipients(self, contacts: Iterable) -> list[list[str]]:
+        return [[contact.email, contact.name or "User"] for contact in contacts]
+
+    def _hash_ids(self, ids: Iterable[UUID]) -> str:
+        # A verification is reviewed once, so the same set can only come back
+        # as a redelivery
+        return hashlib.sha256(",".join(sorted(map(str, ids))).encode()).hexdigest()
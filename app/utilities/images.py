@@ -4,6 +4,19 @@ from typing import Optional
 
 import httpx
 from fastapi import UploadFile
+from PIL import Image, ImageOps
+
+# Media fields that get resized variants generated after upload
+IMAGE_VARIANT_FIELDS = ("profile_picture", "id_card_photo")
+
+# Variant name -> longest side in pixels
+IMAGE_VARIANT_SIZES = {"thumbnail": 160, "card": 640, "full": 1600}
+
+# File extension -> (Pillow format, content type)
+IMAGE_VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpg": ("JPEG", "image/jpeg"),
+}
 
 
 async def download_image(url: str, filename: Optional[str] = None) -> UploadFile:
@@ -31,3 +44,43 @@ async def download_image(url: str, filename: Optional[str] = None) -> UploadFile
         file = io.BytesIO(content)
 
         return UploadFile(file=file, filename=filename, size=len(content))
+
+
+def get_image_variant_key(key: str, variant: str, extension: str) -> str:
+    """
+    Build the predictable key (or URL) of an image variant.
+
+    ``42/profile_picture.jpg`` becomes ``42/profile_picture_thumbnail.webp``.
+    """
+    directory, separator, filename = key.rpartition("/")
+    stem = filename.rsplit(".", 1)[0]
+    return f"{directory}{separator}{stem}_{variant}.{extension}"
+
+
+def render_image_variants(content: bytes) -> dict[tuple[str, str], tuple[bytes, str]]:
+    """
+    Resize an image into every variant and format.
+
+    The image is rotated according to its EXIF orientation and re-encoded
+    without any metadata, so no EXIF data ends up in the variants.
+
+    Args:
+        content: Raw bytes of the original image
+
+    Returns:
+        Mapping of (variant, extension) to the encoded image and its content type
+    """
+    variants = {}
+    with Image.open(io.BytesIO(content)) as original:
+        image = ImageOps.exif_transpose(original).convert("RGB")
+
+    for variant, size in IMAGE_VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        for extension, (image_format, content_type) in IMAGE_VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, format=image_format, quality=82, optimize=True)
+            variants[(variant, extension)] = (buffer.getvalue(), content_type)
+
+    return variants
@@ -0,0 +1,186 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from app.config.logs.logger import logger
+from app.config.settings.base import settings
+from app.core.database import redis
+from app.core.storage import storage
+from app.utilities.images import (
+    IMAGE_VARIANT_FIELDS,
+    IMAGE_VARIANT_FORMATS,
+    IMAGE_VARIANT_SIZES,
+    get_image_variant_key,
+)
+
+# Model fields that hold S3 keys of user media
+MEDIA_FIELDS = ("profile_picture", "id_card_photo", "about_me_video_link", "cv_link")
+
+
+class MediaUrlSigner:
+    """
+    Turns S3 keys into URLs clients can download media from.
+
+    With a public bucket the key is simply appended to AWS_S3_ENDPOINT. With
+    AWS_S3_PRIVATE_MEDIA enabled every key gets a presigned GET URL, which is
+    cached in process and in Redis until shortly before it expires, so the
+    same key is not signed again on every response.
+    """
+
+    def __init__(
+        self,
+        private: bool,
+        expiration: int,
+        refresh_margin: int,
+        max_cached_urls: int,
+    ):
+        self.private = private
+        self.expiration = expiration
+        self.refresh_margin = refresh_margin
+        self.max_cached_urls = max_cached_urls
+        self._cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def _get_cached(self, key: str) -> Optional[str]:
+        cached = self._cache.get(key)
+        if not cached:
+            return None
+
+        url, expires_at = cached
+        if expires_at - self.refresh_margin <= time.time():
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return url
+
+    def _set_cached(self, key: str, url: str, expires_at: float) -> None:
+        self._cache[key] = (url, expires_at)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached_urls:
+            self._cache.popitem(last=False)
+
+    def _presign(self, key: str) -> tuple[str, float]:
+        expires_at = time.time() + self.expiration
+        url = storage.get_client().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": settings.AWS_BUCKET_NAME, "Key": key},
+            ExpiresIn=self.expiration,
+        )
+        return url, expires_at
+
+    def _presign_many(self, keys: list[str]) -> list[tuple[str, float]]:
+        # Runs on the storage executor, so it must not touch the in-process cache
+        return [self._presign(key) for key in keys]
+
+    def _sign(self, key: str) -> tuple[str, float]:
+        url, expires_at = self._presign(key)
+        self._set_cached(key, url, expires_at)
+        return url, expires_at
+
+    def get_url(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        if not self.private:
+            return f"{settings.AWS_S3_ENDPOINT}/{key}"
+
+        return self._get_cached(key) or self._sign(key)[0]
+
+    async def prefetch(self, keys: Iterable[str]) -> None:
+        """
+        Make URLs of ``keys`` available in process before a list is serialized.
+
+        URLs missing from the local cache are read from Redis with one MGET, the
+        rest is signed in one batch on the storage executor, off the event loop,
+        and written back with one pipeline.
+        """
+        if not self.private:
+            return
+
+        missing_keys = list(
+            {key for key in keys if key and self._get_cached(key) is None}
+        )
+        if not missing_keys:
+            return
+
+        cached_values = await redis.mget([f"media_url:{key}" for key in missing_keys])
+
+        keys_to_sign = []
+        for key, cached_value in zip(missing_keys, cached_values):
+            if cached_value:
+                cached = json.loads(cached_value)
+                if cached["expires_at"] - self.refresh_margin > time.time():
+                    self._set_cached(key, cached["url"], cached["expires_at"])
+                    continue
+            keys_to_sign.append(key)
+
+        if not keys_to_sign:
+            return
+
+        signed_urls = await storage.run(
+            "generate_presigned_url", self._presign_many, keys_to_sign
+        )
+
+        ttl = self.expiration - self.refresh_margin
+        async with redis.pipeline(transaction=False) as pipeline:
+            for key, (url, expires_at) in zip(keys_to_sign, signed_urls):
+                self._set_cached(key, url, expires_at)
+                pipeline.set(
+                    f"media_url:{key}",
+                    json.dumps({"url": url, "expires_at": expires_at}),
+                    ex=ttl,
+                )
+            await pipeline.execute()
+
+        logger.debug(
+            f"Signed {len(keys_to_sign)} media URLs, "
+            f"{len(missing_keys) - len(keys_to_sign)} loaded from Redis"
+        )
+
+
+def get_media_keys(instance: Any) -> list[str]:
+    """
+    Collect the S3 keys an instance's response will link to, including the
+    image variants that have been generated.
+    """
+    keys = []
+    for field_name in MEDIA_FIELDS:
+        key = getattr(instance, field_name, None)
+        if not isinstance(key, str):
+            continue
+
+        keys.append(key)
+        if field_name in IMAGE_VARIANT_FIELDS and getattr(
+            instance, f"{field_name}_has_variants", False
+        ):
+            keys.extend(
+                get_image_variant_key(key, variant, extension)
+                for variant in IMAGE_VARIANT_SIZES
+                for extension in IMAGE_VARIANT_FORMATS
+            )
+    return keys
+
+
+def get_image_variant_urls(
+    key: Optional[str], has_variants: bool
+) -> Optional[dict[str, dict[str, str]]]:
+    if not key or not has_variants:
+        return None
+
+    return {
+        variant: {
+            extension: media_url_signer.get_url(
+                get_image_variant_key(key, variant, extension)
+            )
+            for extension in IMAGE_VARIANT_FORMATS
+        }
+        for variant in IMAGE_VARIANT_SIZES
+    }
+
+
+media_url_signer = MediaUrlSigner(
+    private=settings.AWS_S3_PRIVATE_MEDIA,
+    expiration=settings.AWS_S3_MEDIA_URL_EXPIRATION,
+    refresh_margin=settings.AWS_S3_MEDIA_URL_REFRESH_MARGIN,
+    max_cached_urls=settings.AWS_S3_MEDIA_URL_CACHE_SIZE,
+)
@@ -0,0 +1,24 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_keyset_cursor(sort_value: datetime, instance_id: UUID) -> str:
+    """
+    Build an opaque cursor pointing after the row with the given sort key.
+    """
+    raw = json.dumps([sort_value.isoformat(), str(instance_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        sort_value, instance_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(sort_value), UUID(instance_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
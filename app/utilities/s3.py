@@ -1,24 +1,46 @@
 import asyncio
+import hashlib
+import io
 import mimetypes
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    NamedTuple,
+    Optional,
+)
 
-import boto3
+from botocore.exceptions import ClientError
 from fastapi import HTTPException, UploadFile
 
 from app.config.settings.base import settings
+from app.core.storage import storage
+
+
+class UploadRule(NamedTuple):
+    content_types: tuple[str, ...]
+    max_size: int
 
-s3 = boto3.client(
-    service_name="s3",
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_KEY,
-    region_name=settings.AWS_REGION,
-)
-executor = ThreadPoolExecutor()
+
+# Media fields that may be uploaded directly to S3 with a presigned request
+UPLOAD_FIELD_RULES: dict[str, UploadRule] = {
+    "profile_picture": UploadRule(("image/",), 10 * 1024 * 1024),
+    "id_card_photo": UploadRule(("image/",), 10 * 1024 * 1024),
+    "about_me_video_link": UploadRule(("video/",), 500 * 1024 * 1024),
+    "cv_link": UploadRule(("application/pdf",), 20 * 1024 * 1024),
+}
+
+# Content-addressed objects never change, so clients may cache them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 
 def upload_file_to_s3(
-    file: UploadFile, filename: str, content_type: Optional[str] = None
+    file: UploadFile,
+    filename: str,
+    content_type: Optional[str] = None,
+    cache_control: Optional[str] = None,
 ) -> str:
     """
     Upload a file to S3 bucket.
@@ -27,6 +49,7 @@ def upload_file_to_s3(
         file: FastAPI UploadFile object containing the file data
         filename: Name of the file to be stored in S3
         content_type: Optional MIME type of the file. If not provided, will be guessed from filename.
+        cache_control: Optional Cache-Control header stored with the file
 
     Returns:
         str: URL of the uploaded file in S3
@@ -48,12 +71,16 @@ def upload_file_to_s3(
             f"Invalid file type. Must be an image, video or PDF. Got: {content_type}"
         )
 
+    extra_args = {"ContentType": content_type}
+    if cache_control:
+        extra_args["CacheControl"] = cache_control
+
     try:
-        s3.upload_fileobj(
+        storage.client.upload_fileobj(
             file.file,
             settings.AWS_BUCKET_NAME,
             filename,
-            ExtraArgs={"ContentType": content_type},
+            ExtraArgs=extra_args,
         )
 
         return filename
@@ -65,8 +92,315 @@ def upload_file_to_s3(
 
 
 async def upload_file_to_s3_async(
-    file: UploadFile, filename: str, content_type: Optional[str] = None
+    file: UploadFile,
+    filename: str,
+    content_type: Optional[str] = None,
+    cache_control: Optional[str] = None,
+) -> str:
+    return await storage.run(
+        "upload_fileobj",
+        upload_file_to_s3,
+        file,
+        filename,
+        content_type,
+        cache_control,
+    )
+
+
+def hash_file(file: BinaryIO, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 digest of a file and rewind it.
+
+    Args:
+        file: Seekable binary file object
+        chunk_size: Number of bytes read at once
+
+    Returns:
+        str: Hex-encoded SHA-256 digest of the file content
+    """
+    digest = hashlib.sha256()
+    file.seek(0)
+    while chunk := file.read(chunk_size):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+async def upload_content_addressed_file_async(
+    file: UploadFile,
+    prefix: str,
+    extension: str,
+    content_type: Optional[str] = None,
+) -> tuple[str, bool]:
+    """
+    Upload a file to S3 bucket under a key derived from its content.
+
+    The upload is skipped when an object with the same content already exists.
+
+    Args:
+        file: FastAPI UploadFile object containing the file data
+        prefix: Key prefix the file is stored under, e.g. ``{user_id}/cv_link``
+        extension: File extension including the leading dot
+        content_type: Optional MIME type of the file
+
+    Returns:
+        tuple[str, bool]: Key of the file in S3 and whether it was newly uploaded
+    """
+    digest = await asyncio.to_thread(hash_file, file.file)
+    filename = f"{prefix}/{digest}{extension}"
+
+    if await head_file_in_s3_async(filename):
+        return filename, False
+
+    await upload_file_to_s3_async(file, filename, content_type, IMMUTABLE_CACHE_CONTROL)
+    return filename, True
+
+
+async def delete_file_from_s3_async(filename: str) -> None:
+    """
+    Delete a file from S3 bucket.
+
+    Args:
+        filename: Name of the file stored in S3
+    """
+    await storage.call("delete_object", Bucket=settings.AWS_BUCKET_NAME, Key=filename)
+
+
+async def download_file_from_s3_async(filename: str) -> bytes:
+    """
+    Download a file from S3 bucket into memory.
+
+    Args:
+        filename: Name of the file stored in S3
+
+    Returns:
+        bytes: Content of the file
+    """
+    buffer = io.BytesIO()
+    await storage.start()
+    await storage.run(
+        "download_fileobj",
+        storage.client.download_fileobj,
+        settings.AWS_BUCKET_NAME,
+        filename,
+        buffer,
+    )
+    return buffer.getvalue()
+
+
+async def put_file_to_s3_async(
+    filename: str,
+    content: bytes,
+    content_type: str,
+    cache_control: Optional[str] = None,
 ) -> str:
-    return await asyncio.get_event_loop().run_in_executor(
-        executor, lambda: upload_file_to_s3(file, filename, content_type)
+    """
+    Store in-memory content in S3 bucket.
+
+    Args:
+        filename: Name of the file to be stored in S3
+        content: Content of the file
+        content_type: MIME type of the file
+        cache_control: Optional Cache-Control header stored with the file
+
+    Returns:
+        str: Name of the stored file in S3
+    """
+    extra_args = {"CacheControl": cache_control} if cache_control else {}
+    await storage.call(
+        "put_object",
+        Bucket=settings.AWS_BUCKET_NAME,
+        Key=filename,
+        Body=content,
+        ContentType=content_type,
+        **extra_args,
     )
+    return filename
+
+
+async def move_file_to_content_address_async(
+    source: str, filename: str, content_type: str
+) -> bool:
+    """
+    Move an uploaded file to its content-addressed key.
+
+    The copy is skipped when an object with the same content already exists.
+
+    Args:
+        source: Current key of the file in S3
+        filename: Content-addressed key of the file
+        content_type: MIME type of the file
+
+    Returns:
+        bool: Whether a new object was created under ``filename``
+    """
+    created = not await head_file_in_s3_async(filename)
+    if created:
+        await storage.call(
+            "copy_object",
+            Bucket=settings.AWS_BUCKET_NAME,
+            Key=filename,
+            CopySource={"Bucket": settings.AWS_BUCKET_NAME, "Key": source},
+            ContentType=content_type,
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+            MetadataDirective="REPLACE",
+        )
+    await delete_file_from_s3_async(source)
+    return created
+
+
+async def generate_presigned_upload(
+    filename: str, content_type: str, max_size: int, expires_in: int
+) -> dict[str, Any]:
+    """
+    Generate a presigned POST request for uploading a file directly to S3.
+
+    Args:
+        filename: Name of the file to be stored in S3
+        content_type: MIME type the uploaded file must be sent with
+        max_size: Maximum allowed file size in bytes
+        expires_in: Number of seconds the presigned request stays valid
+
+    Returns:
+        dict: URL and form fields the client has to send along with the file
+    """
+    await storage.start()
+    return storage.client.generate_presigned_post(
+        Bucket=settings.AWS_BUCKET_NAME,
+        Key=filename,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_size],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+async def head_file_in_s3_async(filename: str) -> Optional[dict[str, Any]]:
+    """
+    Fetch the metadata of a file stored in S3 bucket.
+
+    Args:
+        filename: Name of the file stored in S3
+
+    Returns:
+        Optional[dict]: Object metadata or None if the file does not exist
+    """
+    try:
+        return await storage.call(
+            "head_object", Bucket=settings.AWS_BUCKET_NAME, Key=filename
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+async def stream_file_to_s3(
+    chunks: AsyncIterator[bytes],
+    filename: str,
+    content_type: str,
+    max_size: int,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> tuple[int, str]:
+    """
+    Upload a stream of chunks to S3 bucket as a multipart upload.
+
+    The content is hashed as it streams through. Chunks are buffered until they
+    fill a part and at most AWS_S3_MULTIPART_MAX_IN_FLIGHT parts are uploaded at
+    once, so memory stays bounded and the stream is not read further while S3
+    is catching up. The multipart upload is aborted if anything fails.
+
+    Args:
+        chunks: Async iterator yielding the file data
+        filename: Name of the file to be stored in S3
+        content_type: MIME type of the file
+        max_size: Maximum allowed file size in bytes
+        on_progress: Optional callback receiving the number of bytes stored so far
+
+    Returns:
+        tuple[int, str]: Size and hex-encoded SHA-256 digest of the uploaded file
+    """
+    multipart_upload = await storage.call(
+        "create_multipart_upload",
+        Bucket=settings.AWS_BUCKET_NAME,
+        Key=filename,
+        ContentType=content_type,
+    )
+    upload_id = multipart_upload["UploadId"]
+
+    in_flight = asyncio.Semaphore(settings.AWS_S3_MULTIPART_MAX_IN_FLIGHT)
+    part_tasks: list[asyncio.Task] = []
+    stored_size = 0
+
+    async def upload_part(part_number: int, body: bytes) -> dict[str, Any]:
+        nonlocal stored_size
+        try:
+            response = await storage.call(
+                "upload_part",
+                Bucket=settings.AWS_BUCKET_NAME,
+                Key=filename,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+        finally:
+            in_flight.release()
+
+        stored_size += len(body)
+        if on_progress:
+            await on_progress(stored_size)
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    async def submit_part(body: bytes) -> None:
+        await in_flight.acquire()
+        for task in part_tasks:
+            if task.done() and task.exception():
+                in_flight.release()
+                raise task.exception()
+        part_tasks.append(asyncio.create_task(upload_part(len(part_tasks) + 1, body)))
+
+    try:
+        part_size = settings.AWS_S3_MULTIPART_PART_SIZE
+        buffer = bytearray()
+        digest = hashlib.sha256()
+        total_size = 0
+
+        async for chunk in chunks:
+            total_size += len(chunk)
+            if total_size > max_size:
+                raise HTTPException(status_code=413, detail="File is too large")
+
+            digest.update(chunk)
+            buffer.extend(chunk)
+            while len(buffer) >= part_size:
+                await submit_part(bytes(buffer[:part_size]))
+                del buffer[:part_size]
+
+        if not total_size:
+            raise HTTPException(status_code=400, detail="File is empty")
+        if buffer:
+            await submit_part(bytes(buffer))
+
+        parts = await asyncio.gather(*part_tasks)
+        await storage.call(
+            "complete_multipart_upload",
+            Bucket=settings.AWS_BUCKET_NAME,
+            Key=filename,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        return total_size, digest.hexdigest()
+
+    except BaseException:
+        for task in part_tasks:
+            task.cancel()
+        await asyncio.gather(*part_tasks, return_exceptions=True)
+        await storage.call(
+            "abort_multipart_upload",
+            Bucket=settings.AWS_BUCKET_NAME,
+            Key=filename,
+            UploadId=upload_id,
+        )
+        raise
@@ -0,0 +1,39 @@
+"""add invoice listing indexes
+
+Revision ID: 12d46a4be942
+Revises: 78b21ddf5add
+Create Date: 2026-10-19 13:20:44.671208
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "12d46a4be942"
+down_revision: Union[str, None] = "78b21ddf5add"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_lesson_invoices_mentor_id_due_date",
+        "lesson_invoices",
+        ["mentor_id", "due_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_lesson_invoices_mentee_id_due_date",
+        "lesson_invoices",
+        ["mentee_id", "due_date", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_lesson_invoices_mentee_id_due_date", table_name="lesson_invoices")
+    op.drop_index("ix_lesson_invoices_mentor_id_due_date", table_name="lesson_invoices")
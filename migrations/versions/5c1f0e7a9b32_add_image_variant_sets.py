@@ -0,0 +1,34 @@
+"""add image variant sets
+
+Revision ID: 5c1f0e7a9b32
+Revises: dd16d2b1c6b5
+Create Date: 2026-10-19 16:04:27.513962
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1f0e7a9b32"
+down_revision: Union[str, None] = "dd16d2b1c6b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "image_variant_sets",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("created_at", postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("image_variant_sets")
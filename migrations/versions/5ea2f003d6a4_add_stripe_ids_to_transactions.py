@@ -0,0 +1,42 @@
+"""add stripe ids to transactions
+
+Revision ID: 5ea2f003d6a4
+Revises: 3acd904a55e2
+Create Date: 2026-10-19 11:02:17.540318
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5ea2f003d6a4"
+down_revision: Union[str, None] = "3acd904a55e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "transactions",
+        sa.Column("stripe_event_id", sa.String(length=255), nullable=True),
+    )
+    op.add_column(
+        "transactions",
+        sa.Column("stripe_session_id", sa.String(length=255), nullable=True),
+    )
+    op.create_unique_constraint(
+        "transactions_stripe_event_id_key", "transactions", ["stripe_event_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "transactions_stripe_event_id_key", "transactions", type_="unique"
+    )
+    op.drop_column("transactions", "stripe_session_id")
+    op.drop_column("transactions", "stripe_event_id")
@@ -0,0 +1,75 @@
+"""add ledger entries
+
+Revision ID: 78b21ddf5add
+Revises: 9af6df427bc7
+Create Date: 2026-10-19 12:35:52.904117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "78b21ddf5add"
+down_revision: Union[str, None] = "9af6df427bc7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ledger_entries",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("journal_id", sa.UUID(), nullable=False),
+        sa.Column("account", sa.String(length=10), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("balance_after", sa.Integer(), nullable=True),
+        sa.Column("reason", sa.String(length=2), nullable=False),
+        sa.Column("invoice_id", sa.UUID(), nullable=True),
+        sa.Column("transaction_id", sa.UUID(), nullable=True),
+        sa.Column("created_at", postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_ledger_entries_user_id_created_at",
+        "ledger_entries",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+
+    # Open the ledger with the balances users already have
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE opening_journals ON COMMIT DROP AS
+        SELECT gen_random_uuid() AS journal_id, id AS user_id, balance
+        FROM users
+        WHERE balance <> 0
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ledger_entries (
+            id, journal_id, account, user_id, amount, balance_after, reason,
+            created_at
+        )
+        SELECT gen_random_uuid(), journal_id, 'user', user_id, balance, balance,
+            'OB', now()
+        FROM opening_journals
+        UNION ALL
+        SELECT gen_random_uuid(), journal_id, 'opening', NULL, -balance, NULL,
+            'OB', now()
+        FROM opening_journals
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ledger_entries_user_id_created_at", table_name="ledger_entries")
+    op.drop_table("ledger_entries")
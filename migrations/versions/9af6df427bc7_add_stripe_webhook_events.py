@@ -0,0 +1,57 @@
+"""add stripe webhook events
+
+Revision ID: 9af6df427bc7
+Revises: 5ea2f003d6a4
+Create Date: 2026-10-19 11:48:05.117342
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9af6df427bc7"
+down_revision: Union[str, None] = "5ea2f003d6a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stripe_webhook_events",
+        sa.Column("id", sa.String(length=255), nullable=False),
+        sa.Column("event_type", sa.String(length=255), nullable=False),
+        sa.Column("customer_key", sa.String(length=255), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.String(length=1), server_default="P", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "stripe_created_at", postgresql.TIMESTAMP(timezone=True), nullable=False
+        ),
+        sa.Column("available_at", postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("processed_at", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("created_at", postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_stripe_webhook_events_pending",
+        "stripe_webhook_events",
+        ["customer_key", "stripe_created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'P'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_stripe_webhook_events_pending",
+        table_name="stripe_webhook_events",
+        postgresql_where=sa.text("status = 'P'"),
+    )
+    op.drop_table("stripe_webhook_events")
@@ -0,0 +1,38 @@
+"""add pending invoice due date index
+
+Revision ID: ae06b83810a8
+Revises: 12d46a4be942
+Create Date: 2026-10-19 14:05:12.318904
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ae06b83810a8"
+down_revision: Union[str, None] = "12d46a4be942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_lesson_invoices_pending_due_date",
+        "lesson_invoices",
+        ["due_date"],
+        unique=False,
+        postgresql_where=sa.text("status = 'P'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_lesson_invoices_pending_due_date",
+        table_name="lesson_invoices",
+        postgresql_where=sa.text("status = 'P'"),
+    )
@@ -0,0 +1,41 @@
+"""add user daily stats
+
+Revision ID: d7b2ca03cce7
+Revises: ae06b83810a8
+Create Date: 2026-10-19 14:48:27.530716
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7b2ca03cce7"
+down_revision: Union[str, None] = "ae06b83810a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fill with: python -m app.commands.backfill_earnings_stats
+    op.create_table(
+        "user_daily_stats",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("earned", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("lessons_given", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("spent", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("lessons_taken", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "cancelled_lessons", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_daily_stats")
@@ -0,0 +1,46 @@
+"""add verification review queue
+
+Revision ID: dd16d2b1c6b5
+Revises: d7b2ca03cce7
+Create Date: 2026-10-19 15:21:06.842390
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "dd16d2b1c6b5"
+down_revision: Union[str, None] = "d7b2ca03cce7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "user_verifications",
+        sa.Column(
+            "claim_expires_at", postgresql.TIMESTAMP(timezone=True), nullable=True
+        ),
+    )
+    op.create_index(
+        "ix_user_verifications_pending_created_at",
+        "user_verifications",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PD'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_user_verifications_pending_created_at",
+        table_name="user_verifications",
+        postgresql_where=sa.text("status = 'PD'"),
+    )
+    op.drop_column("user_verifications", "claim_expires_at")
@@ -0,0 +1,148 @@
+import os
+
+# Settings are read on import, so every required one gets a placeholder; tests
+# only talk to the services they set up themselves
+for name, value in {
+    "JWT_SECRET": "test-secret-of-at-least-32-bytes-long",
+    "IS_ALLOWED_CREDENTIALS": "true",
+    "GOOGLE_AUTH_CLIENT_ID": "test",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "mentorship_test",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_HOST": "localhost",
+    "AWS_ACCESS_KEY_ID": "test",
+    "AWS_SECRET_KEY": "test",
+    "AWS_REGION": "us-east-1",
+    "AWS_BUCKET_NAME": "mentorship-test",
+    "AWS_S3_ENDPOINT": "https://mentorship-test.s3.amazonaws.com",
+    "STRIPE_SECRET_KEY": "sk_test",
+    "STRIPE_WEBHOOK_SECRET": "whsec_test",
+    "STRIPE_25_CREDITS_PRICE_ID": "price_25",
+    "STRIPE_200_CREDITS_PRICE_ID": "price_200",
+    "STRIPE_500_CREDITS_PRICE_ID": "price_500",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USER": "test",
+    "SMTP_PASSWORD": "test",
+    "REDIS_URL": "redis://localhost:6379",
+}.items():
+    os.environ.setdefault(name, value)
+
+from typing import AsyncIterator, Awaitable, Callable
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+import app.models  # noqa: F401
+from app.api.dependencies.session import get_async_session
+from app.core.database import Base
+from app.main import app as fastapi_app
+from app.models import LedgerAccounts, LedgerReasons, User
+from app.repository.ledger import LedgerRepository
+
+
+@pytest.fixture
+async def db_engine() -> AsyncEngine:
+    """
+    Engine of an empty schema in the database at TEST_DATABASE_URL.
+
+    Tests that need Postgres are skipped when the variable is not set. The
+    tables are dropped afterwards, so never point it at a real database.
+    """
+    database_url = os.environ.get("TEST_DATABASE_URL")
+    if not database_url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_async_engine(database_url, pool_size=20, max_overflow=0)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+def db_session_maker(db_engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(db_engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def worker_database(db_engine: AsyncEngine, monkeypatch) -> None:
+    """
+    Point Celery tasks, which open their own engine on every run like the
+    worker does, at the test database.
+    """
+    from app.core import tasks
+
+    monkeypatch.setattr(
+        tasks, "DATABASE_URL", db_engine.url.render_as_string(hide_password=False)
+    )
+
+
+@pytest.fixture
+def create_user(
+    db_session_maker: async_sessionmaker,
+) -> Callable[..., Awaitable[User]]:
+    """
+    Factory of committed users whose opening balance is booked in the ledger.
+    """
+
+    async def create(email: str, balance: int = 0, **fields) -> User:
+        async with db_session_maker() as session:
+            user = User(email=email, password="hash", name=email.split("@")[0])
+            for name, value in fields.items():
+                setattr(user, name, value)
+            session.add(user)
+            await session.flush()
+            if balance:
+                await LedgerRepository(session).transfer(
+                    user.id,
+                    balance,
+                    LedgerAccounts.OPENING,
+                    LedgerReasons.OPENING_BALANCE,
+                )
+            await session.commit()
+            return user
+
+    return create
+
+
+@pytest.fixture
+def request_sessions(db_session_maker: async_sessionmaker) -> list[AsyncSession]:
+    """
+    Sessions opened for API requests, in order, so tests can read how often
+    each request committed from ``session.info["commits"]``.
+    """
+    sessions: list[AsyncSession] = []
+
+    async def get_test_session() -> AsyncIterator[AsyncSession]:
+        async with db_session_maker() as session:
+            sessions.append(session)
+            yield session
+
+    fastapi_app.dependency_overrides[get_async_session] = get_test_session
+    yield sessions
+    fastapi_app.dependency_overrides.pop(get_async_session)
+
+
+@pytest.fixture
+async def api_client(request_sessions: list[AsyncSession]) -> AsyncClient:
+    """
+    Client of the app that runs requests in process against the test database.
+    The lifespan is not run, so no storage, Stripe or SMTP client is started.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app=fastapi_app), base_url="http://test"
+    ) as client:
+        yield client
@@ -0,0 +1,64 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from redis import Redis
+
+from app.config.settings.base import get_redis_database_url
+from app.core.celery import SharedRateLimit
+
+RATE_LIMIT_KEY = "rate_limit:test"
+
+
+@pytest.fixture
+def test_redis() -> Redis:
+    redis_url = os.environ.get("TEST_REDIS_URL")
+    if not redis_url:
+        pytest.skip("TEST_REDIS_URL is not set")
+
+    client = Redis.from_url(redis_url, decode_responses=True)
+    client.delete(RATE_LIMIT_KEY)
+    yield client
+    client.delete(RATE_LIMIT_KEY)
+    client.close()
+
+
+def test_rate_limit_is_shared_by_all_workers(test_redis):
+    # One limiter per simulated worker process, all sending at once
+    limits = [SharedRateLimit(test_redis, RATE_LIMIT_KEY, "20/s") for _ in range(4)]
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(len(limits)) as executor:
+        list(executor.map(lambda limit: [limit.acquire() for _ in range(3)], limits))
+    elapsed = time.monotonic() - started
+
+    # The first token is free, the other 11 are spaced 1/20 s apart
+    assert elapsed >= 11 / 20 - 0.02
+    assert elapsed < 11 / 20 + 0.5
+
+
+def test_disabled_rate_limit_never_waits(test_redis):
+    limit = SharedRateLimit(test_redis, RATE_LIMIT_KEY, "0")
+
+    started = time.monotonic()
+    for _ in range(10):
+        limit.acquire()
+
+    assert time.monotonic() - started < 0.1
+    assert not test_redis.exists(RATE_LIMIT_KEY)
+
+
+@pytest.mark.parametrize(
+    "url, broker_url",
+    [
+        ("redis://redis:6379", "redis://redis:6379/1"),
+        ("redis://redis:6379/0", "redis://redis:6379/1"),
+        (
+            "rediss://:secret@redis:6380/3?ssl_cert_reqs=required",
+            "rediss://:secret@redis:6380/1?ssl_cert_reqs=required",
+        ),
+    ],
+)
+def test_redis_database_url_replaces_database(url, broker_url):
+    assert get_redis_database_url(url, 1) == broker_url
@@ -0,0 +1,215 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import ActivityCategory, User, UserVerification
+from app.securities.auth_handler import auth_handler
+
+# Every request is one unit of work: writes commit exactly once, failed and
+# read-only requests never commit
+
+
+async def send(
+    api_client: AsyncClient,
+    request_sessions: list[AsyncSession],
+    method: str,
+    url: str,
+    **kwargs,
+) -> tuple[Response, int]:
+    """
+    Send a request and count the commits of the sessions it opened.
+    """
+    request_sessions.clear()
+    response = await api_client.request(method, url, **kwargs)
+    return response, sum(session.info.get("commits", 0) for session in request_sessions)
+
+
+def invoice_payload(mentor: User, mentee: User, amount: int = 10) -> dict:
+    return {
+        "mentor_id": str(mentor.id),
+        "mentee_id": str(mentee.id),
+        "amount": amount,
+        "due_date": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat(),
+    }
+
+
+@pytest.fixture
+async def mentor(create_user) -> User:
+    return await create_user("mentor@example.com")
+
+
+@pytest.fixture
+async def mentee(create_user) -> User:
+    return await create_user("mentee@example.com", balance=100)
+
+
+async def create_invoice(api_client, request_sessions, mentor, mentee) -> dict:
+    await send(
+        api_client,
+        request_sessions,
+        "POST",
+        "/invoices",
+        json=invoice_payload(mentor, mentee),
+    )
+    response, _ = await send(
+        api_client, request_sessions, "GET", f"/invoices/mentor/{mentor.id}"
+    )
+    return response.json()["items"][0]
+
+
+async def test_create_invoice_commits_once(
+    api_client, request_sessions, mentor, mentee
+):
+    response, commits = await send(
+        api_client,
+        request_sessions,
+        "POST",
+        "/invoices",
+        json=invoice_payload(mentor, mentee),
+    )
+
+    assert response.status_code == 201
+    assert commits == 1
+
+
+async def test_rejected_invoice_does_not_commit(
+    api_client, request_sessions, mentor, mentee
+):
+    response, commits = await send(
+        api_client,
+        request_sessions,
+        "POST",
+        "/invoices",
+        json=invoice_payload(mentor, mentee, amount=1000),
+    )
+
+    assert response.status_code == 400
+    assert commits == 0
+
+
+async def test_create_invoices_batch_commits_once(
+    api_client, request_sessions, create_user, mentor, mentee
+):
+    other_mentee = await create_user("other-mentee@example.com", balance=100)
+    payload = invoice_payload(mentor, mentee)
+    del payload["mentee_id"]
+
+    response, commits = await send(
+        api_client,
+        request_sessions,
+        "POST",
+        "/invoices/batch",
+        json={**payload, "mentee_ids": [str(mentee.id), str(other_mentee.id)]},
+    )
+
+    assert response.status_code == 201
+    assert commits == 1
+
+
+@pytest.mark.parametrize("invoice_status", ["A", "C"])
+async def test_update_invoice_commits_once(
+    api_client, request_sessions, mentor, mentee, invoice_status
+):
+    invoice = await create_invoice(api_client, request_sessions, mentor, mentee)
+
+    response, commits = await send(
+        api_client,
+        request_sessions,
+        "PATCH",
+        f"/invoices/{invoice['id']}",
+        json={"status": invoice_status},
+    )
+
+    assert response.status_code == 200
+    assert commits == 1
+
+
+async def test_list_invoices_does_not_commit(
+    api_client, request_sessions, mentor, mentee
+):
+    await create_invoice(api_client, request_sessions, mentor, mentee)
+
+    response, commits = await send(
+        api_client, request_sessions, "GET", f"/invoices/mentee/{mentee.id}"
+    )
+
+    assert response.status_code == 200
+    assert commits == 0
+
+
+@pytest.fixture
+async def admin_headers(create_user) -> dict[str, str]:
+    admin = await create_user("admin@example.com", is_admin=True)
+    token = auth_handler.encode_token(admin.id, admin.email)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def pending_verifications(
+    db_session_maker: async_sessionmaker, create_user
+) -> list[UserVerification]:
+    async with db_session_maker() as session:
+        category = ActivityCategory(title="Mathematics")
+        session.add(category)
+        await session.commit()
+
+    verifications = []
+    for index in range(2):
+        user = await create_user(f"applicant-{index}@example.com")
+        verifications.append(
+            UserVerification(
+                user_id=user.id,
+                id_card_photo=f"{user.id}/id_card_photo/card.jpg",
+                about_me_text="Teaching for ten years",
+                activity_categories=[str(category.id)],
+                service_price=25,
+                cv_link=f"{user.id}/cv_link/cv.pdf",
+            )
+        )
+
+    async with db_session_maker() as session:
+        session.add_all(verifications)
+        await session.commit()
+    return verifications
+
+
+async def test_approve_verification_commits_once(
+    api_client, request_sessions, admin_headers, pending_verifications
+):
+    response, commits = await send(
+        api_client,
+        request_sessions,
+        "POST",
+        f"/user-verification/{pending_verifications[0].id}/approve",
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    assert commits == 1
+
+
+@pytest.mark.parametrize(
+    "action, body",
+    [("approve", {}), ("decline", {"reason": "The ID card photo is blurry"})],
+)
+async def test_bulk_review_commits_once(
+    api_client, request_sessions, admin_headers, pending_verifications, action, body
+):
+    response, commits = await send(
+        api_client,
+        request_sessions,
+        "POST",
+        f"/user-verification/bulk/{action}",
+        headers=admin_headers,
+        json={
+            "verification_ids": [
+                str(verification.id) for verification in pending_verifications
+            ],
+            **body,
+        },
+    )
+
+    assert response.status_code == 200
+    assert commits == 1
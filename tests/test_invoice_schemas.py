@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.invoice import InvoiceCreate
+
+
+@pytest.mark.parametrize("amount", [0, -10])
+def test_invoice_amount_must_be_positive(amount: int):
+    # A negative amount would turn the guarded debit into an unchecked credit
+    with pytest.raises(ValidationError):
+        InvoiceCreate(
+            mentor_id=uuid.uuid4(),
+            mentee_id=uuid.uuid4(),
+            amount=amount,
+            due_date=datetime.now(timezone.utc),
+        )
@@ -0,0 +1,65 @@
+import asyncio
+import random
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import LedgerAccounts, LedgerEntry, LedgerReasons, User
+from app.repository.ledger import LedgerRepository
+
+INITIAL_BALANCE = 50
+CREDIT = 5
+DEBIT = 7
+TRANSFERS = 400
+
+
+async def test_concurrent_transfers_lose_no_update_and_never_overdraw(
+    db_session_maker: async_sessionmaker, create_user
+):
+    user = await create_user("mentee@example.com", INITIAL_BALANCE)
+    # More is debited than credited, so the balance keeps hitting zero and the
+    # guard has to reject debits while credits race with them
+    amounts = [CREDIT] * (TRANSFERS // 2) + [-DEBIT] * (TRANSFERS // 2)
+    random.Random(0).shuffle(amounts)
+
+    async def transfer(amount: int) -> tuple[int, int | None]:
+        async with db_session_maker() as session:
+            new_balance = await LedgerRepository(session).transfer(
+                user.id,
+                amount,
+                LedgerAccounts.ESCROW,
+                (
+                    LedgerReasons.INVOICE_DEBIT
+                    if amount < 0
+                    else LedgerReasons.INVOICE_REFUND
+                ),
+            )
+            await session.commit()
+            return amount, new_balance
+
+    results = await asyncio.gather(*(transfer(amount) for amount in amounts))
+
+    applied = [amount for amount, new_balance in results if new_balance is not None]
+    rejected = [amount for amount, new_balance in results if new_balance is None]
+    assert all(
+        new_balance >= 0 for _, new_balance in results if new_balance is not None
+    )
+    assert rejected and all(amount < 0 for amount in rejected)
+
+    async with db_session_maker() as session:
+        balance = await session.scalar(select(User.balance).where(User.id == user.id))
+        ledger_balance = await session.scalar(
+            select(func.sum(LedgerEntry.amount)).where(
+                LedgerEntry.user_id == user.id,
+                LedgerEntry.account == LedgerAccounts.USER.value,
+            )
+        )
+        lowest_balance = await session.scalar(
+            select(func.min(LedgerEntry.balance_after)).where(
+                LedgerEntry.user_id == user.id
+            )
+        )
+
+    assert balance == INITIAL_BALANCE + sum(applied)
+    assert ledger_balance == balance
+    assert lowest_balance >= 0
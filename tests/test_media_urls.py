@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from app.core.storage import storage
+from app.utilities import media_urls
+from app.utilities.media_urls import MediaUrlSigner
+
+
+class RecordingRedis:
+    """
+    The part of the Redis client ``prefetch`` uses, with nothing cached.
+    """
+
+    def __init__(self):
+        self.stored: dict[str, int] = {}
+
+    async def mget(self, keys: list[str]) -> list[None]:
+        return [None] * len(keys)
+
+    def pipeline(self, transaction: bool):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        self.stored[key] = ex
+
+    async def execute(self) -> None:
+        return None
+
+
+@pytest.fixture
+async def signer(monkeypatch) -> MediaUrlSigner:
+    monkeypatch.setattr(media_urls, "redis", RecordingRedis())
+    yield MediaUrlSigner(
+        private=True, expiration=3600, refresh_margin=300, max_cached_urls=100
+    )
+    await storage.stop()
+
+
+async def test_prefetch_signs_off_the_event_loop(signer, monkeypatch):
+    signing_threads = set()
+    client = storage.get_client()
+    generate_presigned_url = client.generate_presigned_url
+
+    def record_thread(*args, **kwargs):
+        signing_threads.add(threading.get_ident())
+        return generate_presigned_url(*args, **kwargs)
+
+    monkeypatch.setattr(client, "generate_presigned_url", record_thread)
+    keys = [f"user/profile_picture/{index}.png" for index in range(3)]
+
+    await signer.prefetch(keys)
+
+    assert signing_threads and threading.get_ident() not in signing_threads
+    assert media_urls.redis.stored == {f"media_url:{key}": 3300 for key in keys}
+    for key in keys:
+        assert signer._get_cached(key).startswith(
+            f"https://mentorship-test.s3.amazonaws.com/{key}?"
+        )
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from celery.exceptions import Retry
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config.settings.base import settings
+from app.core import tasks
+from app.models import (
+    ActivityCategory,
+    ActivityCategoryPost,
+    ActivityCategoryUser,
+    Post,
+    ServiceTypes,
+)
+
+MENTEES = 5
+
+
+@pytest.fixture
+async def post(db_session_maker: async_sessionmaker, create_user) -> Post:
+    author = await create_user("mentor@example.com")
+    mentees = [await create_user(f"mentee-{i}@example.com") for i in range(MENTEES)]
+    outsider = await create_user("outsider@example.com")
+
+    async with db_session_maker() as session:
+        category = ActivityCategory(title="Maths")
+        other_category = ActivityCategory(title="Music")
+        session.add_all([category, other_category])
+        await session.flush()
+
+        post = Post(
+            title="Algebra lessons",
+            description="Weekly lessons",
+            service_type=ServiceTypes.PROVIDING.value,
+            user_id=author.id,
+        )
+        session.add(post)
+        await session.flush()
+        session.add(ActivityCategoryPost(post_id=post.id, category_id=category.id))
+        session.add_all(
+            ActivityCategoryUser(user_id=user.id, category_id=category.id)
+            for user in [author, *mentees]
+        )
+        session.add(
+            ActivityCategoryUser(user_id=outsider.id, category_id=other_category.id)
+        )
+        await session.commit()
+    return post
+
+
+async def test_new_post_is_fanned_out_in_batches(post, worker_database, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_BULK_BATCH_SIZE", 2)
+    queued = []
+    monkeypatch.setattr(
+        tasks.send_emails_new_post,
+        "apply_async",
+        lambda kwargs, task_id: queued.append((kwargs, task_id)),
+    )
+
+    await asyncio.to_thread(tasks.send_email_new_posts, str(post.id))
+
+    assert [len(kwargs["recipients"]) for kwargs, _ in queued] == [2, 2, 1]
+    assert sorted(
+        email for kwargs, _ in queued for email, _ in kwargs["recipients"]
+    ) == [f"mentee-{i}@example.com" for i in range(MENTEES)]
+    assert all(
+        kwargs["post_title"] == "Algebra lessons"
+        and kwargs["post_link"] == f"{settings.WEB_URL}/en/posts/{post.id}"
+        for kwargs, _ in queued
+    )
+    assert len({task_id for _, task_id in queued}) == len(queued)
+
+
+def test_failed_new_post_emails_are_retried_alone(monkeypatch):
+    retried = {}
+    monkeypatch.setattr(tasks, "send_emails", lambda emails: emails[1:2])
+    monkeypatch.setattr(
+        tasks.send_emails_new_post,
+        "retry",
+        lambda **options: retried.update(options) or Retry(),
+    )
+    recipients = [[f"mentee-{i}@example.com", f"Mentee {i}"] for i in range(3)]
+
+    with pytest.raises(Retry):
+        tasks.send_emails_new_post.run(
+            recipients=recipients,
+            post_title="Algebra lessons",
+            post_description="Weekly lessons",
+            post_link="https://example.com/en/posts/1",
+        )
+
+    assert retried["kwargs"] == {
+        "recipients": [recipients[1]],
+        "post_title": "Algebra lessons",
+        "post_description": "Weekly lessons",
+        "post_link": "https://example.com/en/posts/1",
+    }
@@ -0,0 +1,170 @@
+import pytest
+import requests
+from httpx import AsyncClient
+from moto import mock_aws
+
+from app.config.settings.base import settings
+from app.core.storage import storage
+from app.models import User
+from app.securities.auth_handler import auth_handler
+from app.utilities.s3 import UPLOAD_FIELD_RULES, UploadRule
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+# Moto does not evaluate the conditions of a presigned POST policy, so uploads
+# S3 would refuse still land in the bucket. That is what a client bypassing the
+# policy looks like, and the HEAD-based confirm has to reject them on its own.
+
+
+@pytest.fixture
+async def s3_storage():
+    """
+    Storage client started against an empty bucket in a mocked S3.
+    """
+    with mock_aws():
+        # The boto3 client is created lazily, so it has to be created in the mock
+        storage.client = None
+        await storage.start()
+        storage.client.create_bucket(Bucket=settings.AWS_BUCKET_NAME)
+        yield storage
+        await storage.stop()
+
+
+@pytest.fixture
+async def uploader(create_user) -> User:
+    return await create_user("uploader@example.com")
+
+
+@pytest.fixture
+def auth_headers(uploader: User) -> dict[str, str]:
+    token = auth_handler.encode_token(uploader.id, uploader.email)
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def presign(
+    api_client: AsyncClient,
+    headers: dict[str, str],
+    content_type: str = "image/png",
+    field: str = "profile_picture",
+) -> dict:
+    response = await api_client.post(
+        "/uploads/presign",
+        headers=headers,
+        json={"field": field, "content_type": content_type},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def upload(presigned: dict, content: bytes, content_type: str = "image/png") -> None:
+    fields = {**presigned["fields"], "Content-Type": content_type}
+    response = requests.post(
+        presigned["url"],
+        data=fields,
+        files={"file": ("upload", content, content_type)},
+    )
+    assert response.status_code == 204
+
+
+async def confirm(
+    api_client: AsyncClient,
+    headers: dict[str, str],
+    key: str,
+    field: str = "profile_picture",
+):
+    return await api_client.post(
+        "/uploads/confirm", headers=headers, json={"field": field, "key": key}
+    )
+
+
+async def test_presigned_upload_is_confirmed(
+    api_client, s3_storage, uploader, auth_headers
+):
+    presigned = await presign(api_client, auth_headers)
+
+    assert presigned["key"].startswith(f"{uploader.id}/profile_picture/")
+    assert presigned["key"].endswith(".png")
+    assert presigned["fields"]["key"] == presigned["key"]
+    assert presigned["fields"]["Content-Type"] == "image/png"
+
+    upload(presigned, PNG)
+    response = await confirm(api_client, auth_headers, presigned["key"])
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "key": presigned["key"],
+        "field": "profile_picture",
+        "content_type": "image/png",
+        "size": len(PNG),
+    }
+
+
+async def test_presign_rejects_content_type_of_other_fields(
+    api_client, s3_storage, auth_headers
+):
+    response = await api_client.post(
+        "/uploads/presign",
+        headers=auth_headers,
+        json={"field": "profile_picture", "content_type": "application/pdf"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Invalid file type for the profile_picture field: application/pdf"
+    )
+
+
+async def test_confirm_rejects_missing_upload(api_client, s3_storage, auth_headers):
+    presigned = await presign(api_client, auth_headers)
+
+    response = await confirm(api_client, auth_headers, presigned["key"])
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "File has not been uploaded"
+
+
+async def test_confirm_rejects_key_of_another_user(
+    api_client, s3_storage, create_user, auth_headers
+):
+    other_user = await create_user("other@example.com")
+    token = auth_handler.encode_token(other_user.id, other_user.email)
+    presigned = await presign(api_client, {"Authorization": f"Bearer {token}"})
+    upload(presigned, PNG)
+
+    response = await confirm(api_client, auth_headers, presigned["key"])
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "File key is not valid for the profile_picture field"
+    )
+
+
+async def test_confirm_rejects_uploaded_content_type(
+    api_client, s3_storage, auth_headers
+):
+    presigned = await presign(api_client, auth_headers)
+    upload(presigned, b"%PDF-1.7", content_type="application/pdf")
+
+    response = await confirm(api_client, auth_headers, presigned["key"])
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Invalid file type for the profile_picture field: application/pdf"
+    )
+
+
+async def test_confirm_rejects_too_large_upload(
+    api_client, s3_storage, auth_headers, monkeypatch
+):
+    monkeypatch.setitem(
+        UPLOAD_FIELD_RULES, "profile_picture", UploadRule(("image/",), len(PNG) - 1)
+    )
+    presigned = await presign(api_client, auth_headers)
+    upload(presigned, PNG)
+
+    response = await confirm(api_client, auth_headers, presigned["key"])
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "File is too large for the profile_picture field"
+    )
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+
+from redis.exceptions import ConnectionError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core import tasks
+from app.models import User
+from app.repository.billing import BillingRepository
+from app.services.billing import get_checkout_session_cache_key
+
+
+class RecordingRedis:
+    """
+    Stand-in for the worker's Redis client that records deleted keys.
+    """
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.deleted: list[str] = []
+
+    def delete(self, *keys: str) -> int:
+        if self.fail:
+            raise ConnectionError("Connection refused")
+        self.deleted += keys
+        return len(keys)
+
+
+async def queue_checkout_completed(
+    db_session_maker: async_sessionmaker, user: User, event_id: str, credits: int
+) -> None:
+    async with db_session_maker() as session:
+        await BillingRepository(session).add_webhook_event(
+            event_id,
+            "checkout.session.completed",
+            user.email,
+            {
+                "data": {
+                    "object": {
+                        "id": f"cs_{event_id}",
+                        "metadata": {
+                            "app_email": user.email,
+                            "credits_amount": str(credits),
+                        },
+                    }
+                }
+            },
+            datetime.now(timezone.utc),
+        )
+        await session.commit()
+
+
+async def get_balance(db_session_maker: async_sessionmaker, user: User) -> int:
+    async with db_session_maker() as session:
+        return await session.scalar(select(User.balance).where(User.id == user.id))
+
+
+async def test_every_run_credits_its_events(
+    db_session_maker, create_user, worker_database, monkeypatch
+):
+    worker_redis = RecordingRedis()
+    monkeypatch.setattr(tasks, "worker_redis", worker_redis)
+    user = await create_user("buyer@example.com")
+
+    # Each run gets its own event loop, as in a worker process
+    await queue_checkout_completed(db_session_maker, user, "evt_1", 25)
+    await asyncio.to_thread(tasks.process_stripe_events)
+    await queue_checkout_completed(db_session_maker, user, "evt_2", 200)
+    await asyncio.to_thread(tasks.process_stripe_events)
+
+    assert await get_balance(db_session_maker, user) == 225
+    assert worker_redis.deleted == [
+        get_checkout_session_cache_key(user.id, 25),
+        get_checkout_session_cache_key(user.id, 200),
+    ]
+
+
+async def test_unavailable_redis_does_not_block_credits(
+    db_session_maker, create_user, worker_database, monkeypatch
+):
+    monkeypatch.setattr(tasks, "worker_redis", RecordingRedis(fail=True))
+    user = await create_user("buyer@example.com")
+
+    await queue_checkout_completed(db_session_maker, user, "evt_1", 25)
+    await asyncio.to_thread(tasks.process_stripe_events)
+
+    assert await get_balance(db_session_maker, user) == 25